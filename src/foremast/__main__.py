@@ -4,7 +4,7 @@ import collections
 import logging
 import os
 
-from . import runner, validate
+from . import cache, runner, utils, validate
 from .args import add_debug, add_env
 from .consts import LOGGING_FORMAT, SHORT_LOGGING_FORMAT
 from .version import print_version
@@ -15,7 +15,9 @@ LOG = logging.getLogger(__name__)
 def add_infra(subparsers):
     """Infrastructure subcommands."""
     infra_parser = subparsers.add_parser('infra', help=runner.prepare_infrastructure.__doc__)
-    infra_parser.set_defaults(func=runner.prepare_infrastructure)
+    infra_parser.set_defaults(func=runner.prepare_infrastructure, func_kwargs=('force',))
+    infra_parser.add_argument(
+        '--force', action='store_true', help='Submit every Task even when unchanged since the last run')
 
 
 def add_pipeline(subparsers):
@@ -106,6 +108,39 @@ def add_validate(subparsers):
     validate_gate_parser.set_defaults(func=validate.validate_gate)
 
 
+def add_cache(subparsers):
+    """Gate disk cache subcommands."""
+    cache_parser = subparsers.add_parser(
+        'cache', help=add_cache.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    cache_parser.set_defaults(func=cache_parser.print_help)
+
+    cache_subparsers = cache_parser.add_subparsers(title='Cache Commands')
+
+    cache_show_parser = cache_subparsers.add_parser('show', help=cache.show_cache.__doc__)
+    cache_show_parser.set_defaults(func=cache.show_cache)
+
+    cache_clear_parser = cache_subparsers.add_parser('clear', help=cache.clear_cache.__doc__)
+    cache_clear_parser.set_defaults(func=cache.clear_cache)
+
+    cache_warm_parser = cache_subparsers.add_parser('warm', help=cache.warm_cache.__doc__)
+    cache_warm_parser.set_defaults(func=cache.warm_cache)
+
+
+def add_templates(subparsers):
+    """Built-in template subcommands."""
+    templates_parser = subparsers.add_parser(
+        'templates', help=add_templates.__doc__, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    templates_parser.set_defaults(func=templates_parser.print_help)
+
+    templates_subparsers = templates_parser.add_subparsers(title='Template Commands')
+
+    templates_compile_parser = templates_subparsers.add_parser(
+        'compile', help=utils.compile_builtin_templates.__doc__)
+    templates_compile_parser.set_defaults(func=utils.compile_builtin_templates)
+    templates_compile_parser.add_argument(
+        '-o', '--output', help='Bundle to write, defaults to the one loaded by the installed package')
+
+
 def add_describe(subparsers):
     """Describe subcommands"""
     describe_parser = subparsers.add_parser('describe', help="Shows details of specific Foremast "
@@ -149,6 +184,8 @@ def main(manual_args=None):
     add_autoscaling(subparsers)
     add_scheduled_actions(subparsers)
     add_validate(subparsers)
+    add_cache(subparsers)
+    add_templates(subparsers)
     add_describe(subparsers)
 
     CliArgs = collections.namedtuple('CliArgs', ['parsed', 'extra'])
@@ -165,6 +202,10 @@ def main(manual_args=None):
 
     if args.parsed.version:
         args.parsed.func = print_version
+    elif hasattr(args.parsed, 'func_kwargs'):
+        # Commands naming their options are called with them directly
+        args.parsed.func(**{name: getattr(args.parsed, name) for name in args.parsed.func_kwargs})
+        return
 
     try:
         args.parsed.func(args)
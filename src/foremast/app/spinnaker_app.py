@@ -52,11 +52,22 @@ class SpinnakerApp:
         self.log.debug('Pipeline Config\n%s', pformat(self.pipeline_config))
         self.log.debug('App info:\n%s', pformat(self.appinfo))
         jsondata = self.render_application_template()
-        wait_for_task(jsondata)
+        # Only skip unchanged upserts while the application still exists in Spinnaker
+        fingerprint = (self.appname, 'global', 'global', 'application') if self.exists() else None
+        wait_for_task(jsondata, fingerprint=fingerprint)
 
         self.log.info("Successfully created %s application", self.appname)
         return jsondata
 
+    def exists(self):
+        """Check the application exists in Spinnaker.
+
+        Returns:
+            bool: True when Gate knows the application.
+        """
+        response = gate_request(uri='/applications/{0}'.format(self.appname))
+        return response.ok
+
     def render_application_template(self):
         """Render application from configs.
 
@@ -17,12 +17,11 @@
 
 This module also creates an inverse policy for scaling down
 """
-import json
 import logging
 import os
 from math import floor
 
-from ..utils import get_latest_server_group, get_properties, get_template, wait_for_task
+from ..utils import TaskBatch, get_latest_server_group, get_properties, get_template, wait_for_task
 from ..utils.gate import gate_request
 
 
@@ -51,7 +50,7 @@ class AutoScalingPolicy:
 
         self.settings = get_properties(properties_file=prop_path, env=self.env, region=self.region)
 
-    def prepare_policy_template(self, scaling_type, server_group, scaling_policy=None):
+    def prepare_policy_template(self, scaling_type, server_group, scaling_policy=None, batch=None):
         """Renders scaling policy templates based on configs and variables.
         After rendering, POSTs the json to Spinnaker for creation.
 
@@ -59,6 +58,7 @@ class AutoScalingPolicy:
             scaling_type (str): Type of policy: ``scale_up``, ``scale_down``, ``custom``
             server_group (str): Server group to render and apply policy template to
             scaling_policy (dict): Custom Scaling Policy dictionary, defaults to None.
+            batch (TaskBatch): Add the policy to this batch instead of POSTing it, defaults to None.
         """
         if 'period_minutes' in self.settings['asg']['scaling_policy']:
             period_sec = int(self.settings['asg']['scaling_policy']['period_minutes']) * 60
@@ -112,6 +112,11 @@ class AutoScalingPolicy:
                 self.log.warn('Scaling Type %s not implemented or does not exist.', scaling_policy['scaling_type'])
                 raise NotImplementedError
 
+        if batch is not None:
+            self.log.info('Batching a %s policy in %s for %s', scaling_type, self.env, self.app)
+            batch.add_task(rendered_template, label=scaling_type)
+            return
+
         self.log.info('Creating a %s policy in %s for %s', scaling_type, self.env, self.app)
         wait_for_task(rendered_template)
         self.log.info('Successfully created a %s policy in %s for %s', scaling_type, self.env, self.app)
@@ -128,30 +133,39 @@ class AutoScalingPolicy:
 
         server_group = get_latest_server_group(self.env, self.app)
 
-        # Find all existing and remove them
+        # Find all existing and remove them in one batch of Tasks
         scaling_policies = self.get_all_scaling_policies(server_group)
+        delete_batch = TaskBatch(self.app, 'Delete scaling policies')
         for policy_block in scaling_policies:
             for scaling_policy in policy_block:
-                self.delete_existing_scaling_policy(scaling_policy, server_group)
+                self.log.info("Deleting policy %s on %s", scaling_policy['policyName'], server_group)
+                delete_task = self.delete_scaling_policy_task(scaling_policy, server_group)
+                delete_batch.add_task(delete_task, label=scaling_policy['policyName'])
+        delete_batch.run()
 
+        create_batch = TaskBatch(self.app, 'Create scaling policies')
         if self.settings['asg']['scaling_policy']:
-            self.prepare_policy_template('scale_up', server_group)
+            self.prepare_policy_template('scale_up', server_group, batch=create_batch)
             if self.settings['asg']['scaling_policy'].get('scale_down', True):
-                self.prepare_policy_template('scale_down', server_group)
+                self.prepare_policy_template('scale_down', server_group, batch=create_batch)
         elif self.settings['asg']['custom_scaling_policies']:
             for scaling_policy in self.settings['asg']['custom_scaling_policies']:
-                self.prepare_policy_template('custom', server_group, scaling_policy)
+                self.prepare_policy_template('custom', server_group, scaling_policy, batch=create_batch)
+        create_batch.run()
+        self.log.info('Successfully created %d policies in %s for %s', len(create_batch), self.env, self.app)
 
-    def delete_existing_scaling_policy(self, scaling_policy, server_group):
-        """Given a scaling_policy and server_group, deletes the existing scaling_policy.
+    def delete_scaling_policy_task(self, scaling_policy, server_group):
+        """Build the Task deleting scaling_policy from server_group.
         Scaling policies need to be deleted instead of upserted for consistency.
 
         Args:
             scaling_policy (json): the scaling_policy json from Spinnaker that should be deleted
             server_group (str): the affected server_group
+
+        Returns:
+            dict: Spinnaker Task definition.
         """
-        self.log.info("Deleting policy %s on %s", scaling_policy['policyName'], server_group)
-        delete_dict = {
+        return {
             "application":
             self.app,
             "description":
@@ -166,7 +180,6 @@ class AutoScalingPolicy:
                 "user": "foremast-autoscaling-policy"
             }]
         }
-        wait_for_task(json.dumps(delete_dict))
 
     def get_all_scaling_policies(self, server_group):
         """Finds all existing scaling policies for an application
@@ -0,0 +1,55 @@
+"""Manage the on-disk Gate cache shared between Foremast commands."""
+import logging
+
+from tabulate import tabulate
+
+from .consts import ENVS
+from .utils.gate import GATE_DISK_CACHE, refresh_gate_cache
+
+LOG = logging.getLogger(__name__)
+
+
+def _disk_cache_configured():
+    """Warn when ``[gate] disk_cache_dir`` is not set."""
+    if GATE_DISK_CACHE is None:
+        LOG.warning('Gate disk cache is disabled, set [gate] disk_cache_dir to enable it.')
+        return False
+    return True
+
+
+def show_cache():
+    """Show entries in the Gate disk cache."""
+    if not _disk_cache_configured():
+        return
+
+    rows = [[entry['uri'], entry['size'], entry['age'], max(entry['expires_in'], 0)]
+            for entry in GATE_DISK_CACHE.entries()]
+
+    LOG.info('Gate disk cache directory: %s', GATE_DISK_CACHE.directory)
+    print(tabulate(rows, ['URI', 'Bytes', 'Age (s)', 'Expires In (s)']))
+
+
+def clear_cache():
+    """Remove all entries from the Gate disk cache."""
+    if not _disk_cache_configured():
+        return
+
+    removed = GATE_DISK_CACHE.clear()
+    LOG.info('Removed %d entries from %s', removed, GATE_DISK_CACHE.directory)
+
+
+def warm_cache():
+    """Fetch topology data from Gate into the disk cache."""
+    if not _disk_cache_configured():
+        return
+
+    uris = ['/networks/aws', '/subnets/aws']
+    uris.extend('/credentials/{0}'.format(env) for env in sorted(ENVS) if env)
+
+    responses = refresh_gate_cache(uris)
+
+    failed = [uri for uri, response in responses.items() if not response.ok]
+    if failed:
+        LOG.error('Unable to warm Gate cache for: %s', ', '.join(failed))
+    else:
+        LOG.info('Warmed Gate cache with %d entries.', len(responses))
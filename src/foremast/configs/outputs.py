@@ -16,12 +16,11 @@
 """Write output files for configurations."""
 import json
 import logging
-from pprint import pformat
 
 import foremastutils
 
 from ..consts import APP_FORMATS
-from ..utils import DeepChainMap, get_template
+from ..utils import DeepChainMap, DeepMerge, LazyPformat, get_template
 
 LOG = logging.getLogger(__name__)
 
@@ -82,6 +81,7 @@ def write_variables(app_configs=None, out_file='', git_short=''):
     generated = foremastutils.Generator(*foremastutils.Parser(git_short).parse_url(), formats=APP_FORMATS)
 
     json_configs = {}
+    merger = DeepMerge()
     for env, configs in app_configs.items():
         if env != 'pipeline':
             instance_profile = generated.iam()['profile']
@@ -92,17 +92,17 @@ def write_variables(app_configs=None, out_file='', git_short=''):
                     app=generated.app_name(),
                     profile=instance_profile,
                     formats=generated))
-            json_configs[env] = dict(DeepChainMap(configs, rendered_configs))
+            json_configs[env] = merger.merge(configs, rendered_configs)
             region_list = configs.get('regions', rendered_configs['regions'])
             json_configs[env]['regions'] = region_list  # removes regions defined in templates but not configs.
             for region in region_list:
                 region_config = json_configs[env][region]
-                json_configs[env][region] = dict(DeepChainMap(region_config, rendered_configs))
+                json_configs[env][region] = merger.merge(region_config, rendered_configs)
         else:
             default_pipeline_json = json.loads(get_template('configs/pipeline.json.j2', formats=generated))
-            json_configs['pipeline'] = dict(DeepChainMap(configs, default_pipeline_json))
+            json_configs['pipeline'] = merger.merge(configs, default_pipeline_json)
 
-    LOG.debug('Compiled configs:\n%s', pformat(json_configs))
+    LOG.debug('Compiled configs:\n%s', LazyPformat(json_configs))
 
     config_lines = convert_ini(json_configs)
 
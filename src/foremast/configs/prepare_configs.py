@@ -16,17 +16,24 @@
 """Prepare the Application Configurations."""
 import collections
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from .. import consts
 from ..exceptions import ForemastError
-from ..utils import DeepChainMap, FileLookup
+from ..utils import DeepMerge, FileLookup
 
 LOG = logging.getLogger(__name__)
 
+CONFIG_FETCH_MAX_WORKERS = 8
+
 
 def process_git_configs(git_short=''):
     """Retrieve _application.json_ files from GitLab.
 
+    With ``[gitlab] snapshot`` or ``cache_dir`` set, the master commit is
+    resolved first and every file is read at that commit, from one download
+    of the runway directory or from the file cache.
+
     Args:
         git_short (str): Short Git representation of repository, e.g.
             forrest/core.
@@ -36,11 +43,19 @@ def process_git_configs(git_short=''):
         found.
     """
     LOG.info('Processing application.json files from GitLab "%s".', git_short)
-    file_lookup = FileLookup(git_short=git_short)
-    app_configs = process_configs(file_lookup,
-                                  consts.RUNWAY_BASE_PATH + '/application-master-{env}.json',
-                                  consts.RUNWAY_BASE_PATH + '/pipeline.json')
-    commit_obj = file_lookup.project.commits.get('master')
+    snapshot_path = consts.RUNWAY_BASE_PATH if consts.GITLAB_SNAPSHOT else ''
+    file_lookup = FileLookup(git_short=git_short, snapshot_path=snapshot_path)
+
+    with ThreadPoolExecutor(max_workers=CONFIG_FETCH_MAX_WORKERS) as executor:
+        commit_future = executor.submit(file_lookup.project.commits.get, 'master')
+        if snapshot_path or consts.GITLAB_CACHE_DIR:
+            file_lookup.pin(commit_future.result().attributes['id'])
+        app_configs = process_configs(file_lookup,
+                                      consts.RUNWAY_BASE_PATH + '/application-master-{env}.json',
+                                      consts.RUNWAY_BASE_PATH + '/pipeline.json',
+                                      executor=executor)
+        commit_obj = commit_future.result()
+
     config_commit = commit_obj.attributes['id']
     LOG.info('Commit ID used: %s', config_commit)
     app_configs['pipeline']['config_commit'] = config_commit
@@ -63,23 +78,41 @@ def process_runway_configs(runway_dir=''):
     return app_configs
 
 
-def process_configs(file_lookup, app_config_format, pipeline_config):
+def _fetch_json(file_lookup, filename):
+    """Retrieve JSON from *file_lookup*, None when the file is missing."""
+    try:
+        return file_lookup.json(filename=filename)
+    except FileNotFoundError:
+        return None
+
+
+def process_configs(file_lookup, app_config_format, pipeline_config, executor=None):
     """Processes the configs from lookup sources.
 
+    The pipeline config is fetched first to find the cloud of the pipeline
+    type, then the environment configs of that cloud are fetched
+    concurrently.
+
     Args:
         file_lookup (FileLookup): Source to look for file/config
         app_config_format (str): The format for application config files.
         pipeline_config (str): Name/path of the pipeline config
+        executor (concurrent.futures.Executor): Pool to fetch files with, a
+            pool of :data:`CONFIG_FETCH_MAX_WORKERS` threads is used when not
+            provided.
 
     Returns:
         dict: Retrieved application config
     """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=CONFIG_FETCH_MAX_WORKERS) as executor:
+            return process_configs(file_lookup, app_config_format, pipeline_config, executor=executor)
+
     app_configs = collections.defaultdict(dict)
-    # Load pipeline config first, determine cloud provider
-    # Then load appropriate environment files
-    try:
-        app_configs['pipeline'] = file_lookup.json(filename=pipeline_config)
-    except FileNotFoundError:
+    # Pipeline config determines the cloud provider
+    # Then fetch the environment files of that cloud
+    app_configs['pipeline'] = _fetch_json(file_lookup, pipeline_config)
+    if app_configs['pipeline'] is None:
         LOG.warning('Unable to process pipeline.json. Using defaults.')
         app_configs['pipeline'] = {'env': ['stage', 'prod']}
 
@@ -92,14 +125,16 @@ def process_configs(file_lookup, app_config_format, pipeline_config):
     LOG.info("Using cloud provider '%s' for pipeline type '%s', supported environments: '%s'",
              cloud_provider, pipeline_type, environments)
 
+    env_futures = {
+        env: executor.submit(_fetch_json, file_lookup, app_config_format.format(env=env))
+        for env in environments
+    }
     for env in environments:
-        file_json = app_config_format.format(env=env)
-        try:
-            env_config = file_lookup.json(filename=file_json)
-            app_configs[env] = apply_region_configs(env_config)
-        except FileNotFoundError:
+        env_config = env_futures[env].result()
+        if env_config is None:
             LOG.critical('Application configuration not available for %s.', env)
             continue
+        app_configs[env] = apply_region_configs(env_config)
 
     LOG.debug('Application configs:\n%s', app_configs)
     return app_configs
@@ -116,10 +151,11 @@ def apply_region_configs(env_config):
         dict: Newly updated dictionary with region overrides applied.
     """
     new_config = env_config.copy()
+    merger = DeepMerge()
     for region in env_config.get('regions', consts.REGIONS):
         if isinstance(env_config.get('regions'), dict):
             region_specific_config = env_config['regions'][region]
-            new_config[region] = dict(DeepChainMap(region_specific_config, env_config))
+            new_config[region] = merger.merge(region_specific_config, env_config)
         else:
             new_config[region] = env_config.copy()
     LOG.debug('Region Specific Config:\n%s', new_config)
@@ -166,6 +166,13 @@ def _convert_string_to_native(value):
     return result
 
 
+def _convert_string_to_bool(value):
+    """Convert a configuration string such as ``true`` or ``off`` to a bool"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 def _generate_security_groups(config_key):
     """Read config file and generate security group dict by environment.
 
@@ -205,7 +212,15 @@ VPC_NAME = validate_key_values(CONFIG, 'base', 'vpc_name', default='vpc')
 REGIONS = set(validate_key_values(CONFIG, 'base', 'regions', default='').split(','))
 RUNWAY_BASE_PATH = validate_key_values(CONFIG, 'base', 'runway_base_path', default='runway')
 TEMPLATES_PATH = validate_key_values(CONFIG, 'base', 'templates_path')
+TEMPLATE_CACHE_DIR = expandvars(expanduser(validate_key_values(CONFIG, 'base', 'template_cache_dir', default='')))
+PIPELINE_REGION_WORKERS = int(validate_key_values(CONFIG, 'base', 'pipeline_region_workers', default=1))
 AMI_JSON_URL = validate_key_values(CONFIG, 'base', 'ami_json_url')
+AMI_CACHE_TTL = int(validate_key_values(CONFIG, 'base', 'ami_cache_ttl', default=300))
+GITLAB_SNAPSHOT = _convert_string_to_bool(validate_key_values(CONFIG, 'gitlab', 'snapshot', default=False))
+GITLAB_CACHE_DIR = expandvars(expanduser(validate_key_values(CONFIG, 'gitlab', 'cache_dir', default='')))
+GITLAB_CACHE_MAX_BYTES = int(validate_key_values(CONFIG, 'gitlab', 'cache_max_bytes', default=64 * 1024 * 1024))
+GITLAB_POOL_MAXSIZE = int(validate_key_values(CONFIG, 'gitlab', 'pool_maxsize', default=10))
+GITLAB_MAX_PROJECTS = int(validate_key_values(CONFIG, 'gitlab', 'max_projects', default=32))
 DEFAULT_RUN_AS_USER = validate_key_values(CONFIG, 'base', 'default_run_as_user', default=None)
 DEFAULT_SECURITYGROUP_RULES = _generate_security_groups('default_securitygroup_rules')
 DEFAULT_EC2_SECURITYGROUPS = _generate_security_groups('default_ec2_securitygroups')
@@ -233,12 +248,45 @@ SECURITYGROUP_REPLACEMENTS = _convert_string_to_native(
 GITLAB_TOKEN = validate_key_values(CONFIG, 'credentials', 'gitlab_token')
 SLACK_TOKEN = validate_key_values(CONFIG, 'credentials', 'slack_token')
 GATE_AUTHENTICATION = validate_key_values(CONFIG, 'credentials', 'gate_authentication', default={})
-DEFAULT_TASK_TIMEOUT = validate_key_values(CONFIG, 'task_timeouts', 'default', default=120)
+DEFAULT_TASK_TIMEOUT = int(validate_key_values(CONFIG, 'task_timeouts', 'default', default=120))
 TASK_TIMEOUTS = json.loads(validate_key_values(CONFIG, 'task_timeouts', 'envs', default="{}"))
+TASK_HISTORY_PATH = expandvars(expanduser(validate_key_values(CONFIG, 'task_timeouts', 'history_path', default='')))
+FINGERPRINT_STORE = expandvars(expanduser(validate_key_values(CONFIG, 'fingerprints', 'store', default='')))
+FINGERPRINT_MAX_AGE = int(validate_key_values(CONFIG, 'fingerprints', 'max_age', default=86400))
 ASG_WHITELIST = set(validate_key_values(CONFIG, 'whitelists', 'asg_whitelist', default='').split(','))
 APP_FORMATS = extract_formats(CONFIG)
 GATE_CLIENT_CERT = expandvars(expanduser(validate_key_values(CONFIG, 'base', 'gate_client_cert', default='')))
 GATE_CA_BUNDLE = expandvars(expanduser(validate_key_values(CONFIG, 'base', 'gate_ca_bundle', default='')))
+GATE_POOL_CONNECTIONS = int(validate_key_values(CONFIG, 'gate', 'pool_connections', default=4))
+GATE_POOL_MAXSIZE = int(validate_key_values(CONFIG, 'gate', 'pool_maxsize', default=10))
+GATE_KEEP_ALIVE = _convert_string_to_bool(validate_key_values(CONFIG, 'gate', 'keep_alive', default=True))
+GATE_MAX_RETRIES = int(validate_key_values(CONFIG, 'gate', 'max_retries', default=3))
+GATE_RETRY_BACKOFF_FACTOR = float(validate_key_values(CONFIG, 'gate', 'retry_backoff_factor', default=0.5))
+GATE_MAX_CONCURRENCY = int(validate_key_values(CONFIG, 'gate', 'max_concurrency', default=10))
+GATE_CACHE_ENABLED = _convert_string_to_bool(validate_key_values(CONFIG, 'gate', 'cache_enabled', default=True))
+GATE_CACHE_MAX_ENTRIES = int(validate_key_values(CONFIG, 'gate', 'cache_max_entries', default=256))
+GATE_CACHE_TTLS = {
+    r'^/networks/aws$': 300,
+    r'^/subnets/aws$': 300,
+    r'^/credentials/[^/]+$': 300,
+    r'^/applications/[^/]+$': 60,
+}
+"""Read-only Gate endpoints cached per run, URI regular expression to TTL seconds.
+
+Entries from ``[gate] cache_ttls`` are merged over these defaults, a TTL of
+``0`` disables caching for that pattern.
+"""
+GATE_CACHE_TTLS.update(_convert_string_to_native(validate_key_values(CONFIG, 'gate', 'cache_ttls', default='{}')))
+GATE_DISK_CACHE_DIR = expandvars(expanduser(validate_key_values(CONFIG, 'gate', 'disk_cache_dir', default='')))
+GATE_DISK_CACHE_TTL = int(validate_key_values(CONFIG, 'gate', 'disk_cache_ttl', default=3600))
+GATE_DISK_CACHE_PATTERNS = (r'^/networks/aws$', r'^/subnets/aws$', r'^/credentials/[^/]+$')
+"""Gate topology endpoints shared between processes when ``[gate] disk_cache_dir`` is set."""
+GATE_COMPRESS_REQUESTS = _convert_string_to_bool(
+    validate_key_values(CONFIG, 'gate', 'compress_requests', default=False))
+GATE_COMPRESS_MIN_BYTES = int(validate_key_values(CONFIG, 'gate', 'compress_min_bytes', default=8192))
+GATE_HEDGE_REQUESTS = _convert_string_to_bool(validate_key_values(CONFIG, 'gate', 'hedge_requests', default=False))
+GATE_HEDGE_PERCENTILE = float(validate_key_values(CONFIG, 'gate', 'hedge_percentile', default=95))
+GATE_HEDGE_MIN_DELAY = float(validate_key_values(CONFIG, 'gate', 'hedge_min_delay', default=1.0))
 LINKS = _convert_string_to_native(validate_key_values(CONFIG, 'links', 'default', default='{}'))
 
 LAMBDA_STANDALONE_MODE = validate_key_values(CONFIG, 'lambda', 'standalone_mode', default=False)
@@ -119,7 +119,7 @@ class SpinnakerELB:
         json_data = self.make_elb_json()
         LOG.debug('Block ELB JSON Data:\n%s', pformat(json_data))
 
-        wait_for_task(json_data)
+        wait_for_task(json_data, fingerprint=(self.app, self.env, self.region, 'elb'))
 
         self.add_listener_policy(json_data)
         self.add_backend_policy(json_data)
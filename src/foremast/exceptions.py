@@ -86,6 +86,7 @@ class SpinnakerTaskError(SpinnakerError):
     """Spinnaker Task did not finish properly."""
 
     def __init__(self, task_state):
+        self.task_state = task_state
         errors = []
 
         skip_statuses = GOOD_STATUSES.union(SKIP_STATUSES)
@@ -129,6 +130,14 @@ class SpinnakerTaskInconclusiveError(SpinnakerTaskError):
         super().__init__(spinnaker_task_state)
 
 
+class SpinnakerTaskBatchError(SpinnakerTaskError):
+    """Spinnaker Task built from a batch of jobs did not finish properly."""
+
+    def __init__(self, task_state, failed_jobs):
+        self.failed_jobs = failed_jobs
+        super().__init__(task_state)
+
+
 class SpinnakerPipelineCreationFailed(SpinnakerError):
     """Could not create Spinnaker Pipeline."""
 
@@ -18,10 +18,10 @@ import collections
 import copy
 import json
 import logging
-from pprint import pformat
 
 from ..consts import ASG_WHITELIST, DEFAULT_EC2_SECURITYGROUPS, EC2_PIPELINE_TYPES, ENV_CONFIGS
-from ..utils import generate_encoded_user_data, get_template, remove_duplicate_sg, verify_approval_skip
+from ..utils import LazyPformat, generate_encoded_user_data, get_template, remove_duplicate_sg, verify_approval_skip
+from .stage_builders import build_stages
 
 LOG = logging.getLogger(__name__)
 
@@ -125,12 +125,15 @@ def construct_pipeline_block(env='',
         region_subnets (dict): Subnets for a Region, e.g.
             {'us-west-2': ['us-west-2a', 'us-west-2b', 'us-west-2c']}.
 
+    Built-in EC2 Stage templates are built as Python objects directly, see
+    :mod:`foremast.pipeline.stage_builders`.
+
     Returns:
-        dict: Pipeline JSON template rendered with configurations.
+        list: Pipeline Stages rendered with configurations.
 
     """
     LOG.info('%s block for [%s].', env, region)
-    LOG.debug('%s info:\n%s', env, pformat(settings))
+    LOG.debug('%s info:\n%s', env, LazyPformat(settings))
 
     pipeline_type = pipeline_data['type']
 
@@ -162,11 +165,13 @@ def construct_pipeline_block(env='',
         'pipeline': pipeline_data,
     })
 
-    LOG.debug('Block data:\n%s', pformat(data))
+    LOG.debug('Block data:\n%s', LazyPformat(data))
 
     template_name = get_template_name(env, pipeline_type)
-    pipeline_json = get_template(template_file=template_name, data=data, formats=generated, **kwargs)
-    return pipeline_json
+    stages = None if kwargs else build_stages(template_name, data)
+    if stages is None:
+        stages = json.loads(get_template(template_file=template_name, data=data, formats=generated, **kwargs))
+    return stages
 
 
 def ec2_pipeline_setup(
@@ -17,10 +17,9 @@
 import copy
 import json
 import logging
-from pprint import pformat
 
 from ..consts import DEFAULT_EC2_SECURITYGROUPS, ENV_CONFIGS
-from ..utils import generate_encoded_user_data, get_template, remove_duplicate_sg, verify_approval_skip
+from ..utils import LazyPformat, generate_encoded_user_data, get_template, remove_duplicate_sg, verify_approval_skip
 
 LOG = logging.getLogger(__name__)
 
@@ -58,7 +57,7 @@ def construct_pipeline_block_lambda(env='',
     else:
         template_name = 'pipeline/pipeline_stages_lambda.json.j2'
 
-    LOG.debug('%s info:\n%s', env, pformat(settings))
+    LOG.debug('%s info:\n%s', env, LazyPformat(settings))
 
     gen_app_name = generated.app_name()
     user_data = generate_encoded_user_data(
@@ -97,7 +96,7 @@ def construct_pipeline_block_lambda(env='',
         'lambda_package_type': pipeline_data['lambda']['package_type']
     })
 
-    LOG.debug('Block data:\n%s', pformat(data))
+    LOG.debug('Block data:\n%s', LazyPformat(data))
 
     pipeline_json = get_template(template_file=template_name, data=data, formats=generated)
     return pipeline_json
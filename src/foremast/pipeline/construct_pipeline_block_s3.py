@@ -16,10 +16,9 @@
 """Construct a block section of Stages in a Spinnaker Pipeline."""
 import copy
 import logging
-from pprint import pformat
 
 from ..consts import ENV_CONFIGS
-from ..utils import get_template, verify_approval_skip
+from ..utils import LazyPformat, get_template, verify_approval_skip
 
 LOG = logging.getLogger(__name__)
 
@@ -53,7 +52,7 @@ def construct_pipeline_block_s3(env='',
     else:
         template_name = 'pipeline/pipeline_stages_s3.json.j2'
 
-    LOG.debug('%s info:\n%s', env, pformat(settings))
+    LOG.debug('%s info:\n%s', env, LazyPformat(settings))
 
     gen_app_name = generated.app_name()
 
@@ -73,7 +72,7 @@ def construct_pipeline_block_s3(env='',
         'owner_email': pipeline_data['owner_email']
     })
 
-    LOG.debug('Block data:\n%s', pformat(data))
+    LOG.debug('Block data:\n%s', LazyPformat(data))
 
     pipeline_json = get_template(template_file=template_name, data=data, formats=generated)
     return pipeline_json
@@ -18,12 +18,13 @@ import collections
 import json
 import logging
 import os
-from pprint import pformat
 
-from ..consts import DEFAULT_RUN_AS_USER, EC2_PIPELINE_TYPES
+from ..consts import DEFAULT_RUN_AS_USER, EC2_PIPELINE_TYPES, PIPELINE_REGION_WORKERS
 from ..exceptions import SpinnakerPipelineCreationFailed
-from ..utils import ami_lookup, generate_packer_filename, get_details, get_properties, get_subnets, get_template
+from ..utils import (LazyPformat, ami_lookup, generate_packer_filename, get_details, get_properties, get_subnets,
+                     get_template)
 from ..utils.gate import gate_request
+from ..utils.parallel import run_in_order
 from .clean_pipelines import clean_pipelines
 from .construct_pipeline_block import construct_pipeline_block
 from .renumerate_stages import renumerate_stages
@@ -61,17 +62,20 @@ class SpinnakerPipeline:
     def post_pipeline(self, pipeline):
         """Send Pipeline JSON to Spinnaker.
 
+        Rendered pipelines are kept as Python objects while they are
+        assembled and only serialized here, once.
+
         Args:
-            pipeline (json): json of the pipeline to be created in Spinnaker
+            pipeline (dict, str): Pipeline to be created in Spinnaker.
         """
         uri = '/pipelines'
 
         if isinstance(pipeline, str):
             pipeline_json = pipeline
+            pipeline_dict = json.loads(pipeline_json)
         else:
             pipeline_json = json.dumps(pipeline)
-
-        pipeline_dict = json.loads(pipeline_json)
+            pipeline_dict = pipeline
 
         self.log.debug('Pipeline JSON:\n%s', pipeline_json)
 
@@ -86,13 +90,15 @@ class SpinnakerPipeline:
         self.log.info('Successfully created "%s" pipeline in application "%s".', pipeline_dict['name'],
                       pipeline_dict['application'])
 
-    def render_wrapper(self, region='us-east-1'):
+    def render_wrapper(self, region='us-east-1', generated=None):
         """Generate the base Pipeline wrapper.
 
         This renders the non-repeatable stages in a pipeline, like jenkins, baking, tagging and notifications.
 
         Args:
             region (str): AWS Region.
+            generated (foremastutils.Generator): Naming formats for *region*,
+                defaults to the Application's.
 
         Returns:
             dict: Rendered Pipeline wrapper.
@@ -137,12 +143,73 @@ class SpinnakerPipeline:
             'id': pipeline_id
         }
 
-        self.log.debug('Wrapper app data:\n%s', pformat(data))
+        self.log.debug('Wrapper app data:\n%s', LazyPformat(data))
 
-        wrapper = get_template(template_file='pipeline/pipeline_wrapper.json.j2', data=data, formats=self.generated)
+        wrapper = get_template(template_file='pipeline/pipeline_wrapper.json.j2', data=data,
+                               formats=generated or self.generated)
 
         return json.loads(wrapper)
 
+    def region_generated(self, region):
+        """Get naming formats updated for *region*.
+
+        Regions rendered concurrently each get a copy, so updating the
+        environment for one Region does not change names in another.
+
+        Args:
+            region (str): AWS Region.
+
+        Returns:
+            foremastutils.Generator: Naming formats to render *region* with.
+
+        """
+        generated = self.generated
+        if PIPELINE_REGION_WORKERS > 1:
+            # Generator.__getattr__ formats names from data, which copy.copy
+            # trips over before data is set, so copy the attributes directly.
+            generated = object.__new__(type(self.generated))
+            generated.__dict__.update(vars(self.generated), data=dict(self.generated.data))
+
+        generated.data.update({
+            'region': region,
+        })
+        return generated
+
+    def render_pipelines(self, render_region, regions_envs):
+        """Render a Pipeline for every Region.
+
+        Up to ``[base] pipeline_region_workers`` Regions are rendered at the
+        same time.
+
+        Args:
+            render_region (callable): Called with a Region and its
+                environments, returns the rendered Pipeline.
+            regions_envs (dict): Environments to deploy for each Region.
+
+        Returns:
+            dict: Rendered Pipelines by Region.
+
+        """
+        regions = list(regions_envs)
+        pipelines = run_in_order(lambda region: render_region(region, regions_envs[region]), regions,
+                                 max_workers=PIPELINE_REGION_WORKERS)
+        return dict(zip(regions, pipelines))
+
+    def post_pipelines(self, pipelines):
+        """Number the stages of every Pipeline and send them to Spinnaker.
+
+        Args:
+            pipelines (dict): Rendered Pipelines by Region.
+
+        """
+
+        def post_region(region):
+            """Send the Pipeline for *region*."""
+            renumerate_stages(pipelines[region])
+            self.post_pipeline(pipelines[region])
+
+        run_in_order(post_region, list(pipelines), max_workers=PIPELINE_REGION_WORKERS)
+
     def get_existing_pipelines(self):
         """Get existing pipeline configs for specific application.
 
@@ -208,34 +275,33 @@ class SpinnakerPipeline:
         self.log.info('Environments and Regions for Pipelines:\n%s', json.dumps(regions_envs, indent=4))
 
         subnets = None
-        pipelines = {}
-        for region, envs in regions_envs.items():
-            self.generated.data.update({
-                'region': region,
-            })
+        if regions_envs and self.settings['pipeline']['type'] in EC2_PIPELINE_TYPES:
+            subnets = get_subnets()
+
+        def render_region(region, envs):
+            """Render the wrapper and environment blocks for *region*."""
+            generated = self.region_generated(region)
 
             # TODO: Overrides for an environment no longer makes sense. Need to
             # provide override for entire Region possibly.
-            pipelines[region] = self.render_wrapper(region=region)
+            pipeline = self.render_wrapper(region=region, generated=generated)
 
             previous_env = None
             for env in envs:
-                self.generated.data.update({
+                generated.data.update({
                     'env': env,
                 })
 
                 pipeline_block_data = {
                     "env": env,
-                    "generated": self.generated,
+                    "generated": generated,
                     "previous_env": previous_env,
                     "region": region,
                     "settings": self.settings[env][region],
                     "pipeline_data": self.settings['pipeline'],
                 }
 
-                if self.settings['pipeline']['type'] in EC2_PIPELINE_TYPES:
-                    if not subnets:
-                        subnets = get_subnets()
+                if subnets is not None:
                     try:
                         region_subnets = {region: subnets[env][region]}
                     except KeyError:
@@ -243,15 +309,15 @@ class SpinnakerPipeline:
                         continue
                     pipeline_block_data['region_subnets'] = region_subnets
 
-                block = construct_pipeline_block(**pipeline_block_data)
-                pipelines[region]['stages'].extend(json.loads(block))
+                pipeline['stages'].extend(construct_pipeline_block(**pipeline_block_data))
                 previous_env = env
 
-        self.log.debug('Assembled Pipelines:\n%s', pformat(pipelines))
+            return pipeline
+
+        pipelines = self.render_pipelines(render_region, regions_envs)
 
-        for region, pipeline in pipelines.items():
-            renumerate_stages(pipeline)
+        self.log.debug('Assembled Pipelines:\n%s', LazyPformat(pipelines))
 
-            self.post_pipeline(pipeline)
+        self.post_pipelines(pipelines)
 
         return True
@@ -18,7 +18,7 @@ import json
 import jinja2
 
 
-from ..consts import TEMPLATES_PATH
+from ..consts import GITLAB_SNAPSHOT, RUNWAY_BASE_PATH, TEMPLATES_PATH
 from ..utils import get_pipeline_id, normalize_pipeline_name, get_jinja_environment
 from ..utils.lookups import FileLookup
 from .create_pipeline import SpinnakerPipeline
@@ -28,6 +28,8 @@ from .jinja_functions import get_jinja_functions, get_jinja_variables
 class SpinnakerPipelineManual(SpinnakerPipeline):
     """Manual JSON configured Spinnaker Pipelines."""
 
+    _repo_file_lookup = None
+
     def create_pipeline(self):
         """Use JSON files to create Pipelines."""
 
@@ -104,10 +106,27 @@ class SpinnakerPipelineManual(SpinnakerPipeline):
             lookup = FileLookup(git_short=None, runway_dir=pipeline_templates_path)
         else:
             # Consider it a local repo file, check local or git:
-            lookup = FileLookup(git_short=self.generated.gitlab()['main'], runway_dir=self.runway_dir)
+            lookup = self.get_repo_file_lookup()
 
         return lookup.get(filename=file_name)
 
+    def get_repo_file_lookup(self):
+        """Get the lookup for files in the application repository, shared by
+        all pipeline files and pinned to the commit the configs came from.
+
+        Returns:
+            FileLookup: Local runway or GitLab file lookup.
+        """
+        if self._repo_file_lookup is None:
+            snapshot_path = RUNWAY_BASE_PATH if GITLAB_SNAPSHOT and not self.runway_dir else ''
+            lookup = FileLookup(
+                git_short=self.generated.gitlab()['main'], runway_dir=self.runway_dir, snapshot_path=snapshot_path)
+            config_commit = self.settings['pipeline'].get('config_commit')
+            if config_commit and not self.runway_dir:
+                lookup.pin(config_commit)
+            self._repo_file_lookup = lookup
+        return self._repo_file_lookup
+
     def get_rendered_json(self, json_string, pipeline_vars=None):
         """Takes a string of a manual template and renders it as a Jinja2 template, returning the result
 
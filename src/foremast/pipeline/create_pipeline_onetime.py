@@ -49,11 +49,9 @@ class SpinnakerPipelineOnetime(SpinnakerPipeline):
             pipeline (dict, str): New Pipeline to create.
         """
         if isinstance(pipeline, str):
-            pipeline_str = pipeline
+            pipeline_json = json.loads(pipeline)
         else:
-            pipeline_str = json.dumps(pipeline)
-
-        pipeline_json = json.loads(pipeline_str)
+            pipeline_json = dict(pipeline)
 
         # Note pipeline name is manual
         name = '{0} (onetime-{1})'.format(pipeline_json['name'], self.environments[0])
@@ -67,8 +65,7 @@ class SpinnakerPipelineOnetime(SpinnakerPipeline):
             del pipeline_json['id']
 
         # disable trigger as not to accidently kick off multiple deployments
-        for trigger in pipeline_json['triggers']:
-            trigger['enabled'] = False
+        pipeline_json['triggers'] = [dict(trigger, enabled=False) for trigger in pipeline_json['triggers']]
 
         self.log.debug('Manual Pipeline JSON:\n%s', pipeline_json)
         super().post_pipeline(pipeline_json)
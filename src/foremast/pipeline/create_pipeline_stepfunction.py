@@ -16,14 +16,12 @@
 """Create Pipelines for Spinnaker."""
 import collections
 import json
-from pprint import pformat
 
 from ..consts import DEFAULT_RUN_AS_USER
-from ..utils import get_template
+from ..utils import LazyPformat, get_template
 from .clean_pipelines import clean_pipelines
 from .construct_pipeline_block_stepfunction import construct_stepfunction
 from .create_pipeline import SpinnakerPipeline
-from .renumerate_stages import renumerate_stages
 
 
 class SpinnakerPipelineStepFunction(SpinnakerPipeline):
@@ -72,7 +70,7 @@ class SpinnakerPipelineStepFunction(SpinnakerPipeline):
             'id': pipeline_id
         }
 
-        self.log.debug('Wrapper app data:\n%s', pformat(data))
+        self.log.debug('Wrapper app data:\n%s', LazyPformat(data))
 
         wrapper = get_template(template_file='pipeline/pipeline_wrapper.json.j2', data=data, formats=self.generated)
 
@@ -96,11 +94,11 @@ class SpinnakerPipelineStepFunction(SpinnakerPipeline):
                 regions_envs[region].append(env)
         self.log.info('Environments and Regions for Pipelines:\n%s', json.dumps(regions_envs, indent=4))
 
-        pipelines = {}
-        for region, envs in regions_envs.items():
+        def render_region(region, envs):
+            """Render the wrapper and environment blocks for *region*."""
             # TODO: Overrides for an environment no longer makes sense. Need to
             # provide override for entire Region possibly.
-            pipelines[region] = self.render_wrapper(region=region)
+            pipeline = self.render_wrapper(region=region)
 
             previous_env = None
             for env in envs:
@@ -112,15 +110,16 @@ class SpinnakerPipelineStepFunction(SpinnakerPipeline):
                     region=region,
                     settings=self.settings[env][region],
                     pipeline_data=self.settings['pipeline'])
-                pipelines[region]['stages'].extend(json.loads(block))
+                pipeline['stages'].extend(json.loads(block))
 
                 previous_env = env
 
-        self.log.debug('Assembled Pipelines:\n%s', pformat(pipelines))
+            return pipeline
 
-        for region, pipeline in pipelines.items():
-            renumerate_stages(pipeline)
+        pipelines = self.render_pipelines(render_region, regions_envs)
 
-            self.post_pipeline(pipeline)
+        self.log.debug('Assembled Pipelines:\n%s', LazyPformat(pipelines))
+
+        self.post_pipelines(pipelines)
 
         return True
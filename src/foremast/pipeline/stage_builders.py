@@ -0,0 +1,313 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2018 Gogo, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Build the Stages of built-in EC2 Pipeline templates as Python objects.
+
+Each builder produces the same objects as parsing the JSON its template
+renders, without rendering text first. Builders are only used while every
+template they reproduce is the unchanged built-in one, otherwise the template
+is rendered as usual.
+"""
+import hashlib
+import json
+import logging
+import re
+
+from ..utils import get_jinja_environment, is_external_template
+from ..utils.templates import LOCAL_TEMPLATES
+
+LOG = logging.getLogger(__name__)
+
+BUILTIN_DIGESTS = {
+    'pipeline/pipeline_stages.json.j2': '6e8ee9a8323fcabe9fa9b922ba56642cb64f1e0eba60e35b38b63714eeef731a',
+    'pipeline/pipeline_prod.json.j2': '72cfa90f647afd64321704b5bdaac8cd0bd90f2ef2d46c36afa498ea06c9e3c1',
+    'pipeline/stage-judgement-nonprod.json.j2': '393fa202a4b3d07029f83ef723f00bcdb3392c55d32492e53f6f0d8ab5003991',
+    'pipeline/stage-infrastructure-setup.json.j2': 'eed52cac07d4ebd03037835ecca59108cccff28c93330f7687e61c8b9324d5a5',
+    'pipeline/stage-deploy.json.j2': 'fc1477597469d4d8ad13c66e6d091a34402ff5a8a47a25e6789fc08a29c23005',
+    'pipeline/stage-scaling-policy.json.j2': 'c8513267905274b943492eafff7e5242833124d24c5416bda38b14fcba668cb3',
+    'pipeline/stage-completion-webhooks.json.j2': '6f4e3acfda4194136a1f5a4c97ad186b7bea976be6638ad39ab6d0ff0ce6a534',
+}
+"""SHA-256 of the built-in template sources the builders reproduce."""
+
+JSON_STRING_ESCAPES = re.compile(r'["\\\x00-\x1f]')
+
+_UNCHANGED = {}
+
+
+def _string(text):
+    """Get the JSON string a template renders as ``"text"``."""
+    text = str(text)
+    if JSON_STRING_ESCAPES.search(text):
+        return json.loads('"{0}"'.format(text))
+    return text
+
+
+def _literal(value):
+    """Get the JSON value a template renders as a bare ``{{ value }}``."""
+    if type(value) is int:  # pylint: disable=unidiomatic-typecheck
+        return value
+    return json.loads(str(value))
+
+
+def _tojson(value):
+    """Get the JSON value a template renders with the ``tojson`` filter."""
+    return json.loads(json.dumps(value, sort_keys=True))
+
+
+def judgement_nonprod_stage(data, attr):
+    """Build ``pipeline/stage-judgement-nonprod.json.j2``."""
+    app = attr(data, 'app')
+    environment = attr(app, 'environment')
+
+    stage = {
+        'requisiteStageRefIds': [''],
+        'refId': 'master',
+        'type': 'manualJudgment',
+        'name': _string('Checkpoint {0}'.format(environment)),
+        'notifications': [],
+        'judgmentInputs': [],
+        'failPipeline': False,
+    }
+    if attr(app, 'approval_timeout'):
+        stage['stageTimeoutMs'] = _literal(attr(app, 'approval_timeout'))
+    stage['instructions'] = _string(
+        "I confirm that I'm ready for this application to be promoted to <strong>{0}</strong>.".format(environment))
+    stage['comments'] = ''
+    return stage
+
+
+def jenkins_stage(data, attr, ref_id, comments, name, job):
+    """Build the Jenkins Stages of ``pipeline/stage-infrastructure-setup.json.j2`` and
+    ``pipeline/stage-scaling-policy.json.j2``."""
+    app = attr(data, 'app')
+    environment = attr(app, 'environment')
+
+    return {
+        'requisiteStageRefIds': [''],
+        'refId': ref_id,
+        'type': 'jenkins',
+        'comments': _string(comments.format(environment)),
+        'name': _string(name.format(environment)),
+        'failPipeline': True,
+        'master': 'JenkinsCI',
+        'job': job,
+        'parameters': {
+            'PROJECT': _string(attr(app, 'group_name')),
+            'GIT_REPO': _string(attr(app, 'repo_name')),
+            'ENV': _string(environment),
+            'REGION': _string(attr(app, 'region')),
+        },
+    }
+
+
+def infrastructure_setup_stage(data, attr):
+    """Build ``pipeline/stage-infrastructure-setup.json.j2``."""
+    return jenkins_stage(
+        data,
+        attr,
+        ref_id='master',
+        comments=('This stage will run the infrastructure setup scripts to setup ELBs, security groups, and s3 '
+                  'buckets in <b>{0}</b>. This will look at the applications runway/ configuration files to '
+                  'determine setup'),
+        name='Infrastructure Setup [{0}]',
+        job='pipes-pipeline-prepare')
+
+
+def scaling_policy_stage(data, attr):
+    """Build ``pipeline/stage-scaling-policy.json.j2``."""
+    return jenkins_stage(data,
+                         attr,
+                         ref_id='branch',
+                         comments='This stage will apply a scaling policy if provided in <b>{0}</b>.',
+                         name='Attach Scaling Policy [{0}]',
+                         job='pipes-scaling-policy')
+
+
+def deploy_stage(data, attr):
+    """Build ``pipeline/stage-deploy.json.j2``."""
+    app = attr(data, 'app')
+    asg = attr(data, 'asg')
+
+    cluster = {
+        'base64UserData': _string(attr(app, 'encoded_user_data')),
+        'application': _string(attr(app, 'appname')),
+        'strategy': _string(attr(data, 'deploy_strategy')),
+        'maxRemainingAsgs': 2,
+        'scaleDown': True,
+        'capacity': {
+            'min': _literal(attr(asg, 'min_inst')),
+            'max': _literal(attr(asg, 'max_inst')),
+            'desired': _literal(attr(asg, 'min_inst')),
+        },
+        'blockDevices': [],
+        'targetHealthyDeployPercentage': 100,
+        'cooldown': 10,
+        'healthCheckType': _string(attr(asg, 'hc_type')),
+        'healthCheckGracePeriod': _string(attr(asg, 'hc_grace_period')),
+    }
+    if attr(asg, 'has_provider_healthcheck'):
+        cluster['interestingHealthProviderNames'] = _literal(attr(asg, 'provider_healthcheck'))
+
+    tags = {}
+    if attr(app, 'custom_tags'):
+        for tag_key, tag_value in attr(app, 'custom_tags').items():
+            tags[_string(tag_key)] = _string(tag_value)
+    tags['app_group'] = _string(attr(app, 'group_name'))
+    tags['app_name'] = _string(attr(app, 'appname'))
+    tags['owner_email'] = _string(attr(app, 'owner_email'))
+
+    cluster.update({
+        'instanceMonitoring': False,
+        'ebsOptimized': False,
+        'iamRole': _string(attr(app, 'instance_profile')),
+        'terminationPolicies': ['Default'],
+        'availabilityZones': _literal(attr(app, 'az_dict')),
+        'keyPair': _string(attr(asg, 'ssh_keypair')),
+        'suspendedProcesses': [],
+        'securityGroups': _literal(attr(app, 'instance_security_groups')),
+        'tags': tags,
+        'subnetType': _string(attr(asg, 'subnet_purpose')),
+        'virtualizationType': None,
+        'loadBalancers': _literal(attr(app, 'elb')),
+        'instanceType': _string(attr(app, 'instance_type')),
+        'useSourceCapacity': False,
+        'associatePublicIpAddress': _literal(attr(asg, 'enable_public_ips')),
+        'provider': 'aws',
+        'cloudProvider': 'aws',
+        'account': _string(attr(app, 'environment')),
+    })
+
+    return {
+        'requisiteStageRefIds': [''],
+        'refId': 'master',
+        'type': 'deploy',
+        'name': _string('Deploy {0}'.format(attr(app, 'environment'))),
+        'clusters': [cluster],
+        'comments': '',
+        'restrictExecutionDuringTimeWindow': False,
+    }
+
+
+def completion_webhook_stages(data, attr):
+    """Build ``pipeline/stage-completion-webhooks.json.j2``."""
+    environment = attr(attr(data, 'app'), 'environment')
+
+    stages = []
+    for hook in attr(data, 'completion_webhooks'):
+        custom_headers = attr(hook, 'custom_headers')
+        stages.append({
+            'refId': 'branch',
+            'type': 'webhook',
+            'url': _string(attr(hook, 'url')),
+            'name': _string('{0}: {1}'.format(str(environment).upper(), attr(hook, 'name'))),
+            'customHeaders': _tojson(custom_headers) if custom_headers else {},
+            'method': _string(str(attr(hook, 'method')).upper()),
+            'payload': _tojson(attr(hook, 'payload')),
+            'statusUrlResolution': 'getMethod',
+        })
+    return stages
+
+
+def pipeline_stages(data, attr):
+    """Build ``pipeline/pipeline_stages.json.j2``."""
+    app = attr(data, 'app')
+
+    stages = []
+    if attr(app, 'previous_env') and not attr(app, 'approval_skip'):
+        stages.append(judgement_nonprod_stage(data, attr))
+    stages.append(infrastructure_setup_stage(data, attr))
+    stages.append(deploy_stage(data, attr))
+    if attr(app, 'scalingpolicy'):
+        stages.append(scaling_policy_stage(data, attr))
+    if 'completion_webhooks' in data and attr(data, 'completion_webhooks'):
+        stages.extend(completion_webhook_stages(data, attr))
+    return stages
+
+
+def pipeline_prod(data, attr):
+    """Build ``pipeline/pipeline_prod.json.j2``."""
+    app = attr(data, 'app')
+
+    stages = []
+    if not attr(app, 'approval_skip'):
+        stages.append(judgement_nonprod_stage(data, attr))
+    stages.append(infrastructure_setup_stage(data, attr))
+    stages.append(deploy_stage(data, attr))
+    stages.append(deploy_stage(data, attr))
+    if attr(app, 'scalingpolicy'):
+        stages.append(scaling_policy_stage(data, attr))
+    return stages
+
+
+STAGE_BUILDERS = {
+    'pipeline/pipeline_stages.json.j2': (pipeline_stages, (
+        'pipeline/pipeline_stages.json.j2',
+        'pipeline/stage-judgement-nonprod.json.j2',
+        'pipeline/stage-infrastructure-setup.json.j2',
+        'pipeline/stage-deploy.json.j2',
+        'pipeline/stage-scaling-policy.json.j2',
+        'pipeline/stage-completion-webhooks.json.j2',
+    )),
+    'pipeline/pipeline_prod.json.j2': (pipeline_prod, (
+        'pipeline/pipeline_prod.json.j2',
+        'pipeline/stage-judgement-nonprod.json.j2',
+        'pipeline/stage-infrastructure-setup.json.j2',
+        'pipeline/stage-deploy.json.j2',
+        'pipeline/stage-scaling-policy.json.j2',
+    )),
+}
+"""Builders by template name, with every template each one reproduces."""
+
+
+def is_builtin_unchanged(template_file):
+    """Check the built-in source of *template_file* still matches :data:`BUILTIN_DIGESTS`.
+
+    The result is kept for the rest of the process.
+    """
+    unchanged = _UNCHANGED.get(template_file)
+    if unchanged is None:
+        try:
+            with open(str(LOCAL_TEMPLATES.joinpath(template_file)), 'rb') as source_file:
+                digest = hashlib.sha256(source_file.read()).hexdigest()
+        except OSError:
+            digest = None
+        unchanged = _UNCHANGED[template_file] = digest == BUILTIN_DIGESTS.get(template_file)
+    return unchanged
+
+
+def build_stages(template_file, data):
+    """Build the Stages *template_file* renders from *data* as Python objects.
+
+    Args:
+        template_file (str): Name of the Pipeline Stages template.
+        data (dict): Block data the template is rendered with.
+
+    Returns:
+        list: Stages, None when there is no builder for *template_file* or
+        one of the templates it reproduces is external or changed.
+
+    """
+    try:
+        builder, template_files = STAGE_BUILDERS[template_file]
+    except KeyError:
+        return None
+
+    for name in template_files:
+        if is_external_template(name) or not is_builtin_unchanged(name):
+            LOG.debug('Rendering %s from its template, %s is not the built-in one', template_file, name)
+            return None
+
+    LOG.info('Building stages of template %s', template_file)
+    return builder(data, get_jinja_environment().getattr)
@@ -75,6 +75,7 @@ class ForemastRunner:
         self.raw_path = "./raw.properties"
         self.json_path = self.raw_path + ".json"
         self.configs = None
+        self.properties = None
 
     def write_configs(self):
         """Generate the configurations needed for pipes."""
@@ -86,6 +87,7 @@ class ForemastRunner:
 
         self.configs = configs.write_variables(
             app_configs=app_configs, out_file=self.raw_path, git_short=self.git_short)
+        self.properties = utils.register_properties(self.json_path, self.configs)
 
     def create_app(self):
         """Create the spinnaker application."""
@@ -315,6 +317,7 @@ class ForemastRunner:
 
     def cleanup(self):
         """Clean up generated files."""
+        utils.unregister_properties(self.json_path)
         os.remove(self.raw_path)
 
     def check_env_defined(self):
@@ -327,8 +330,13 @@ class ForemastRunner:
                                 + "Check pipeline.json and application-master-{}.json".format(self.env))
 
 
-def prepare_infrastructure():
+def prepare_infrastructure(force=False):
     """Entry point for preparing the infrastructure in a specific env."""
+    force = force or os.getenv("FORCE", "false").lower() == "true"
+
+    if force:
+        LOG.info('Forcing all Tasks, ignoring fingerprints of previous runs.')
+        utils.tasks.TASK_FINGERPRINTS.force = True
 
     runner = ForemastRunner()
     runner.write_configs()
@@ -118,15 +118,19 @@ class SpinnakerSecurityGroup:
         self.log.debug('SG reference rules: %s', non_cidr)
         return non_cidr, cidr
 
-    def add_tags(self):
+    def add_tags(self, group_id=None):
         """Add tags to security group.
 
+        Args:
+            group_id (str): Security Group ID, looked up when not provided.
+
         Returns:
             True: Upon successful completion.
         """
         session = boto3.session.Session(profile_name=self.env, region_name=self.region)
         resource = session.resource('ec2')
-        group_id = get_security_group_id(self.app_name, self.env, self.region)
+        if not group_id:
+            group_id = get_security_group_id(self.app_name, self.env, self.region)
         security_group = resource.SecurityGroup(group_id)
 
         try:
@@ -145,11 +149,12 @@ class SpinnakerSecurityGroup:
 
         return True
 
-    def add_cidr_rules(self, rules):
+    def add_cidr_rules(self, rules, group_id=None):
         """Add cidr rules to security group via boto.
 
         Args:
             rules (list): Allowed Security Group ports and protocols.
+            group_id (str): Security Group ID, looked up when not provided.
 
         Returns:
             True: Upon successful completion.
@@ -161,7 +166,8 @@ class SpinnakerSecurityGroup:
         session = boto3.session.Session(profile_name=self.env, region_name=self.region)
         client = session.client('ec2')
 
-        group_id = get_security_group_id(self.app_name, self.env, self.region)
+        if not group_id:
+            group_id = get_security_group_id(self.app_name, self.env, self.region)
 
         for rule in rules:
             data = {
@@ -207,9 +213,14 @@ class SpinnakerSecurityGroup:
         self.log.info('Updated default rules:\n%s', ingress)
         return resolved_ingress
 
-    def _create_security_group(self, ingress):
+    def _create_security_group(self, ingress, fingerprint=None):
         """Send a POST to spinnaker to create a new security group.
 
+        Args:
+            ingress (list): Security Group reference rules.
+            fingerprint (tuple): Skip the Task when unchanged since the last
+                successful upsert, see :func:`foremast.utils.tasks.wait_for_task`.
+
         Returns:
             boolean: True if created successfully
 
@@ -226,7 +237,7 @@ class SpinnakerSecurityGroup:
         secgroup_json = get_template(
             template_file='infrastructure/securitygroup_data.json.j2', formats=self.generated, **template_kwargs)
 
-        wait_for_task(secgroup_json)
+        wait_for_task(secgroup_json, fingerprint=fingerprint)
         return True
 
     def create_security_group(self):  # noqa
@@ -244,7 +255,8 @@ class SpinnakerSecurityGroup:
         try:
             security_id = get_security_group_id(name=self.app_name, env=self.env, region=self.region)
         except (SpinnakerSecurityGroupError, AssertionError):
-            self._create_security_group(ingress_rules)
+            security_id = None
+            self.log.info('Security Group for %s not found, it will be created.', self.app_name)
         else:
             self.log.debug('Security Group ID %s found for %s.', security_id, self.app_name)
 
@@ -267,13 +279,21 @@ class SpinnakerSecurityGroup:
 
         ingress_rules_no_cidr, ingress_rules_cidr = self._process_rules(ingress_rules)
 
-        self._create_security_group(ingress_rules_no_cidr)
+        # A single upsert creates the group with its full ingress, Spinnaker
+        # resolves references to the group being created by name. Unchanged
+        # existing groups skip the upsert entirely.
+        fingerprint = (self.app_name, self.env, self.region, 'securitygroup') if security_id else None
+        self._create_security_group(ingress_rules_no_cidr, fingerprint=fingerprint)
+
+        # The upsert Task does not report the ID of a new group
+        if not security_id:
+            security_id = get_security_group_id(name=self.app_name, env=self.env, region=self.region)
 
         # Append cidr rules
-        self.add_cidr_rules(ingress_rules_cidr)
+        self.add_cidr_rules(ingress_rules_cidr, group_id=security_id)
 
         # Tag security group
-        self.add_tags()
+        self.add_tags(group_id=security_id)
 
         self.log.info('Successfully created %s security group', self.app_name)
         return True
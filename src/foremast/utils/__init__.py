@@ -18,7 +18,8 @@ from .apps import *
 from .asg import *
 from .banners import *
 from .pipelines import *
-from .deep_chain_map import DeepChainMap
+from .pretty import *
+from .deep_chain_map import DeepChainMap, DeepMerge, deep_merge
 from .elb import *
 from .encoding import *
 from .foremast_configs import *
@@ -1,4 +1,5 @@
 import logging
+import random
 
 LOG = logging.getLogger(__name__)
 
@@ -24,3 +25,40 @@ def exponential_backoff(attempt, exponent=2) -> float:
     wait = exponent ** attempt
     LOG.debug("Backing off for {} seconds".format(wait))
     return wait
+
+
+def jittered_backoff_delays(timeout, initial=0.5, factor=1.5, maximum=10.0, jitter=0.2, expected=None):
+    """Generate polling delays that start fast and grow exponentially with jitter.
+
+    Each delay is ``initial * factor ** n`` capped at *maximum* and randomly
+    scaled by up to *jitter* in either direction. When an *expected*
+    duration is known, the first delay waits for most of it so polling
+    concentrates around the likely completion time. Delays stop once their
+    total reaches *timeout*.
+
+    Args:
+        timeout(float): Total seconds to generate delays for
+        initial(float): First delay in seconds
+        factor(float): Multiplier applied to each following delay
+        maximum(float): Largest delay in seconds
+        jitter(float): Fraction of each delay to randomly add or remove
+        expected(float): Typical seconds until the polled operation finishes
+
+    Yields:
+        float: Seconds to wait before the next poll.
+    """
+    elapsed = 0
+    attempt = 0
+
+    if expected:
+        delay = min(max(expected * 0.8, initial), timeout)
+        elapsed += delay
+        yield delay
+
+    while elapsed < timeout:
+        delay = min(initial * factor ** attempt, maximum)
+        delay *= random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay, timeout - elapsed)
+        elapsed += delay
+        attempt += 1
+        yield delay
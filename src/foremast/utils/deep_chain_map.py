@@ -55,3 +55,78 @@ class DeepChainMap(collections.ChainMap):
             except KeyError:
                 pass
         return self.__missing__(key)
+
+
+class DeepMerge:
+    """Eagerly merge nested dicts with the same precedence as
+    :class:`DeepChainMap`.
+
+    The merged result is built once instead of on every lookup. Merges of the
+    same input objects are remembered internally, so regions built from shared
+    config sections only merge them once, but every call returns its own
+    copy of the nested dicts and lists.
+
+        >>> first = {'key1': {'key1_1': 'first_one'}}
+        >>> second = {'key1': {'key1_1': 'second_one', 'key1_2': 'second_two'}}
+        >>> DeepMerge().merge(first, second)['key1']
+        {'key1_1': 'first_one', 'key1_2': 'second_two'}
+        >>> DeepMerge().merge(second, first)['key1']
+        {'key1_1': 'second_one', 'key1_2': 'second_two'}
+    """
+
+    def __init__(self):
+        self._memo = {}
+
+    def merge(self, *maps):
+        """Merge _maps_, earlier maps taking precedence.
+
+        Args:
+            maps (dict): Mappings in order of precedence.
+
+        Returns:
+            dict: New dict with nested dicts merged at every level, keys in
+            the same order as ``dict(DeepChainMap(*maps))``.
+        """
+        return _copy_containers(self._merge(maps))
+
+    def _merge(self, maps):
+        """Merge _maps_ into a memoized result that is never handed out."""
+        memo_key = tuple(id(mapping) for mapping in maps)
+        if memo_key in self._memo:
+            return self._memo[memo_key][1]
+
+        keys = {}
+        for mapping in reversed(maps):
+            keys.update(dict.fromkeys(mapping))
+
+        merged = {}
+        for key in keys:
+            value = next(mapping[key] for mapping in maps if key in mapping)
+            if isinstance(value, dict):
+                value = self._merge([mapping[key] for mapping in maps if isinstance(mapping.get(key), dict)])
+            merged[key] = value
+
+        # Keep the inputs alive so their ids are not reused during this merge
+        self._memo[memo_key] = (maps, merged)
+        return merged
+
+
+def _copy_containers(value):
+    """Copy nested dicts and lists of _value_, sharing only the leaves."""
+    if isinstance(value, dict):
+        return {key: _copy_containers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(item) for item in value]
+    return value
+
+
+def deep_merge(*maps):
+    """Eagerly merge nested dicts, see :class:`DeepMerge`.
+
+    Args:
+        maps (dict): Mappings in order of precedence.
+
+    Returns:
+        dict: Merged configuration.
+    """
+    return DeepMerge().merge(*maps)
@@ -0,0 +1,179 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Size bounded disk cache for files looked up from Git and AMI tables."""
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+
+class FileCache:
+    """Content addressed disk cache with least recently used eviction.
+
+    Entries are keyed by a tuple such as (project, commit, path), which never
+    changes meaning for a commit SHA, so entries only expire when a TTL is
+    given. Reading an entry refreshes its modification time, the oldest
+    entries are removed once the directory grows past *max_bytes*.
+
+    Args:
+        directory (str): Directory holding cache files, disabled when empty.
+        max_bytes (int): Largest total size of cache files.
+        clock (callable): Time source, returns seconds since the epoch.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024, clock=time.time):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        self._size = None
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        """Get the cache file path for *key*."""
+        digest = hashlib.sha256(json.dumps(list(key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, '{}.json'.format(digest))
+
+    def get(self, key, allow_expired=False):
+        """Look up a fresh entry.
+
+        Args:
+            key (tuple): Parts identifying the cached content.
+            allow_expired (bool): Also return expired entries, e.g. to
+                revalidate them with the origin.
+
+        Returns:
+            dict: Entry with the cached ``value`` and whether it is ``fresh``,
+            None when missing, expired or disabled.
+
+        """
+        if not self.directory:
+            return None
+
+        path = self.path_for(key)
+        try:
+            with open(path, 'rt') as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None:
+            entry['fresh'] = not entry['expires'] or entry['expires'] > self.clock()
+
+        if entry is None or not (entry['fresh'] or allow_expired):
+            self.stats['misses'] += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            LOG.debug('Cache file removed while reading: %s', path)
+
+        self.stats['hits'] += 1
+        return entry
+
+    def set(self, key, value, ttl=None):
+        """Atomically store *value* for *key*.
+
+        Args:
+            key (tuple): Parts identifying the cached content.
+            value: JSON serializable content, None records a missing file.
+            ttl (int): Seconds before the entry expires, never when None.
+
+        """
+        if not self.directory:
+            return
+
+        entry = {'key': list(key), 'expires': self.clock() + ttl if ttl else None, 'value': value}
+        path = self.path_for(key)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        except OSError:
+            LOG.warning('Unable to write file cache in %s', self.directory)
+            return
+
+        try:
+            with os.fdopen(file_descriptor, 'wt') as temp_file:
+                json.dump(entry, temp_file)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+        except OSError:
+            LOG.warning('Unable to write file cache entry for %s', key)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += size
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """List cache files as (modification time, size, path), oldest first."""
+        files = []
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return sorted(files)
+
+    def _evict(self):
+        """Remove least recently used files until under :attr:`max_bytes`."""
+        files = self._scan()
+        self._size = sum(size for _, size, _ in files)
+
+        for _, size, path in files:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                LOG.debug('Cache file already removed: %s', path)
+            self._size -= size
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        """Remove all cache files.
+
+        Returns:
+            int: Number of files removed.
+
+        """
+        removed = 0
+        with self._lock:
+            for _, _, path in self._scan():
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    LOG.debug('Cache file already removed: %s', path)
+            self._size = 0
+        return removed
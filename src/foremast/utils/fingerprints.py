@@ -0,0 +1,171 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Remember the last successfully applied Spinnaker Task payloads."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+import boto3
+import botocore.exceptions
+
+LOG = logging.getLogger(__name__)
+
+
+class FingerprintStore:
+    """Hashes of Task payloads last applied per application, environment,
+    region and resource.
+
+    Fingerprints are kept as one small JSON document per resource, either in
+    a local directory or under an S3 prefix given as ``s3://bucket/prefix``,
+    so concurrent runs for different resources never overwrite each other.
+
+    Args:
+        location (str): Local directory or S3 URL, disabled when empty.
+        max_age (int): Seconds a fingerprint is trusted for, after which the
+            Task is submitted again to correct any drift. 0 never expires.
+        force (bool): Always submit Tasks while still recording fingerprints.
+        clock (callable): Time source, returns seconds since the epoch.
+    """
+
+    def __init__(self, location='', max_age=86400, force=False, clock=time.time):
+        self.location = location
+        self.max_age = max_age
+        self.force = force
+        self.clock = clock
+
+        self._s3_client = None
+
+    @property
+    def enabled(self):
+        """Check a location is configured."""
+        return bool(self.location)
+
+    @staticmethod
+    def fingerprint(payload):
+        """Hash a Task payload independent of key order and whitespace.
+
+        Args:
+            payload (str or dict): Task JSON or data.
+
+        Returns:
+            str: Hex SHA-256 digest.
+
+        """
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                LOG.debug('Fingerprinting payload as plain text')
+
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _relative_path(key):
+        """Build the document path for a (app, env, region, resource) *key*."""
+        return '{}.json'.format('/'.join(str(part) for part in key))
+
+    def _s3_location(self, key):
+        """Split the configured S3 URL into bucket and object key for *key*."""
+        bucket, _, prefix = self.location[len('s3://'):].partition('/')
+        object_key = '/'.join(filter(None, (prefix.strip('/'), self._relative_path(key))))
+        return bucket, object_key
+
+    @property
+    def s3_client(self):
+        """S3 client created on first use."""
+        if self._s3_client is None:
+            self._s3_client = boto3.session.Session().client('s3')
+        return self._s3_client
+
+    def _read(self, key):
+        """Read the stored document for *key*, None when missing or unreadable."""
+        if self.location.startswith('s3://'):
+            bucket, object_key = self._s3_location(key)
+            try:
+                response = self.s3_client.get_object(Bucket=bucket, Key=object_key)
+                return json.loads(response['Body'].read().decode('utf-8'))
+            except (botocore.exceptions.ClientError, ValueError) as error:
+                LOG.debug('No fingerprint in s3://%s/%s: %s', bucket, object_key, error)
+                return None
+
+        try:
+            with open(os.path.join(self.location, self._relative_path(key)), 'rt') as fingerprint_file:
+                return json.load(fingerprint_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key, document):
+        """Store *document* for *key*, failures only lose the optimization."""
+        body = json.dumps(document)
+
+        if self.location.startswith('s3://'):
+            bucket, object_key = self._s3_location(key)
+            try:
+                self.s3_client.put_object(Bucket=bucket, Key=object_key, Body=body.encode('utf-8'))
+            except botocore.exceptions.ClientError as error:
+                LOG.warning('Unable to save fingerprint to s3://%s/%s: %s', bucket, object_key, error)
+            return
+
+        path = os.path.join(self.location, self._relative_path(key))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.fingerprint-')
+            with os.fdopen(file_descriptor, 'wt') as temp_file:
+                temp_file.write(body)
+            os.replace(temp_path, path)
+        except OSError:
+            LOG.warning('Unable to save fingerprint to %s', path)
+
+    def unchanged(self, key, payload):
+        """Check *payload* matches the last successful apply of *key*.
+
+        Args:
+            key (tuple): Application, environment, region and resource name.
+            payload (str or dict): Task JSON or data about to be submitted.
+
+        Returns:
+            bool: True when submitting the Task can be skipped.
+
+        """
+        if not self.enabled or self.force:
+            return False
+
+        document = self._read(key)
+        if not document or document.get('fingerprint') != self.fingerprint(payload):
+            return False
+
+        if self.max_age and self.clock() - document.get('applied', 0) > self.max_age:
+            LOG.debug('Fingerprint for %s is older than %d seconds', key, self.max_age)
+            return False
+
+        return True
+
+    def record(self, key, payload):
+        """Remember *payload* was successfully applied for *key*.
+
+        Args:
+            key (tuple): Application, environment, region and resource name.
+            payload (str or dict): Task JSON or data that was submitted.
+
+        """
+        if not self.enabled:
+            return
+
+        self._write(key, {'fingerprint': self.fingerprint(payload), 'applied': self.clock()})
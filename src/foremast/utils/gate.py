@@ -14,33 +14,207 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Centralized Methods interacting with the Spinnaker Gate API."""
+import asyncio
+import atexit
+import gzip
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from ..consts import API_URL, GATE_AUTHENTICATION, GATE_CA_BUNDLE, GATE_CLIENT_CERT
+from ..consts import (API_URL, GATE_AUTHENTICATION, GATE_CA_BUNDLE, GATE_CACHE_ENABLED, GATE_CACHE_MAX_ENTRIES,
+                      GATE_CACHE_TTLS, GATE_CLIENT_CERT, GATE_COMPRESS_MIN_BYTES, GATE_COMPRESS_REQUESTS,
+                      GATE_DISK_CACHE_DIR, GATE_DISK_CACHE_PATTERNS, GATE_DISK_CACHE_TTL, GATE_HEDGE_MIN_DELAY,
+                      GATE_HEDGE_PERCENTILE, GATE_HEDGE_REQUESTS, GATE_KEEP_ALIVE, GATE_MAX_CONCURRENCY,
+                      GATE_MAX_RETRIES, GATE_POOL_CONNECTIONS, GATE_POOL_MAXSIZE, GATE_RETRY_BACKOFF_FACTOR)
 from ..exceptions import GoogleIAPTokenError
-from .google_iap import get_google_iap_bearer_token
+from .gate_cache import GateCache, GateDiskCache
+from .google_iap import get_cached_google_iap_bearer_token
+from .hedging import LatencyTracker, hedged_call
+from .single_flight import SingleFlight
 
 LOG = logging.getLogger(__name__)
 OAUTH_ENABLED = False
 
+GATE_RETRY_STATUSES = (502, 503, 504)
+GATE_RETRY_METHODS = frozenset(('GET', 'DELETE'))
+GATE_ACCEPT_ENCODING = 'gzip, deflate'
+GATE_CACHE_INVALIDATE_ON_WRITE = ('/applications/', )
+"""Cached URI prefixes dropped after any POST or DELETE, as Tasks may modify them."""
+
+GATE_CACHE = GateCache(GATE_CACHE_TTLS if GATE_CACHE_ENABLED else {}, max_entries=GATE_CACHE_MAX_ENTRIES)
+GATE_IN_FLIGHT = SingleFlight()
+GATE_LATENCY = LatencyTracker(percentile=GATE_HEDGE_PERCENTILE, default_delay=GATE_HEDGE_MIN_DELAY)
+GATE_DISK_CACHE = GateDiskCache(GATE_DISK_CACHE_DIR, GATE_DISK_CACHE_PATTERNS,
+                                ttl=GATE_DISK_CACHE_TTL) if GATE_DISK_CACHE_DIR else None
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_REQUEST_LIMITER = threading.BoundedSemaphore(GATE_MAX_CONCURRENCY)
+_HEDGE_EXECUTOR = None
+
+
+def _create_gate_session():
+    """Build a :class:`requests.Session` with a pooled, retrying adapter.
+
+    Only idempotent methods are retried, Task submissions via POST are sent
+    exactly once.
+
+    Returns:
+        requests.Session: Session configured from the ``[gate]`` section.
+
+    """
+    retries = Retry(
+        total=GATE_MAX_RETRIES,
+        backoff_factor=GATE_RETRY_BACKOFF_FACTOR,
+        status_forcelist=GATE_RETRY_STATUSES,
+        allowed_methods=GATE_RETRY_METHODS,
+        raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=GATE_POOL_CONNECTIONS, pool_maxsize=GATE_POOL_MAXSIZE, max_retries=retries)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.verify = GATE_CA_BUNDLE
+    session.cert = GATE_CLIENT_CERT
+    session.headers['Accept-Encoding'] = GATE_ACCEPT_ENCODING
+
+    if not GATE_KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+
+    LOG.debug('Created Gate session: pool_connections=%d, pool_maxsize=%d, keep_alive=%s, max_retries=%d',
+              GATE_POOL_CONNECTIONS, GATE_POOL_MAXSIZE, GATE_KEEP_ALIVE, GATE_MAX_RETRIES)
+    return session
+
+
+def get_gate_session():
+    """Get the process wide Gate session, creating it on first use.
+
+    Returns:
+        requests.Session: Shared session reusing connections to Gate.
+
+    """
+    global _SESSION  # pylint: disable=global-statement
+
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _create_gate_session()
+            atexit.register(log_gate_connection_stats)
+
+    return _SESSION
+
+
+def get_gate_connection_stats():
+    """Count new and reused connections made by the Gate session.
+
+    Returns:
+        dict: Counts in ``{'new': int, 'reused': int}`` format.
+
+    """
+    stats = {'new': 0, 'reused': 0}
+
+    with _SESSION_LOCK:
+        session = _SESSION
+
+    if session is None:
+        return stats
+
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            stats['new'] += pool.num_connections
+            stats['reused'] += max(pool.num_requests - pool.num_connections, 0)
+
+    return stats
 
-def gate_request(method='GET', uri=None, headers={}, data={}, params={}):
-    """Make a request to Gate's API via various auth methods
+
+def log_gate_connection_stats():
+    """Log the Gate connection and cache counts for this run."""
+    stats = get_gate_connection_stats()
+    LOG.info('Gate connections: %(new)d new, %(reused)d reused', stats)
+    GATE_CACHE.log_stats()
+    if GATE_DISK_CACHE:
+        LOG.info('Gate disk cache: %(hits)d hits, %(misses)d misses', GATE_DISK_CACHE.stats)
+    LOG.info('Gate GET requests: %(calls)d sent, %(coalesced)d coalesced', GATE_IN_FLIGHT.stats)
+    if GATE_HEDGE_REQUESTS:
+        LOG.info('Gate GET requests: %(hedged)d hedged', GATE_LATENCY.stats)
+
+
+def reset_gate_session():
+    """Close the shared Gate session so the next request creates a new one."""
+    global _SESSION  # pylint: disable=global-statement
+
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+        _SESSION = None
+
+
+def _compress_body(data, headers):
+    """Gzip a request body when compression is enabled and it is large enough.
 
     Args:
-        method (str): Method to request Gate API; GET or POST
+        data (str): Request body.
+        headers (dict): Request headers, updated with ``Content-Encoding``.
+
+    Returns:
+        bytes: Body to send, compressed or not.
+
+    """
+    if not GATE_COMPRESS_REQUESTS or not isinstance(data, (str, bytes)):
+        return data
+
+    body = data.encode('utf-8') if isinstance(data, str) else data
+    if len(body) < GATE_COMPRESS_MIN_BYTES:
+        return data
+
+    compressed = gzip.compress(body)
+    headers['Content-Encoding'] = 'gzip'
+    LOG.debug('Compressed request body from %d to %d bytes, saved %d bytes', len(body), len(compressed),
+              len(body) - len(compressed))
+    return compressed
+
+
+def _log_response_compression(response):
+    """Log bytes saved by a compressed response body."""
+    encoding = response.headers.get('Content-Encoding')
+    if encoding not in ('gzip', 'deflate'):
+        return
+
+    wire_bytes = response.raw.tell()
+    content_bytes = len(response.content)
+    LOG.debug('Received %s response of %d bytes for %d bytes of content, saved %d bytes', encoding, wire_bytes,
+              content_bytes, content_bytes - wire_bytes)
+
+
+def _send_gate_request(method, uri, headers=None, data=None, params=None):
+    """Authenticate and send a single request to Gate, bypassing all caches.
+
+    Args:
+        method (str): Upper case HTTP method; GET, POST or DELETE.
         uri (str): URI path to gate API
+        headers (dict): Extra headers, copied before authentication is added.
+
+    Returns:
+        requests.models.Response: Response from Gate.
+
     """
     response = None
+    headers = dict(headers or {})
 
     url = '{host}{uri}'.format(host=API_URL, uri=uri)
 
     if GATE_AUTHENTICATION:
         if 'google_iap' in GATE_AUTHENTICATION:
-            iap_response = get_google_iap_bearer_token(GATE_AUTHENTICATION['google_iap']['oauth_client_id'],
-                                                       GATE_AUTHENTICATION['google_iap']['sa_credentials_path'])
+            google_iap = GATE_AUTHENTICATION['google_iap']
+            iap_response = get_cached_google_iap_bearer_token(google_iap['oauth_client_id'],
+                                                              google_iap['sa_credentials_path'],
+                                                              cache_path=google_iap.get('token_cache_path'))
 
             if 'id_token' not in iap_response:
                 raise GoogleIAPTokenError
@@ -53,18 +227,163 @@ def gate_request(method='GET', uri=None, headers={}, data={}, params={}):
             headers['Authorization'] = 'Bearer {}'.format(github_token)
             LOG.info('Successfully set Github Bearer Token in Request.')
 
-    method = method.upper()
-    if method == 'GET':
-        response = requests.get(url, params=params, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
-    elif method == 'POST':
-        response = requests.post(url, data=data, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
-    elif method == 'DELETE':
-        response = requests.delete(url, headers=headers, verify=GATE_CA_BUNDLE, cert=GATE_CLIENT_CERT)
-    else:
-        raise NotImplementedError
+    session = get_gate_session()
+
+    with _REQUEST_LIMITER:
+        if method == 'GET':
+            response = session.get(url, params=params, headers=headers)
+        elif method == 'POST':
+            response = session.post(url, data=_compress_body(data, headers), headers=headers)
+        elif method == 'DELETE':
+            response = session.delete(url, headers=headers)
+        else:
+            raise NotImplementedError
 
     if response.status_code in ['401', '403', '503']:
         response.raise_for_status()
 
+    _log_response_compression(response)
+    return response
+
+
+def _get_hedge_executor():
+    """Get the thread pool running hedged requests, creating it on first use."""
+    global _HEDGE_EXECUTOR  # pylint: disable=global-statement
+
+    with _SESSION_LOCK:
+        if _HEDGE_EXECUTOR is None:
+            _HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=GATE_MAX_CONCURRENCY * 2,
+                                                 thread_name_prefix='gate-hedge')
+    return _HEDGE_EXECUTOR
+
+
+def _send_idempotent_request(uri, headers=None, params=None):
+    """Send a GET request, hedged with a duplicate when ``[gate] hedge_requests`` is enabled.
+
+    The duplicate is sent once the first request is slower than the
+    ``hedge_percentile`` latency observed for *uri*.
+
+    Returns:
+        requests.models.Response: First successful response from Gate.
+
+    """
+    if not GATE_HEDGE_REQUESTS:
+        return _send_gate_request('GET', uri, headers=headers, params=params)
+
+    return hedged_call(_get_hedge_executor(), GATE_LATENCY, uri, _send_gate_request, 'GET', uri, headers=headers,
+                       params=params)
+
+
+def _disk_cached_response(uri, content):
+    """Rebuild a :class:`requests.Response` from a disk cached body."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = '{host}{uri}'.format(host=API_URL, uri=uri)
+    response.headers['content-type'] = 'application/json'
+    response.encoding = 'utf-8'
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def _cache_response(uri, params, response):
+    """Store a successful GET response in the memory and disk caches."""
+    if not response.ok:
+        return
+
+    GATE_CACHE.set(uri, params, response)
+    if GATE_DISK_CACHE:
+        GATE_DISK_CACHE.set(uri, params, response.content)
+
+
+def gate_request(method='GET', uri=None, headers=None, data=None, params=None):
+    """Make a request to Gate's API via various auth methods
+
+    At most ``[gate] max_concurrency`` requests are in flight at once across
+    all threads and :func:`async_gate_request` callers. Successful GET
+    responses for endpoints in :data:`foremast.consts.GATE_CACHE_TTLS` are
+    served from :data:`GATE_CACHE` until they expire, topology endpoints are
+    also shared between processes through :data:`GATE_DISK_CACHE`. Concurrent
+    identical GET requests are coalesced by :data:`GATE_IN_FLIGHT` into one
+    request whose response is shared.
+
+    Args:
+        method (str): Method to request Gate API; GET or POST
+        uri (str): URI path to gate API
+        headers (dict): Extra headers, copied before authentication is added.
+    """
+    method = method.upper()
+
+    if method == 'GET':
+        response = GATE_CACHE.get(uri, params)
+        if response is not None:
+            LOG.debug('Using cached Gate response for %s', uri)
+            return response
+
+        content = GATE_DISK_CACHE.get(uri, params) if GATE_DISK_CACHE else None
+        if content is not None:
+            LOG.debug('Using disk cached Gate response for %s', uri)
+            response = _disk_cached_response(uri, content)
+            GATE_CACHE.set(uri, params, response)
+            return response
+
+    if method == 'GET':
+        key = (method, ) + GateCache.make_key(uri, params)
+        response = GATE_IN_FLIGHT.do(key, _send_idempotent_request, uri, headers=headers, params=params)
+        _cache_response(uri, params, response)
+    else:
+        response = _send_gate_request(method, uri, headers=headers, data=data, params=params)
+        for prefix in GATE_CACHE_INVALIDATE_ON_WRITE:
+            GATE_CACHE.invalidate(prefix)
+
     LOG.info(response.content)
     return response
+
+
+def refresh_gate_cache(uris):
+    """Fetch *uris* from Gate and replace any cached responses.
+
+    Args:
+        uris (list): URI paths to Gate API to GET.
+
+    Returns:
+        dict: Response from Gate for each URI.
+
+    """
+    responses = {}
+    for uri in uris:
+        response = _send_gate_request('GET', uri)
+        _cache_response(uri, None, response)
+        LOG.info('Refreshed %s: %s', uri, response.status_code)
+        responses[uri] = response
+    return responses
+
+
+async def async_gate_call(func, *args, **kwargs):
+    """Run a blocking Gate helper in the default executor.
+
+    Concurrency is still bounded by the limiter in :func:`gate_request`, so
+    callers can fan out freely with :func:`asyncio.gather`.
+
+    Args:
+        func (callable): Blocking function making Gate requests.
+
+    Returns:
+        object: Return value of *func*.
+
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
+async def async_gate_request(method='GET', uri=None, headers=None, data=None, params=None):
+    """Asynchronous version of :func:`gate_request`.
+
+    Args:
+        method (str): Method to request Gate API; GET or POST
+        uri (str): URI path to gate API
+
+    Returns:
+        requests.models.Response: Response from Gate.
+
+    """
+    return await async_gate_call(gate_request, method=method, uri=uri, headers=headers, data=data, params=params)
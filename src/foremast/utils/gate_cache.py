@@ -0,0 +1,287 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Read-through caches for idempotent Gate API lookups."""
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+LOG = logging.getLogger(__name__)
+
+
+class GateCache:
+    """Thread safe LRU cache of Gate responses with per-endpoint TTLs.
+
+    Only URIs matching one of the *ttls* patterns are cached, each entry
+    expires after the TTL of the first matching pattern.
+
+    Args:
+        ttls (dict): Regular expressions matching URI paths mapped to a TTL
+            in seconds.
+        max_entries (int): Least recently used entries are evicted past this
+            size.
+        clock (callable): Time source, returns seconds.
+    """
+
+    def __init__(self, ttls, max_entries=256, clock=time.monotonic):
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in ttls.items()]
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, uri):
+        """Find the TTL for *uri*.
+
+        Args:
+            uri (str): URI path to Gate API.
+
+        Returns:
+            float: Seconds to cache *uri* for, None or 0 when it is not
+            cacheable.
+
+        """
+        for pattern, ttl in self.rules:
+            if pattern.search(uri):
+                return ttl
+        return None
+
+    @staticmethod
+    def make_key(uri, params=None):
+        """Build a cache key from *uri* and query *params*."""
+        return uri, json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, uri, params=None):
+        """Look up a fresh cached value.
+
+        Args:
+            uri (str): URI path to Gate API.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            object: Cached value, None when missing, expired or not cacheable.
+
+        """
+        if not self.ttl_for(uri):
+            return None
+
+        key = self.make_key(uri, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                self._entries.pop(key, None)
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def set(self, uri, params, value):
+        """Store *value* for *uri* when it is cacheable.
+
+        Args:
+            uri (str): URI path to Gate API.
+            params (dict): Query parameters of the request.
+            value (object): Value to cache.
+
+        """
+        ttl = self.ttl_for(uri)
+        if not ttl:
+            return
+
+        key = self.make_key(uri, params)
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, prefix=''):
+        """Drop cached entries whose URI starts with *prefix*.
+
+        Args:
+            prefix (str): URI prefix to drop, everything by default.
+
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0].startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def log_stats(self):
+        """Log the hit and miss counters."""
+        LOG.info('Gate cache: %(hits)d hits, %(misses)d misses, %(evictions)d evictions', self.stats)
+
+
+class GateDiskCache:
+    """Cache of Gate response bodies shared between processes through a directory.
+
+    Every entry is a JSON file named after a hash of the request, written to a
+    temporary file and renamed into place so concurrent readers never see a
+    partial write.
+
+    Args:
+        directory (str): Directory holding cache files, created on first write.
+        patterns (tuple): Regular expressions matching cacheable URI paths.
+        ttl (int): Seconds before an entry is stale.
+        clock (callable): Time source, returns seconds since the epoch.
+    """
+
+    def __init__(self, directory, patterns, ttl=3600, clock=time.time):
+        self.directory = directory
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def matches(self, uri):
+        """Check *uri* is cacheable on disk."""
+        return any(pattern.search(uri) for pattern in self.patterns)
+
+    def path_for(self, uri, params=None):
+        """Get the cache file path for *uri* and *params*."""
+        key = json.dumps(GateCache.make_key(uri, params))
+        return os.path.join(self.directory, '{}.json'.format(hashlib.sha256(key.encode()).hexdigest()))
+
+    @staticmethod
+    def _read(path):
+        """Read a cache file, treating unreadable files as missing."""
+        try:
+            with open(path, 'rt') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, uri, params=None):
+        """Look up a fresh response body.
+
+        Args:
+            uri (str): URI path to Gate API.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            bytes: Cached response body, None when missing, stale or not
+            cacheable.
+
+        """
+        if not self.matches(uri):
+            return None
+
+        entry = self._read(self.path_for(uri, params))
+        if entry is None or entry['expires'] <= self.clock():
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return entry['content'].encode('utf-8')
+
+    def set(self, uri, params, content):
+        """Atomically store a response body when *uri* is cacheable.
+
+        Args:
+            uri (str): URI path to Gate API.
+            params (dict): Query parameters of the request.
+            content (bytes): Response body.
+
+        """
+        if not self.matches(uri):
+            return
+
+        now = self.clock()
+        entry = {
+            'uri': uri,
+            'params': params or {},
+            'created': now,
+            'expires': now + self.ttl,
+            'content': content.decode('utf-8'),
+        }
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        except OSError:
+            LOG.warning('Unable to write Gate disk cache in %s', self.directory)
+            return
+
+        try:
+            with os.fdopen(file_descriptor, 'wt') as temp_file:
+                json.dump(entry, temp_file)
+            os.replace(temp_path, self.path_for(uri, params))
+        except OSError:
+            LOG.warning('Unable to write Gate disk cache entry for %s', uri)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def entries(self):
+        """Describe the cached entries.
+
+        Returns:
+            list: Dictionaries with ``uri``, ``params``, ``size``, ``age`` and
+            ``expires_in`` keys, sorted by URI.
+
+        """
+        now = self.clock()
+        described = []
+
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            entry = self._read(path)
+            if entry is None:
+                continue
+
+            described.append({
+                'uri': entry['uri'],
+                'params': entry['params'],
+                'size': os.path.getsize(path),
+                'age': int(now - entry['created']),
+                'expires_in': int(entry['expires'] - now),
+            })
+
+        return sorted(described, key=lambda entry: entry['uri'])
+
+    def clear(self):
+        """Remove all cache files.
+
+        Returns:
+            int: Number of files removed.
+
+        """
+        removed = 0
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                LOG.debug('Cache file already removed: %s', path)
+        return removed
@@ -14,20 +14,30 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Set of utility functions for Foremast Google IAP Authentication with Spinnakers API"""
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
 
 import google.auth
 import google.auth.app_engine
 import google.auth.compute_engine.credentials
 import google.auth.iam
+import google.auth.jwt
 import google.oauth2.credentials
 import google.oauth2.service_account
 from google.auth.transport.requests import Request as GoogleAuthRequest
 
 GOOGLE_IAP_IAM_SCOPE = 'https://www.googleapis.com/auth/iam'  # Used in request to Google for OIDC Scope
 GOOGLE_OAUTH_TOKEN_URI = 'https://www.googleapis.com/oauth2/v4/token'  # Endpoint for getting tokens for Id Aware Proxy
+GOOGLE_IAP_TOKEN_EXPIRY_MARGIN = 300  # Seconds before a cached token's exp claim when it is refreshed
 LOG = logging.getLogger(__name__)
 
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 
 def get_google_iap_bearer_token(client_id, key_path):
     """Makes a request to an application protected by Identity-Aware Proxy.
@@ -67,3 +77,79 @@ def get_google_iap_bearer_token(client_id, key_path):
     }
 
     return google.oauth2._client._token_endpoint_request(request, GOOGLE_OAUTH_TOKEN_URI, body)
+
+
+def _token_is_fresh(cached_token):
+    """Check a cached token is not within the expiry margin of its exp claim."""
+    return cached_token['exp'] - GOOGLE_IAP_TOKEN_EXPIRY_MARGIN > time.time()
+
+
+def _read_token_file(cache_path):
+    """Read the on-disk token cache, treating a missing or corrupt file as empty."""
+    try:
+        with open(cache_path, 'rt') as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_token_file(cache_path, tokens):
+    """Atomically replace the on-disk token cache, readable only by the owner."""
+    cache_dir = os.path.dirname(os.path.abspath(cache_path))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    file_descriptor, temp_path = tempfile.mkstemp(dir=cache_dir, prefix='.iap-token-')
+    try:
+        with os.fdopen(file_descriptor, 'wt') as temp_file:
+            json.dump(tokens, temp_file)
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        LOG.warning('Unable to write Google IAP token cache to %s', cache_path)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_cached_google_iap_bearer_token(client_id, key_path, cache_path=None):
+    """Get a Google IAP token, reusing a cached one until shortly before it expires.
+
+    Tokens are cached in memory per *client_id*. When *cache_path* is given,
+    tokens are also shared through a JSON file so separate processes can reuse
+    a still valid token.
+
+    Args:
+      client_id: The OpenID Connect client ID used by Identity-Aware Proxy.
+      key_path: Path to Google Cloud Service Account Credentials in JSON Format
+      cache_path: Optional path to an on-disk token cache file.
+
+    Returns:
+      Mapping[str, str]: The JSON-decoded response data, containing ``id_token``.
+    """
+    with _TOKEN_CACHE_LOCK:
+        cached_token = _TOKEN_CACHE.get(client_id)
+        if cached_token and _token_is_fresh(cached_token):
+            LOG.debug('Using in-memory Google IAP token for %s', client_id)
+            return {'id_token': cached_token['id_token']}
+
+        if cache_path:
+            cached_token = _read_token_file(cache_path).get(client_id)
+            if cached_token and _token_is_fresh(cached_token):
+                LOG.debug('Using Google IAP token for %s from %s', client_id, cache_path)
+                _TOKEN_CACHE[client_id] = cached_token
+                return {'id_token': cached_token['id_token']}
+
+        iap_response = get_google_iap_bearer_token(client_id, key_path)
+        if 'id_token' not in iap_response:
+            return iap_response
+
+        claims = google.auth.jwt.decode(iap_response['id_token'], verify=False)
+        cached_token = {'id_token': iap_response['id_token'], 'exp': claims['exp']}
+        _TOKEN_CACHE[client_id] = cached_token
+        LOG.debug('Cached Google IAP token for %s until %s', client_id, claims['exp'])
+
+        if cache_path:
+            tokens = _read_token_file(cache_path)
+            tokens[client_id] = cached_token
+            _write_token_file(cache_path, tokens)
+
+    return iap_response
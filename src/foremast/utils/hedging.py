@@ -0,0 +1,133 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Hedge slow idempotent calls with a duplicate call."""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+LOG = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling latency samples per endpoint.
+
+    Args:
+        percentile (float): Percentile of observed latencies used as the hedge
+            delay.
+        default_delay (float): Delay in seconds until enough samples exist,
+            also the lower bound of the delay.
+        min_samples (int): Samples needed before the percentile is used.
+        window (int): Most recent samples kept per endpoint.
+    """
+
+    def __init__(self, percentile=95, default_delay=1.0, min_samples=5, window=100):
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.stats = {'hedged': 0}
+
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds):
+        """Add a latency sample for *endpoint*."""
+        with self._lock:
+            self._samples[endpoint].append(seconds)
+
+    def record_hedge(self):
+        """Count a duplicate call sent for a slow call."""
+        with self._lock:
+            self.stats['hedged'] += 1
+
+    def delay(self, endpoint):
+        """Get the hedge delay for *endpoint*.
+
+        Returns:
+            float: Seconds to wait before sending a duplicate call.
+
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+
+        if len(samples) < self.min_samples:
+            return self.default_delay
+
+        index = min(len(samples) - 1, int(math.ceil(self.percentile / 100 * len(samples))) - 1)
+        return max(samples[index], self.default_delay)
+
+
+def hedged_call(executor, tracker, endpoint, func, *args, **kwargs):
+    """Call *func*, sending a duplicate call if the first one is slow.
+
+    The first call to succeed wins. A return value with a false ``ok``
+    attribute, such as a 5xx :class:`requests.Response`, does not count as a
+    success. The slower call is left to finish in the background since
+    in-flight HTTP requests cannot be cancelled.
+
+    Args:
+        executor (concurrent.futures.Executor): Runs the calls.
+        tracker (LatencyTracker): Provides the delay and records latencies.
+        endpoint (str): Key for latency tracking.
+        func (callable): Idempotent function to call.
+
+    Returns:
+        object: Return value of the first successful call, otherwise the last
+        unsuccessful return value.
+
+    Raises:
+        Exception: Error of the last call when no call returned.
+
+    """
+
+    def timed_call():
+        start = time.monotonic()
+        result = func(*args, **kwargs)
+        tracker.record(endpoint, time.monotonic() - start)
+        return result
+
+    delay = tracker.delay(endpoint)
+    pending = {executor.submit(timed_call)}
+
+    done, pending = wait(pending, timeout=delay)
+    if not done:
+        LOG.debug('No response for %s after %.2f seconds, sending hedged request', endpoint, delay)
+        pending.add(executor.submit(timed_call))
+        tracker.record_hedge()
+
+    error = None
+    missing = object()
+    fallback = missing
+    while done or pending:
+        for future in done:
+            if future.exception() is not None:
+                error = future.exception()
+                continue
+
+            result = future.result()
+            if getattr(result, 'ok', True):
+                return result
+            fallback = result
+
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    if fallback is not missing:
+        return fallback
+    raise error
@@ -14,20 +14,101 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Lookup AMI ID from a simple name."""
+import io
 import json
 import logging
 import os
+import re
+import tarfile
+import threading
+import time
 from base64 import b64decode
+from collections import OrderedDict
 
 import gitlab
 import requests
+from requests.adapters import HTTPAdapter
 
-from ..consts import AMI_JSON_URL, GIT_URL, GITLAB_TOKEN
+from ..consts import (AMI_CACHE_TTL, AMI_JSON_URL, GIT_URL, GITLAB_CACHE_DIR, GITLAB_CACHE_MAX_BYTES,
+                      GITLAB_MAX_PROJECTS, GITLAB_POOL_MAXSIZE, GITLAB_TOKEN)
 from ..exceptions import GitLabApiError
+from .file_cache import FileCache
+from .single_flight import SingleFlight
 from .warn_user import warn_user
 
 LOG = logging.getLogger(__name__)
 
+FILE_CACHE = FileCache(GITLAB_CACHE_DIR, max_bytes=GITLAB_CACHE_MAX_BYTES)
+COMMIT_SHA_REGEX = re.compile(r'^[0-9a-f]{40}$')
+
+_GITLAB_CLIENT = None
+_GITLAB_PROJECTS = OrderedDict()
+_GITLAB_LOCK = threading.Lock()
+
+_AMI_MEMO = {}
+_AMI_MEMO_LOCK = threading.Lock()
+_AMI_IN_FLIGHT = SingleFlight()
+
+
+def get_gitlab_client():
+    """Get the process wide GitLab client, creating it on first use.
+
+    Returns:
+        gitlab.Gitlab: Client reusing pooled connections to GitLab.
+
+    """
+    global _GITLAB_CLIENT  # pylint: disable=global-statement
+
+    with _GITLAB_LOCK:
+        if _GITLAB_CLIENT is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=GITLAB_POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _GITLAB_CLIENT = gitlab.Gitlab(GIT_URL, private_token=GITLAB_TOKEN, api_version=4, session=session)
+
+    return _GITLAB_CLIENT
+
+
+def get_gitlab_project(git_short):
+    """Get a GitLab Project, reusing recently retrieved Projects.
+
+    Args:
+        git_short (str): Short Git representation of repository, e.g.
+            forrest/core.
+
+    Returns:
+        gitlab.v4.objects.Project: Project handle, falsy when not found.
+
+    """
+    with _GITLAB_LOCK:
+        project = _GITLAB_PROJECTS.get(git_short)
+        if project is not None:
+            _GITLAB_PROJECTS.move_to_end(git_short)
+            return project
+
+    project = get_gitlab_client().projects.get(git_short)
+    if not project:
+        return project
+
+    with _GITLAB_LOCK:
+        _GITLAB_PROJECTS[git_short] = project
+        while len(_GITLAB_PROJECTS) > GITLAB_MAX_PROJECTS:
+            _GITLAB_PROJECTS.popitem(last=False)
+
+    return project
+
+
+def reset_gitlab_client():
+    """Drop the shared GitLab client and cached Projects."""
+    global _GITLAB_CLIENT  # pylint: disable=global-statement
+
+    with _GITLAB_LOCK:
+        if _GITLAB_CLIENT is not None:
+            _GITLAB_CLIENT.session.close()
+        _GITLAB_CLIENT = None
+        _GITLAB_PROJECTS.clear()
+
 
 def ami_lookup(region='us-east-1', name='tomcat8'):
     """Look up AMI ID.
@@ -59,6 +140,50 @@ def ami_lookup(region='us-east-1', name='tomcat8'):
     return ami_id
 
 
+def ami_lookup_many(regions, names):
+    """Look up AMI IDs for every combination of _regions_ and _names_.
+
+    The AMI table is retrieved once and shared by all lookups.
+
+    Args:
+        regions (list): AWS Regions to find AMI IDs in.
+        names (list): Simple AMI base names to lookup.
+
+    Returns:
+        dict: AMI IDs keyed by region, then name.
+
+    """
+    return {region: {name: ami_lookup(region=region, name=name) for name in names} for region in regions}
+
+
+def _memoized_ami(key, fetch):
+    """Return the in memory AMI table for _key_, calling _fetch_ when stale.
+
+    Only one fetch per _key_ runs at a time, lookups of other keys do not wait
+    for it. _fetch_ receives the expired value, or None, so it can revalidate.
+    """
+    with _AMI_MEMO_LOCK:
+        expires, value = _AMI_MEMO.get(key, (0, None))
+    if expires > time.monotonic():
+        return value
+
+    return _AMI_IN_FLIGHT.do(key, _refresh_ami, key, fetch)
+
+
+def _refresh_ami(key, fetch):
+    """Call _fetch_ for _key_ and keep the value for :data:`AMI_CACHE_TTL`."""
+    with _AMI_MEMO_LOCK:
+        expires, stale = _AMI_MEMO.get(key, (0, None))
+    if expires > time.monotonic():
+        return stale
+
+    value = fetch(stale)
+    if AMI_CACHE_TTL:
+        with _AMI_MEMO_LOCK:
+            _AMI_MEMO[key] = (time.monotonic() + AMI_CACHE_TTL, value)
+    return value
+
+
 def _get_ami_file(region='us-east-1'):
     """Get file from Gitlab.
 
@@ -69,30 +194,76 @@ def _get_ami_file(region='us-east-1'):
         str: Contents in json format.
 
     """
-    LOG.info("Getting AMI from Gitlab")
-    lookup = FileLookup(git_short='devops/ansible')
     filename = 'scripts/{0}.json'.format(region)
-    ami_contents = lookup.remote_file(filename=filename, branch='master')
-    LOG.debug('AMI file contents in %s: %s', filename, ami_contents)
-    return ami_contents
+    cache_key = ('devops/ansible', 'master', filename)
+
+    def fetch(_stale):
+        cached = FILE_CACHE.get(cache_key) if AMI_CACHE_TTL else None
+        if cached:
+            LOG.info("Using cached AMI file %s", filename)
+            return cached['value']
+
+        LOG.info("Getting AMI from Gitlab")
+        lookup = FileLookup(git_short='devops/ansible')
+        ami_contents = lookup.remote_file(filename=filename, branch='master')
+        LOG.debug('AMI file contents in %s: %s', filename, ami_contents)
+        if AMI_CACHE_TTL:
+            FILE_CACHE.set(cache_key, ami_contents, ttl=AMI_CACHE_TTL)
+        return ami_contents
+
+    return _memoized_ami(cache_key, fetch)
 
 
 def _get_ami_dict(json_url):
     """Get ami from a web url.
 
+    An expired copy, kept in memory or in the file cache, is revalidated with
+    its ``ETag`` and ``Last-Modified`` headers, so an unchanged table is not
+    downloaded again.
+
     Args:
-        region (str): AWS Region to find AMI ID.
+        json_url (str): URL of the AMI table.
 
     Returns:
         dict: Contents in dictionary format.
 
     """
-    LOG.info("Getting AMI from %s", json_url)
-    response = requests.get(json_url)
-    assert response.ok, "Error getting ami info from {}".format(json_url)
-    ami_dict = response.json()
-    LOG.debug('AMI json contents: %s', ami_dict)
-    return ami_dict
+    cache_key = ('ami_json', json_url)
+
+    def fetch(stale):
+        cached = FILE_CACHE.get(cache_key, allow_expired=True) if AMI_CACHE_TTL else None
+        if cached and cached['fresh']:
+            LOG.info("Using cached AMI json from %s", json_url)
+            return cached['value']
+
+        previous = stale or (cached and cached['value'])
+        headers = {}
+        if previous and previous['etag']:
+            headers['If-None-Match'] = previous['etag']
+        if previous and previous['last_modified']:
+            headers['If-Modified-Since'] = previous['last_modified']
+
+        LOG.info("Getting AMI from %s", json_url)
+        response = requests.get(json_url, headers=headers)
+
+        if previous and response.status_code == 304:
+            LOG.info("AMI json unchanged at %s", json_url)
+            ami_dict = previous['body']
+        else:
+            assert response.ok, "Error getting ami info from {}".format(json_url)
+            ami_dict = response.json()
+        LOG.debug('AMI json contents: %s', ami_dict)
+
+        ami_table = {
+            'body': ami_dict,
+            'etag': response.headers.get('ETag') or (previous and previous['etag']),
+            'last_modified': response.headers.get('Last-Modified') or (previous and previous['last_modified']),
+        }
+        if AMI_CACHE_TTL:
+            FILE_CACHE.set(cache_key, ami_table, ttl=AMI_CACHE_TTL)
+        return ami_table
+
+    return _memoized_ami(cache_key, fetch)['body']
 
 
 class FileLookup():
@@ -101,19 +272,29 @@ class FileLookup():
     When _runway_dir_ is specified, the local directory is given priority and
     remote Git Server will not be used.
 
+    When _snapshot_path_ is specified, remote files below it are served from
+    a single repository archive downloaded at the pinned commit, see
+    :meth:`pin`.
+
     Args:
         git_short (str): Short Git representation of repository, e.g.
             forrest/core.
         runway_dir (str): Root of local runway directory to use instead of
             accessing Git.
+        snapshot_path (str): Repository directory to download in one request
+            instead of one request per file.
     """
 
-    def __init__(self, git_short='', runway_dir=''):
+    def __init__(self, git_short='', runway_dir='', snapshot_path=''):
         self.git_short = git_short
         self.runway_dir = os.path.expandvars(os.path.expanduser(runway_dir))
+        self.snapshot_path = snapshot_path.strip('/')
 
         self.server = None
         self.project = None
+        self.commit = None
+        self._snapshot_files = None
+        self._snapshot_lock = threading.Lock()
 
         if not self.runway_dir:
             self.get_gitlab_project()
@@ -129,8 +310,8 @@ class FileLookup():
                 code.
 
         """
-        self.server = gitlab.Gitlab(GIT_URL, private_token=GITLAB_TOKEN, api_version=4)
-        project = self.server.projects.get(self.git_short)
+        self.server = get_gitlab_client()
+        project = get_gitlab_project(self.git_short)
 
         if not project:
             raise GitLabApiError('Could not get Project "{0}" from GitLab API.'.format(self.git_short))
@@ -138,6 +319,57 @@ class FileLookup():
         self.project = project
         return self.project
 
+    def pin(self, commit):
+        """Read remote files at _commit_ unless another branch is requested.
+
+        Args:
+            commit (str): Git commit SHA, e.g. the config commit resolved by
+                :func:`foremast.configs.process_git_configs`.
+
+        """
+        if commit != self.commit:
+            self._snapshot_files = None
+        self.commit = commit
+
+    def _in_snapshot(self, filename):
+        """Check _filename_ is covered by the snapshot."""
+        return bool(self.snapshot_path) and filename.startswith(self.snapshot_path + '/')
+
+    def _load_snapshot(self, ref):
+        """Download and unpack the repository archive for _ref_ once.
+
+        Returns:
+            dict: File contents keyed by path relative to the repository root,
+            None when the archive is not available.
+
+        """
+        with self._snapshot_lock:
+            if self._snapshot_files is None and self.snapshot_path:
+                self._snapshot_files = self._download_snapshot(ref)
+            return self._snapshot_files
+
+    def _download_snapshot(self, ref):
+        """Download the repository archive of _snapshot_path_ at _ref_."""
+        LOG.info('Retrieving "%s" snapshot of "%s" at "%s".', self.snapshot_path, self.git_short, ref)
+        try:
+            archive = self.project.repository_archive(sha=ref, path=self.snapshot_path, format='tar.gz')
+        except gitlab.exceptions.GitlabError as error:
+            LOG.warning('Unable to download snapshot of "%s", retrieving files one by one: %s', self.git_short, error)
+            self.snapshot_path = ''
+            return None
+
+        files = {}
+        with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as snapshot:
+            for member in snapshot.getmembers():
+                if not member.isfile():
+                    continue
+                # Archive members are prefixed with a "<project>-<sha>" directory
+                _, _, path = member.name.partition('/')
+                files[path] = snapshot.extractfile(member).read().decode()
+
+        LOG.debug('Snapshot files: %s', sorted(files))
+        return files
+
     def local_file(self, filename):
         """Read the local file in _self.runway_dir_.
 
@@ -168,11 +400,12 @@ class FileLookup():
         LOG.debug('Local file contents:\n%s', file_contents)
         return file_contents
 
-    def remote_file(self, branch='master', filename=''):
+    def remote_file(self, branch=None, filename=''):
         """Read the remote file on Git Server.
 
         Args:
-            branch (str): Git Branch to find file.
+            branch (str): Git Branch to find file, defaults to the pinned
+                commit or master.
             filename (str): Name of file to retrieve relative to root of
                 repository.
 
@@ -181,34 +414,71 @@ class FileLookup():
 
         Raises:
             FileNotFoundError: Requested file missing.
+            gitlab.exceptions.GitlabGetError: GitLab failed for any reason
+                other than a missing file.
 
         """
+        branch = branch or self.commit or 'master'
         LOG.info('Retrieving "%s" from "%s".', filename, self.git_short)
 
-        file_contents = ''
+        # Files at a commit SHA never change, files GitLab reports missing
+        # are cached too while other GitLab errors are raised uncached
+        cache_key = (self.git_short, branch, filename)
+        cacheable = bool(COMMIT_SHA_REGEX.match(branch))
+        cached = FILE_CACHE.get(cache_key) if cacheable else None
+
+        if cached:
+            LOG.debug('Using cached "%s" at "%s".', filename, branch)
+            file_contents = cached['value']
+        else:
+            file_contents = self._fetch_remote_file(branch, filename)
+            if cacheable:
+                FILE_CACHE.set(cache_key, file_contents)
+
+        if file_contents is None:
+            msg = 'Project "{0}" is missing file "{1}" in "{2}" branch.'.format(self.git_short, filename, branch)
+            LOG.warning(msg)
+            raise FileNotFoundError(msg)
+
+        LOG.debug('Remote file contents:\n%s', file_contents)
+        return file_contents
+
+    def _fetch_remote_file(self, branch, filename):
+        """Read _filename_ at _branch_ from the snapshot or the GitLab API.
+
+        Returns:
+            str: Contents of remote file, None when missing.
+
+        Raises:
+            gitlab.exceptions.GitlabGetError: GitLab failed for any reason
+                other than a missing file.
+
+        """
+        if branch == (self.commit or 'master') and self._in_snapshot(filename):
+            snapshot_files = self._load_snapshot(branch)
+            if snapshot_files is not None:
+                return snapshot_files.get(filename)
 
         try:
             file_blob = self.project.files.get(file_path=filename, ref=branch)
-        except gitlab.exceptions.GitlabGetError:
+        except gitlab.exceptions.GitlabGetError as error:
+            if error.response_code != 404:
+                raise
             file_blob = None
 
         LOG.debug('GitLab file response:\n%s', file_blob)
 
         if not file_blob:
-            msg = 'Project "{0}" is missing file "{1}" in "{2}" branch.'.format(self.git_short, filename, branch)
-            LOG.warning(msg)
-            raise FileNotFoundError(msg)
-
-        file_contents = b64decode(file_blob.content).decode()
+            return None
 
-        LOG.debug('Remote file contents:\n%s', file_contents)
-        return file_contents
+        return b64decode(file_blob.content).decode()
 
-    def get(self, branch='master', filename=''):
+    def get(self, branch=None, filename=''):
         """Retrieve _filename_ from GitLab.
 
         Args:
-            branch (str): Git Branch to find file.
+            branch (str): Git Branch to find file, defaults to the pinned
+                commit or master.
             filename (str): Name of file to retrieve relative to root of Git
                 repository, or _runway_dir_ if specified.
 
@@ -225,11 +495,12 @@ class FileLookup():
 
         return file_contents
 
-    def json(self, branch='master', filename=''):
+    def json(self, branch=None, filename=''):
         """Retrieve _filename_ from GitLab.
 
         Args:
-            branch (str): Git Branch to find file.
+            branch (str): Git Branch to find file, defaults to the pinned
+                commit or master.
             filename (str): Name of file to retrieve.
 
         Returns:
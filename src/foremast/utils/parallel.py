@@ -0,0 +1,132 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Run independent work concurrently with deterministic logging."""
+import logging
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+LOG = logging.getLogger(__name__)
+
+
+class OrderedLogBuffer(logging.Filter):
+    """Hold log records from worker threads until they are replayed in order.
+
+    While active, the filter is attached to every configured handler. Records
+    logged by a thread inside :meth:`capture` are kept aside instead of being
+    emitted, so :meth:`replay` can emit them grouped per task.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+        self._handlers = []
+
+    @staticmethod
+    def _configured_handlers():
+        """List handlers of the root and all named loggers."""
+        loggers = [logging.getLogger()]
+        loggers.extend(logger for logger in logging.Logger.manager.loggerDict.values()
+                       if isinstance(logger, logging.Logger))
+        handlers = []
+        for logger in loggers:
+            handlers.extend(handler for handler in logger.handlers if handler not in handlers)
+        return handlers
+
+    def __enter__(self):
+        self._handlers = self._configured_handlers()
+        for handler in self._handlers:
+            handler.addFilter(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        for handler in self._handlers:
+            handler.removeFilter(self)
+        self._handlers = []
+
+    def filter(self, record):
+        records = getattr(self._local, 'records', None)
+        if records is None:
+            return True
+
+        # Every handler sees the same record in turn, keep it only once.
+        if not records or records[-1] is not record:
+            records.append(record)
+        return False
+
+    def capture(self, records, func, *args):
+        """Call *func* with *args*, collecting its log records in *records*."""
+        self._local.records = records
+        try:
+            return func(*args)
+        finally:
+            self._local.records = None
+
+    @staticmethod
+    def replay(records):
+        """Emit *records* from the current thread."""
+        for record in records:
+            logging.getLogger(record.name).handle(record)
+
+
+def run_in_order(func, items, max_workers=1):
+    """Call *func* for every item in a bounded thread pool.
+
+    Log records of each call are emitted together, in the order of *items*,
+    once the calls finish. The first failure cancels calls that have not
+    started yet.
+
+    Args:
+        func (callable): Called with each item.
+        items (list): Arguments for *func*.
+        max_workers (int): Largest number of concurrent calls, 1 or less runs
+            the calls one after another in the current thread.
+
+    Returns:
+        list: Results of *func* in the order of *items*.
+
+    Raises:
+        Exception: First failure in the order of *items*, other failures are
+            logged.
+
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    records = [[] for _ in items]
+
+    with OrderedLogBuffer() as log_buffer, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(log_buffer.capture, item_records, func, item)
+                   for item, item_records in zip(items, records)]
+        _, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        wait(futures)
+
+    failures = []
+    for item, item_records, future in zip(items, records, futures):
+        OrderedLogBuffer.replay(item_records)
+        if future.cancelled():
+            LOG.debug('Skipped %s after an earlier failure', item)
+        elif future.exception() is not None:
+            failures.append((item, future.exception()))
+
+    if failures:
+        for item, error in failures:
+            LOG.error('Failed %s: %s', item, error)
+        raise failures[0][1]
+
+    return [future.result() for future in futures]
@@ -17,7 +17,7 @@
 import logging
 import uuid
 
-from ..utils.gate import gate_request
+from ..utils.gate import async_gate_call, gate_request
 
 LOG = logging.getLogger(__name__)
 
@@ -85,6 +85,19 @@ def get_all_pipelines(app=''):
     return pipelines
 
 
+async def async_get_all_pipelines(app=''):
+    """Asynchronous version of :func:`get_all_pipelines`.
+
+    Args:
+        app (str): Name of Spinnaker Application.
+
+    Returns:
+        requests.models.Response: Response from Gate containing Pipelines.
+
+    """
+    return await async_gate_call(get_all_pipelines, app=app)
+
+
 def get_pipeline_id(app='', name=''):
     """Get the ID for Pipeline _name_.
 
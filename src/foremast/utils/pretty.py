@@ -0,0 +1,37 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Pretty printing for debug logging."""
+import pprint
+
+
+class LazyPformat:
+    """Defer :func:`pprint.pformat` until a log record is actually emitted.
+
+    Pretty printing large pipelines and configurations is expensive, so
+    passing this as a logging argument skips the work when the level is
+    disabled.
+
+    Args:
+        obj: Object to pretty print.
+    """
+
+    __slots__ = ('obj', )
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return pprint.pformat(self.obj)
@@ -14,15 +14,103 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Get Application properties that have been generated by `create-configs`."""
+import copy
 import json
 import logging
+import os
+import threading
 
 LOG = logging.getLogger(__name__)
 
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+class PropertiesStore:
+    """Parsed `create-configs` output handed out as independent views.
+
+    Every view is a deep copy so components changing their settings never
+    affect each other or the stored properties.
+
+    Args:
+        properties (dict): Application properties keyed by environment.
+    """
+
+    def __init__(self, properties):
+        self._properties = properties
+
+    @classmethod
+    def from_file(cls, properties_file):
+        """Load a store from a `create-configs` JSON file.
+
+        Args:
+            properties_file (str): File name of `create-configs` JSON output.
+
+        Returns:
+            PropertiesStore: Store for the file contents.
+
+        """
+        with open(properties_file, 'rt') as file_handle:
+            return cls(json.load(file_handle))
+
+    def view(self, env=None, region=None):
+        """Get a copy of the properties for *env* and *region*.
+
+        Args:
+            env (str): Environment to read optionally.
+            region (str): Region to get specific configs for.
+
+        Returns:
+            dict: Application properties for _env_, or all properties when
+            _env_ was not found.
+
+        """
+        env_properties = self._properties.get(env, self._properties)
+        return copy.deepcopy(env_properties.get(region, env_properties))
+
+
+def _store_key(properties_file):
+    """Normalize *properties_file* so relative and absolute paths match."""
+    return os.path.abspath(properties_file)
+
+
+def register_properties(properties_file, properties):
+    """Serve _properties_file_ from memory instead of reading it again.
+
+    A JSON round trip snapshots _properties_ so lookups match the written file
+    even when the caller changes its copy afterwards.
+
+    Args:
+        properties_file (str): File name the properties were written to.
+        properties (dict): Application properties keyed by environment.
+
+    Returns:
+        PropertiesStore: Registered store.
+
+    """
+    store = PropertiesStore(json.loads(json.dumps(properties)))
+    with _STORES_LOCK:
+        _STORES[_store_key(properties_file)] = store
+    return store
+
+
+def unregister_properties(properties_file):
+    """Read _properties_file_ from disk again on the next lookup.
+
+    Args:
+        properties_file (str): File name the properties were registered for.
+
+    """
+    with _STORES_LOCK:
+        _STORES.pop(_store_key(properties_file), None)
+
 
 def get_properties(properties_file='raw.properties.json', env=None, region=None):
     """Get contents of _properties_file_ for the _env_.
 
+    Properties registered with :func:`register_properties` are served from
+    memory, anything else is loaded from _properties_file_.
+
     Args:
         properties_file (str): File name of `create-configs` JSON output.
         env (str): Environment to read optionally.
@@ -33,10 +121,12 @@ def get_properties(properties_file='raw.properties.json', env=None, region=None)
         None: Given _env_ was not found in `create-configs` JSON output.
 
     """
-    with open(properties_file, 'rt') as file_handle:
-        properties = json.load(file_handle)
+    with _STORES_LOCK:
+        store = _STORES.get(_store_key(properties_file))
+
+    if store is None:
+        store = PropertiesStore.from_file(properties_file)
 
-    env_properties = properties.get(env, properties)
-    contents = env_properties.get(region, env_properties)
+    contents = store.view(env=env, region=region)
     LOG.debug('Found properties for %s:\n%s', env, contents)
     return contents
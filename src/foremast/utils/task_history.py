@@ -0,0 +1,101 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Remember how long Spinnaker Tasks take to complete."""
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+
+LOG = logging.getLogger(__name__)
+
+
+class TaskDurationHistory:
+    """Rolling completion times per Task type, optionally persisted to a JSON file.
+
+    Args:
+        path (str): JSON file to load and save durations, memory only when
+            empty.
+        window (int): Most recent durations kept per Task type.
+    """
+
+    def __init__(self, path='', window=20):
+        self.path = path
+        self.window = window
+
+        self._durations = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Read durations from :attr:`path` on first use."""
+        if self._durations is not None:
+            return
+
+        self._durations = {}
+        if not self.path:
+            return
+
+        try:
+            with open(self.path, 'rt') as history_file:
+                self._durations = json.load(history_file)
+        except (OSError, ValueError):
+            LOG.debug('No Task duration history in %s', self.path)
+
+    def _save(self):
+        """Atomically write durations to :attr:`path`."""
+        if not self.path:
+            return
+
+        history_dir = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(history_dir, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=history_dir, prefix='.task-history-')
+            with os.fdopen(file_descriptor, 'wt') as temp_file:
+                json.dump(self._durations, temp_file)
+            os.replace(temp_path, self.path)
+        except OSError:
+            LOG.warning('Unable to save Task duration history to %s', self.path)
+
+    def median(self, task_type):
+        """Get the median completion time for *task_type*.
+
+        Returns:
+            float: Median seconds, None when no durations are known.
+
+        """
+        if not task_type:
+            return None
+
+        with self._lock:
+            self._load()
+            durations = self._durations.get(task_type)
+
+        if not durations:
+            return None
+        return statistics.median(durations)
+
+    def record(self, task_type, seconds):
+        """Add a completion time for *task_type*."""
+        if not task_type:
+            return
+
+        with self._lock:
+            self._load()
+            durations = self._durations.setdefault(task_type, [])
+            durations.append(round(seconds, 3))
+            del durations[:-self.window]
+            self._save()
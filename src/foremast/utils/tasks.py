@@ -13,19 +13,28 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """POST a new task or check status of running task."""
+import asyncio
 import copy
 import json
 import logging
-from functools import partial
+import time
 
-from tryagain import call as retry_call
-
-from ..consts import DEFAULT_TASK_TIMEOUT, HEADERS, TASK_TIMEOUTS
-from ..exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
+from ..consts import (DEFAULT_TASK_TIMEOUT, FINGERPRINT_MAX_AGE, FINGERPRINT_STORE, GOOD_STATUSES, HEADERS,
+                      SKIP_STATUSES, TASK_HISTORY_PATH, TASK_TIMEOUTS)
+from ..exceptions import SpinnakerTaskBatchError, SpinnakerTaskError, SpinnakerTaskInconclusiveError
 from ..utils import gate_request
+from .backoff import jittered_backoff_delays
+from .fingerprints import FingerprintStore
+from .gate import async_gate_call
+from .task_history import TaskDurationHistory
 
 LOG = logging.getLogger(__name__)
 
+TASK_HISTORY = TaskDurationHistory(TASK_HISTORY_PATH)
+TASK_FINGERPRINTS = FingerprintStore(FINGERPRINT_STORE, max_age=FINGERPRINT_MAX_AGE)
+TASK_BATCH_MAX_JOBS = 20
+TASK_BATCH_MAX_BYTES = 256 * 1024
+
 
 def post_task(task_data, task_uri='/tasks'):
     """Create Spinnaker Task.
@@ -98,13 +107,39 @@ def _check_task(taskid):
         raise ValueError
 
 
-def check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=2):
+def _task_poll_delays(timeout, wait=None, task_type=None):
+    """Generate pauses between polls of a Task.
+
+    Args:
+        timeout (int): Consider Task failed after given seconds.
+        wait (int, optional): Fixed seconds between polls, otherwise polls
+            back off with jitter starting from the median duration of
+            *task_type*.
+        task_type (str, optional): Spinnaker Task type, e.g. upsertSecurityGroup.
+
+    Returns:
+        iterator: Seconds to pause before each following poll.
+
+    """
+    if wait:
+        max_attempts = int(timeout / wait)
+        return iter([wait] * (max_attempts - 1))
+
+    expected = TASK_HISTORY.median(task_type)
+    LOG.debug('Polling %s Task, expected duration: %s', task_type, expected)
+    return jittered_backoff_delays(timeout, expected=expected)
+
+
+def check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=None, task_type=None):
     """Wrap check_task.
 
     Args:
         taskid (str): Existing Spinnaker Task ID.
         timeout (int, optional): Consider Task failed after given seconds.
-        wait (int, optional): Seconds to pause between polling attempts.
+        wait (int, optional): Seconds to pause between polling attempts,
+            adaptive backoff is used when not given.
+        task_type (str, optional): Spinnaker Task type, used to seed and record
+            the adaptive polling schedule.
 
     Returns:
         str: Task status.
@@ -115,41 +150,383 @@ def check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=2):
             reach a terminal state before the given time out.
 
     """
-    max_attempts = int(timeout / wait)
-    try:
-        return retry_call(
-            partial(_check_task, taskid),
-            max_attempts=max_attempts,
-            wait=wait,
-            exceptions=(AssertionError, ValueError), )
-    except ValueError:
-        raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(timeout, taskid))
+    start = time.monotonic()
+    delays = _task_poll_delays(timeout, wait=wait, task_type=task_type)
+
+    while True:
+        try:
+            status = _check_task(taskid)
+        except (AssertionError, ValueError) as error:
+            delay = next(delays, None)
+            if delay is None:
+                if isinstance(error, AssertionError):
+                    raise
+                raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(
+                    timeout, taskid))
+            time.sleep(delay)
+            continue
+
+        TASK_HISTORY.record(task_type, time.monotonic() - start)
+        return status
 
 
-def wait_for_task(task_data, task_uri='/tasks'):
-    """Run task and check the result.
+async def async_post_task(task_data, task_uri='/tasks'):
+    """Asynchronous version of :func:`post_task`.
 
     Args:
-        task_data (str): the task json to execute
+        task_data (str): Task JSON definition.
+
+    Returns:
+        str: Spinnaker Task ID.
+
+    """
+    return await async_gate_call(post_task, task_data, task_uri=task_uri)
+
+
+async def async_check_task(taskid, timeout=DEFAULT_TASK_TIMEOUT, wait=None, task_type=None):
+    """Asynchronous version of :func:`check_task`.
+
+    Polls without blocking the event loop, so many Tasks can be awaited
+    together.
+
+    Args:
+        taskid (str): Existing Spinnaker Task ID.
+        timeout (int, optional): Consider Task failed after given seconds.
+        wait (int, optional): Seconds to pause between polling attempts,
+            adaptive backoff is used when not given.
+        task_type (str, optional): Spinnaker Task type, used to seed and record
+            the adaptive polling schedule.
 
     Returns:
         str: Task status.
 
+    Raises:
+        AssertionError: API did not respond with a 200 status code.
+        :obj:`foremast.exceptions.SpinnakerTaskInconclusiveError`: Task did not
+            reach a terminal state before the given time out.
+
     """
-    taskid = post_task(task_data, task_uri)
+    start = time.monotonic()
+    delays = _task_poll_delays(timeout, wait=wait, task_type=task_type)
+
+    while True:
+        try:
+            status = await async_gate_call(_check_task, taskid)
+        except (AssertionError, ValueError) as error:
+            delay = next(delays, None)
+            if delay is None:
+                if isinstance(error, AssertionError):
+                    raise
+                raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(
+                    timeout, taskid))
+            await asyncio.sleep(delay)
+            continue
+
+        TASK_HISTORY.record(task_type, time.monotonic() - start)
+        return status
+
+
+class TaskHandle:
+    """Reference to a submitted Spinnaker Task.
+
+    Args:
+        taskid (str): Spinnaker Task ID.
+        task_type (str): Type of the first job, e.g. upsertSecurityGroup.
+        timeout (int): Consider Task failed after given seconds.
+    """
+
+    def __init__(self, taskid, task_type=None, timeout=DEFAULT_TASK_TIMEOUT):
+        self.taskid = taskid
+        self.task_type = task_type
+        self.timeout = timeout
+        self.submitted = time.monotonic()
+        self.status = None
+
+    def __repr__(self):
+        return 'TaskHandle({0!r}, {1!r}, {2!r})'.format(self.taskid, self.task_type, self.status)
+
+
+def get_job_timeout(job):
+    """Find the configured timeout for a single Task job.
+
+    Args:
+        job (dict): Job from a Task definition.
+
+    Returns:
+        tuple: Job type and timeout in seconds.
+
+    """
+    env = job.get('credentials')
+    task_type = job.get('type')
+
+    return task_type, TASK_TIMEOUTS.get(env, dict()).get(task_type, DEFAULT_TASK_TIMEOUT)
 
+
+def get_task_timeout(task_data):
+    """Find the configured timeout for a Task from its first job.
+
+    Args:
+        task_data (str): Task JSON definition.
+
+    Returns:
+        tuple: Task type and timeout in seconds.
+
+    """
     if isinstance(task_data, str):
         json_data = json.loads(task_data)
     else:
         json_data = task_data
 
     # inspect the task to see if a timeout is configured
-    job = json_data['job'][0]
-    env = job.get('credentials')
-    task_type = job.get('type')
-
-    timeout = TASK_TIMEOUTS.get(env, dict()).get(task_type, DEFAULT_TASK_TIMEOUT)
+    task_type, timeout = get_job_timeout(json_data['job'][0])
 
     LOG.debug("Task %s will timeout after %s", task_type, timeout)
 
-    return check_task(taskid, timeout)
+    return task_type, timeout
+
+
+def submit_task(task_data, task_uri='/tasks'):
+    """Submit a Task without waiting for it.
+
+    Args:
+        task_data (str): Task JSON definition.
+
+    Returns:
+        TaskHandle: Handle to pass to :func:`wait_for_tasks`.
+
+    """
+    task_type, timeout = get_task_timeout(task_data)
+    taskid = post_task(task_data, task_uri)
+    return TaskHandle(taskid, task_type=task_type, timeout=timeout)
+
+
+def wait_for_tasks(handles):
+    """Poll many submitted Tasks in one loop until all of them finish.
+
+    All pending Tasks are checked each round, then the loop pauses on a
+    shared backoff schedule. Each Task fails on its own timeout.
+
+    Args:
+        handles (list): :class:`TaskHandle` objects from :func:`submit_task`.
+
+    Returns:
+        list: Task status for each handle, in the same order.
+
+    Raises:
+        AssertionError: API did not respond with a 200 status code.
+        :obj:`foremast.exceptions.SpinnakerTaskError`: A Task failed.
+        :obj:`foremast.exceptions.SpinnakerTaskInconclusiveError`: A Task did
+            not reach a terminal state before its time out.
+
+    """
+    pending = list(handles)
+    if not pending:
+        return []
+
+    expected = [TASK_HISTORY.median(handle.task_type) for handle in pending]
+    expected = min((duration for duration in expected if duration), default=None)
+    delays = jittered_backoff_delays(max(handle.timeout for handle in pending), expected=expected)
+
+    while pending:
+        for handle in list(pending):
+            try:
+                handle.status = _check_task(handle.taskid)
+            except SpinnakerTaskError:
+                handle.status = 'TERMINAL'
+                raise
+            except (AssertionError, ValueError) as error:
+                if time.monotonic() - handle.submitted < handle.timeout:
+                    continue
+                if isinstance(error, AssertionError):
+                    raise
+                raise SpinnakerTaskInconclusiveError('Task failed to complete in {0} seconds: {1}'.format(
+                    handle.timeout, handle.taskid))
+
+            TASK_HISTORY.record(handle.task_type, time.monotonic() - handle.submitted)
+            pending.remove(handle)
+
+        if pending:
+            LOG.debug('Waiting on %d Tasks: %s', len(pending), pending)
+            time.sleep(next(delays, 1))
+
+    return [handle.status for handle in handles]
+
+
+def wait_for_task(task_data, task_uri='/tasks', fingerprint=None):
+    """Run task and check the result.
+
+    Args:
+        task_data (str): the task json to execute
+        fingerprint (tuple): Application, environment, region and resource
+            name. When given, the Task is skipped if *task_data* matches the
+            last successful run recorded in :data:`TASK_FINGERPRINTS`.
+
+    Returns:
+        str: Task status, ``SKIPPED`` when nothing changed.
+
+    """
+    if fingerprint and TASK_FINGERPRINTS.unchanged(fingerprint, task_data):
+        LOG.info('No changes to %s since the last successful Task, skipping', '/'.join(fingerprint))
+        return 'SKIPPED'
+
+    task_type, timeout = get_task_timeout(task_data)
+    taskid = post_task(task_data, task_uri)
+    status = check_task(taskid, timeout, task_type=task_type)
+
+    if fingerprint:
+        TASK_FINGERPRINTS.record(fingerprint, task_data)
+
+    return status
+
+
+class TaskBatch:
+    """Collect jobs for one application and submit them as few Tasks as possible.
+
+    Spinnaker runs the jobs of a Task one after another, so a batch replaces
+    many Task round trips with one. Batches are split into several Tasks when
+    they exceed *max_jobs* jobs or *max_bytes* of JSON.
+
+    Args:
+        application (str): Spinnaker Application every job belongs to.
+        description (str): Task description shown in Spinnaker.
+        max_jobs (int): Most jobs in a single Task.
+        max_bytes (int): Largest Task JSON in bytes.
+    """
+
+    def __init__(self, application, description, max_jobs=TASK_BATCH_MAX_JOBS, max_bytes=TASK_BATCH_MAX_BYTES):
+        self.application = application
+        self.description = description
+        self.max_jobs = max_jobs
+        self.max_bytes = max_bytes
+        self.jobs = []
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, job, label=None):
+        """Add a job to the batch.
+
+        Args:
+            job (dict): Job from a Task definition.
+            label (str): Name reported when the job fails, defaults to the
+                job type.
+        """
+        self.jobs.append((label or job.get('type'), job))
+
+    def add_task(self, task_data, label=None):
+        """Add every job from a Task definition to the batch.
+
+        Args:
+            task_data (str): Task JSON definition for the same application.
+            label (str): Name reported when one of the jobs fails.
+        """
+        if isinstance(task_data, str):
+            task_data = json.loads(task_data)
+
+        assert task_data['application'] == self.application, 'Cannot batch Tasks for {0} with {1}'.format(
+            task_data['application'], self.application)
+
+        for job in task_data['job']:
+            self.add(job, label=label)
+
+    def _task(self, jobs):
+        """Build a Task definition from labelled jobs."""
+        return {
+            'application': self.application,
+            'description': self.description,
+            'job': [job for _, job in jobs],
+        }
+
+    def split(self):
+        """Split the jobs into Task sized chunks.
+
+        Returns:
+            list: Lists of ``(label, job)`` tuples, one list per Task.
+
+        """
+        chunks = []
+        chunk = []
+        for labelled_job in self.jobs:
+            candidate = chunk + [labelled_job]
+            too_big = len(json.dumps(self._task(candidate))) > self.max_bytes
+            if chunk and (len(candidate) > self.max_jobs or too_big):
+                chunks.append(chunk)
+                chunk = [labelled_job]
+            else:
+                chunk = candidate
+
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    @staticmethod
+    def _failed_jobs(task_state, jobs):
+        """Map failed stages of a Task back to the labels of their jobs.
+
+        Stages created from jobs use the job index as ``refId``. When a stage
+        has no usable ``refId``, it is matched to the first job of the same
+        type whose values all appear in the stage context.
+        """
+        skip_statuses = GOOD_STATUSES.union(SKIP_STATUSES)
+        failed = []
+
+        for stage in task_state.get('execution', {}).get('stages', []):
+            if stage.get('status') in skip_statuses:
+                continue
+
+            ref_id = str(stage.get('refId', ''))
+            if ref_id.isdigit() and int(ref_id) < len(jobs):
+                failed.append(jobs[int(ref_id)][0])
+                continue
+
+            context = stage.get('context', {})
+            for label, job in jobs:
+                scalars = {key: value for key, value in job.items() if not isinstance(value, (dict, list))}
+                scalars.pop('type', None)
+                matches = all(context.get(key) == value for key, value in scalars.items())
+                if job.get('type') == stage.get('type') and matches:
+                    failed.append(label)
+                    break
+
+        return failed
+
+    def submit(self, task_uri='/tasks'):
+        """Submit the batch without waiting.
+
+        Returns:
+            list: ``(TaskHandle, jobs)`` tuples, one per Task.
+
+        """
+        submitted = []
+        for jobs in self.split():
+            handle = submit_task(self._task(jobs), task_uri)
+            handle.timeout = sum(get_job_timeout(job)[1] for _, job in jobs)
+            submitted.append((handle, jobs))
+        return submitted
+
+    def run(self, task_uri='/tasks'):
+        """Submit the batch and wait for every Task to finish.
+
+        Returns:
+            list: Task status for each Task.
+
+        Raises:
+            :obj:`foremast.exceptions.SpinnakerTaskBatchError`: A Task failed,
+                ``failed_jobs`` holds the labels of the failed jobs.
+
+        """
+        if not self.jobs:
+            return []
+
+        submitted = self.submit(task_uri)
+        LOG.info('Submitted %d jobs for %s as %d Tasks', len(self.jobs), self.application, len(submitted))
+
+        try:
+            return wait_for_tasks([handle for handle, _ in submitted])
+        except SpinnakerTaskError as error:
+            for handle, jobs in submitted:
+                if handle.status == 'TERMINAL':
+                    failed_jobs = self._failed_jobs(error.task_state, jobs)
+                    LOG.error('Failed jobs in %s: %s', handle.taskid, failed_jobs)
+                    raise SpinnakerTaskBatchError(error.task_state, failed_jobs) from error
+            raise
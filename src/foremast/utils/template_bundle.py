@@ -0,0 +1,179 @@
+#   Foremast - Pipeline Tooling
+#
+#   Copyright 2019 Redbox Automated Retail, LLC
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Precompiled bundle of the built-in Jinja2 templates.
+
+The bundle is a zip of Python modules written by
+:meth:`jinja2.Environment.compile_templates` plus a manifest of source hashes,
+built with ``foremast templates compile`` before packaging. Templates whose
+source no longer matches the manifest are compiled from source as usual.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zipfile
+
+import jinja2
+
+LOG = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+JSON_TEMPLATE_CHECKS = {
+    'configs/configs.json.j2': {
+        'env': 'dev',
+        'profile': 'profile',
+        'app': 'testapp',
+    },
+    'configs/pipeline.json.j2': {},
+}
+"""Built-in templates that must render to a JSON object, mapped to sample ``data``."""
+
+
+def _source_digest(path):
+    """Hash the template source at *path*."""
+    with open(path, 'rb') as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def validate_json_templates(environment):
+    """Render :data:`JSON_TEMPLATE_CHECKS` and check they are JSON objects.
+
+    Args:
+        environment (jinja2.Environment): Environment to load templates from.
+
+    Raises:
+        ValueError: Template did not render to a JSON object.
+
+    """
+    for template_file, data in JSON_TEMPLATE_CHECKS.items():
+        rendered = environment.get_template(template_file).render(data=data)
+        if not isinstance(json.loads(rendered), dict):
+            raise ValueError('Template {0} did not render a JSON object'.format(template_file))
+
+
+def compile_bundle(source_dir, bundle_path):
+    """Compile all templates in *source_dir* into a zip at *bundle_path*.
+
+    Args:
+        source_dir (str): Directory of built-in templates.
+        bundle_path (str): Zip file to write, replaced atomically.
+
+    Returns:
+        int: Number of templates compiled.
+
+    Raises:
+        ValueError: JSON template did not render a JSON object.
+        jinja2.TemplateSyntaxError: Template could not be compiled.
+
+    """
+    environment = jinja2.Environment(loader=jinja2.FileSystemLoader(str(source_dir)))
+    validate_json_templates(environment)
+
+    names = environment.list_templates(filter_func=lambda name: name.endswith('.j2'))
+    manifest = {
+        'jinja2': jinja2.__version__,
+        'templates': {name: _source_digest(os.path.join(str(source_dir), name)) for name in names},
+    }
+
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(bundle_path)), prefix='.tmp-')
+    os.close(file_descriptor)
+    try:
+        environment.compile_templates(temp_path, filter_func=lambda name: name in manifest['templates'],
+                                      zip='deflated', ignore_errors=False)
+        with zipfile.ZipFile(temp_path, 'a') as bundle:
+            bundle.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(temp_path, bundle_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    LOG.info('Compiled %d templates into %s', len(names), bundle_path)
+    return len(names)
+
+
+def read_manifest(bundle_path):
+    """Read the manifest of the bundle at *bundle_path*.
+
+    Args:
+        bundle_path (str): Zip file written by :func:`compile_bundle`.
+
+    Returns:
+        dict: Source hashes by template name, None when the bundle is missing,
+        unreadable or compiled by a different Jinja2 version.
+
+    """
+    try:
+        with zipfile.ZipFile(str(bundle_path)) as bundle:
+            manifest = json.loads(bundle.read(MANIFEST_NAME).decode('utf-8'))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+    if manifest.get('jinja2') != jinja2.__version__:
+        LOG.warning('Ignoring template bundle %s compiled by Jinja2 %s, installed Jinja2 is %s. Templates are '
+                    'compiled from source, run "foremast templates compile" to rebuild the bundle.', bundle_path,
+                    manifest.get('jinja2'), jinja2.__version__)
+        return None
+
+    return manifest['templates']
+
+
+class BundleLoader(jinja2.ModuleLoader):
+    """Load built-in templates from a precompiled bundle.
+
+    Templates missing from the bundle or changed since it was compiled raise
+    :class:`jinja2.TemplateNotFound`, so a :class:`jinja2.ChoiceLoader` moves on
+    to the source templates.
+
+    Args:
+        bundle_path (str): Zip file written by :func:`compile_bundle`.
+        source_dir (str): Directory of the templates the bundle was built from.
+        manifest (dict): Source hashes by template name.
+    """
+
+    def __init__(self, bundle_path, source_dir, manifest):
+        super().__init__(str(bundle_path))
+        self.source_dir = str(source_dir)
+        self.manifest = manifest
+        self._checked = {}
+
+    def is_current(self, name):
+        """Check the source of *name* still matches the manifest.
+
+        The result is kept per template name and only hashed again after the
+        source file's modification time or size changes.
+        """
+        try:
+            stat = os.stat(os.path.join(self.source_dir, name))
+        except OSError:
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        checked = self._checked.get(name)
+        if checked is None or checked[0] != signature:
+            current = _source_digest(os.path.join(self.source_dir, name))
+            checked = (signature, self.manifest.get(name) == current)
+            self._checked[name] = checked
+
+        return checked[1]
+
+    def load(self, environment, name, globals=None):  # pylint: disable=redefined-builtin
+        """Load compiled template *name* when its source is unchanged."""
+        if not self.is_current(name):
+            raise jinja2.TemplateNotFound(name)
+
+        return super().load(environment, name, globals)
@@ -17,20 +17,79 @@
 import logging
 import os
 import pathlib
+import threading
 
 import jinja2
 
-from ..consts import TEMPLATES_PATH
+from ..consts import TEMPLATE_CACHE_DIR, TEMPLATES_PATH
 from ..exceptions import ForemastTemplateNotFound
+from .template_bundle import BundleLoader, compile_bundle, read_manifest
 
 LOG = logging.getLogger(__name__)
 
 HERE = pathlib.Path(__file__).parent.absolute()
 LOCAL_TEMPLATES = HERE.joinpath('../templates/').resolve()
+COMPILED_TEMPLATES = HERE.joinpath('../compiled_templates.zip').resolve()
+
+TEMPLATE_STATS = {'renders': 0, 'compiles': 0}
+"""Number of templates rendered and compiled from source in this process."""
+
+_JINJA_ENVIRONMENTS = {}
+_JINJA_ENVIRONMENTS_LOCK = threading.Lock()
+
+
+class ForemastEnvironment(jinja2.Environment):
+    """Jinja environment counting templates compiled from source."""
+
+    def compile(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Compile template source, see :meth:`jinja2.Environment.compile`."""
+        TEMPLATE_STATS['compiles'] += 1
+        return super().compile(*args, **kwargs)
+
+
+class SearchPathLoader(jinja2.ChoiceLoader):
+    """Try *loaders* in order while reporting the source template *searchpath*."""
+
+    def __init__(self, loaders, searchpath):
+        super().__init__(loaders)
+        self.searchpath = list(searchpath)
+
+
+def get_template_loader(template_paths):
+    """Build the loader for external and built-in templates.
+
+    External templates come first so they shadow built-in ones, followed by
+    the precompiled bundle when one was built for this Jinja2 version, then
+    the built-in template sources.
+
+    Args:
+        template_paths (tuple): External template directory, if any, followed
+            by :data:`LOCAL_TEMPLATES`.
+
+    Returns:
+        jinja2.BaseLoader: Loader for the Foremast environment.
+    """
+    *external_paths, local_path = template_paths
+    loaders = [jinja2.FileSystemLoader(path) for path in external_paths]
+
+    manifest = read_manifest(COMPILED_TEMPLATES)
+    if manifest:
+        LOG.debug('Using precompiled templates from %s', COMPILED_TEMPLATES)
+        loaders.append(BundleLoader(COMPILED_TEMPLATES, local_path, manifest))
+
+    loaders.append(jinja2.FileSystemLoader(local_path))
+    return SearchPathLoader(loaders, template_paths)
 
 
 def get_jinja_environment():
     """Gets the Foremast Jinja environment used for rendering templates
+
+    One environment is kept per template search path, so compiled templates
+    are reused between renders and only reloaded when their file changes.
+    Built-in templates are loaded from the precompiled bundle when present,
+    other compiled templates are shared between processes through
+    ``[base] template_cache_dir`` when configured.
+
     Returns:
         jinja2.Environment
     """
@@ -42,12 +101,46 @@ def get_jinja_environment():
         jinja_template_paths_obj.append(external_templates)
 
     jinja_template_paths_obj.append(LOCAL_TEMPLATES)
-    jinja_template_paths = [str(path) for path in jinja_template_paths_obj]
+    jinja_template_paths = tuple(str(path) for path in jinja_template_paths_obj)
+
+    with _JINJA_ENVIRONMENTS_LOCK:
+        cache_key = (jinja_template_paths, COMPILED_TEMPLATES)
+        jinjaenv = _JINJA_ENVIRONMENTS.get(cache_key)
+
+        if jinjaenv is None:
+            bytecode_cache = None
+            if TEMPLATE_CACHE_DIR:
+                os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+                bytecode_cache = jinja2.FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+            jinjaenv = ForemastEnvironment(
+                loader=get_template_loader(jinja_template_paths),
+                auto_reload=True,
+                bytecode_cache=bytecode_cache)
+            _JINJA_ENVIRONMENTS[cache_key] = jinjaenv
 
-    jinjaenv = jinja2.Environment(loader=jinja2.FileSystemLoader(jinja_template_paths))
     return jinjaenv
 
 
+def reset_jinja_environments():
+    """Drop cached Jinja environments and reset :data:`TEMPLATE_STATS`."""
+    with _JINJA_ENVIRONMENTS_LOCK:
+        _JINJA_ENVIRONMENTS.clear()
+    TEMPLATE_STATS.update(renders=0, compiles=0)
+
+
+def compile_builtin_templates(*args):
+    """Compile built-in templates into a bundle loaded instead of the sources."""
+    output = COMPILED_TEMPLATES
+
+    if args:
+        LOG.debug('Incoming arguments: %s', args)
+        command_args, *_ = args
+        output = command_args.parsed.output or output
+
+    compile_bundle(LOCAL_TEMPLATES, str(output))
+
+
 def get_template_object(template_file=''):
     """Retrieve template.
 
@@ -76,6 +169,21 @@ def get_template_object(template_file=''):
     return template
 
 
+def is_external_template(template_file=''):
+    """Check if ``[base] templates_path`` has _template_file_, shadowing the built-in one.
+
+    Args:
+        template_file (str): Name of template file.
+
+    Returns:
+        bool: True when the external template is rendered instead.
+
+    """
+    if not TEMPLATES_PATH:
+        return False
+    return pathlib.Path(TEMPLATES_PATH).expanduser().joinpath(template_file).is_file()
+
+
 def get_template(template_file='', **kwargs):
     """Get the Jinja2 template and renders with dict _kwargs_.
 
@@ -94,6 +202,7 @@ def get_template(template_file='', **kwargs):
         LOG.debug('%s => %s', key, value)
 
     rendered_json = template.render(**kwargs)
+    TEMPLATE_STATS['renders'] += 1
     LOG.debug('Rendered JSON:\n%s', rendered_json)
 
     return rendered_json
@@ -35,3 +35,21 @@ def test_duplicate_instance_links():
     instance_links = spinnaker_app.retrieve_instance_links()
 
     assert instance_links == duplicate, "Instance links handing duplicates are wrong."
+
+
+@mock.patch('foremast.app.spinnaker_app.wait_for_task')
+@mock.patch('foremast.app.spinnaker_app.gate_request')
+def test_create_fingerprint_requires_existing_app(mock_gate, mock_wait):
+    """Unchanged upserts are only skipped while the application exists."""
+    spinnaker_app = SpinnakerApp("aws", pipeline_config={"instance_links": {}}, app='myapp')
+
+    with mock.patch.object(spinnaker_app, 'render_application_template', return_value={}):
+        mock_gate.return_value.ok = True
+        spinnaker_app.create()
+        assert mock_wait.call_args[1]['fingerprint'] == ('myapp', 'global', 'global', 'application')
+
+        mock_gate.return_value.ok = False
+        spinnaker_app.create()
+        assert mock_wait.call_args[1]['fingerprint'] is None
+
+    mock_gate.assert_called_with(uri='/applications/myapp')
@@ -0,0 +1,68 @@
+"""Compare DeepChainMap and DeepMerge when compiling multi-region configs.
+
+Run with ``python tests/benchmarks/bench_deep_merge.py``.
+"""
+import json
+import timeit
+
+from foremast.utils import DeepChainMap, DeepMerge
+
+REGIONS = ['us-east-1', 'us-east-2', 'us-west-1', 'us-west-2', 'eu-west-1', 'ap-southeast-1']
+ENVS = ['dev', 'stage', 'prod', 'qa', 'perf', 'uat', 'sandbox', 'prodp', 'prods']
+
+
+def make_section(depth, width):
+    """Build a nested config section."""
+    if not depth:
+        return {'key{0}'.format(index): index for index in range(width)}
+    return {'section{0}'.format(index): make_section(depth - 1, width) for index in range(width)}
+
+
+def make_configs():
+    """Build application configs and template defaults for every env."""
+    defaults = make_section(3, 6)
+    app_configs = {}
+    for env in ENVS:
+        env_config = make_section(3, 4)
+        env_config['regions'] = REGIONS
+        # Region configs are shallow copies of the env config, as in apply_region_configs
+        env_config.update({region: env_config.copy() for region in REGIONS})
+        app_configs[env] = env_config
+    return app_configs, defaults
+
+
+def compile_chain_map(app_configs, defaults):
+    """Compile configs the way write_variables used to."""
+    compiled = {}
+    for env, configs in app_configs.items():
+        compiled[env] = dict(DeepChainMap(configs, defaults))
+        for region in REGIONS:
+            compiled[env][region] = dict(DeepChainMap(compiled[env][region], defaults))
+    return compiled
+
+
+def compile_deep_merge(app_configs, defaults):
+    """Compile configs with one eager merge per section."""
+    merger = DeepMerge()
+    compiled = {}
+    for env, configs in app_configs.items():
+        compiled[env] = merger.merge(configs, defaults)
+        for region in REGIONS:
+            compiled[env][region] = merger.merge(compiled[env][region], defaults)
+    return compiled
+
+
+def main():
+    """Print timings for both strategies."""
+    app_configs, defaults = make_configs()
+
+    expected = json.dumps(compile_chain_map(app_configs, defaults))
+    assert json.dumps(compile_deep_merge(app_configs, defaults)) == expected
+
+    for name, func in (('DeepChainMap', compile_chain_map), ('DeepMerge', compile_deep_merge)):
+        seconds = min(timeit.repeat(lambda: func(app_configs, defaults), number=3, repeat=3)) / 3
+        print('{0:>12}: {1:.3f}s per compile'.format(name, seconds))
+
+
+if __name__ == '__main__':
+    main()
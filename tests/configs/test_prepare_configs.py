@@ -106,5 +106,53 @@ def test_legacy_region_format():
     assert rendered_config == desired_config
 
 
+@mock.patch.object(configs.prepare_configs.consts, 'GCP_ENVS', {})
+@mock.patch.object(configs.prepare_configs.consts, 'ENVS', {'dev', 'stage', 'prod'})
+def test_process_configs_missing_files():
+    """Missing environment files are skipped and a missing pipeline.json uses defaults."""
+    file_lookup = mock.Mock()
 
-    
+    def lookup_json(filename=''):
+        if filename == 'application-master-dev.json':
+            return {'regions': ['us-east-1']}
+        raise FileNotFoundError(filename)
+
+    file_lookup.json.side_effect = lookup_json
+
+    app_configs = configs.process_configs(file_lookup, 'application-master-{env}.json', 'pipeline.json')
+
+    assert app_configs['pipeline'] == {'env': ['stage', 'prod']}
+    assert app_configs['dev']['us-east-1'] == {'regions': ['us-east-1']}
+    assert 'stage' not in app_configs
+    assert 'prod' not in app_configs
+    assert file_lookup.json.call_count == 4
+
+
+@mock.patch.object(configs.prepare_configs.consts, 'GCP_ENVS', {'gcp-dev': {}})
+@mock.patch.object(configs.prepare_configs.consts, 'ENVS', {'dev'})
+def test_process_configs_only_cloud_envs():
+    """Only environment files of the pipeline type's cloud are fetched."""
+    file_lookup = mock.Mock()
+    file_lookup.json.return_value = {'type': 'ec2'}
+
+    app_configs = configs.process_configs(file_lookup, 'application-master-{env}.json', 'pipeline.json')
+
+    assert 'gcp-dev' not in app_configs
+    fetched = [call[1]['filename'] for call in file_lookup.json.call_args_list]
+    assert fetched == ['pipeline.json', 'application-master-dev.json']
+
+
+@mock.patch.object(configs.prepare_configs.consts, 'GCP_ENVS', {})
+@mock.patch.object(configs.prepare_configs.consts, 'ENVS', {'dev'})
+@mock.patch('foremast.configs.prepare_configs.FileLookup')
+def test_process_git_configs_commit(mock_file_lookup):
+    """The config commit is fetched alongside the config files."""
+    file_lookup = mock_file_lookup.return_value
+    file_lookup.json.return_value = {'type': 'ec2'}
+    file_lookup.project.commits.get.return_value.attributes = {'id': 'abc123'}
+
+    app_configs = configs.process_git_configs(git_short='forrest/core')
+
+    assert app_configs['pipeline']['config_commit'] == 'abc123'
+    assert app_configs['dev']['type'] == 'ec2'
+    file_lookup.project.commits.get.assert_called_once_with('master')
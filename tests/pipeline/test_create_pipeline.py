@@ -14,10 +14,12 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 """Test create_pipeline functionality"""
+import json
 from unittest import mock
 
+import foremastutils
 import pytest
-from foremast.pipeline import SpinnakerPipeline
+from foremast.pipeline import SpinnakerPipeline, SpinnakerPipelineOnetime
 
 TEST_FORMAT_GENERATOR = mock.Mock()
 TEST_SETTINGS = {
@@ -85,11 +87,83 @@ def test_create_pipeline_ec2(mock_post, mock_renumerate, mock_construct, mock_su
         }
     }
     mock_subnets.return_value = {'dev': {'us-east-1': ['us-east-1d', 'us-east-1a', 'us-east-1e']}}
-    mock_construct.return_value = '{"test": "stuff"}'
+    mock_construct.return_value = [{"test": "stuff"}]
     mock_wrapper.return_value = {'stages': []}
     created = spinnaker_pipeline.create_pipeline()
 
     mock_construct.assert_called_with(**test_block_data)
-    mock_post.assert_called_with({'stages': ['test']})
+    mock_post.assert_called_with({'stages': [{'test': 'stuff'}]})
 
     assert created == True
+
+
+@mock.patch('foremast.pipeline.create_pipeline.gate_request')
+def test_post_pipeline_serializes_once(mock_gate, spinnaker_pipeline):
+    """Assembled pipelines are sent as the JSON of the dictionary."""
+    pipeline = {'application': 'appgroup', 'name': 'appgroup [us-east-1]', 'stages': [{'refId': '1'}]}
+
+    spinnaker_pipeline.post_pipeline(pipeline)
+    spinnaker_pipeline.post_pipeline(json.dumps(pipeline))
+
+    first_call, second_call = mock_gate.call_args_list
+    assert first_call[1]['data'] == json.dumps(pipeline)
+    assert second_call[1]['data'] == json.dumps(pipeline)
+
+
+@mock.patch('foremast.pipeline.create_pipeline.gate_request')
+@mock.patch.object(SpinnakerPipeline, 'compare_with_existing')
+def test_post_onetime_pipeline(mock_compare, mock_gate, spinnaker_pipeline):
+    """Onetime pipelines are renamed with disabled triggers without changing the original."""
+    pipeline = {
+        'application': 'appgroup',
+        'id': None,
+        'name': 'appgroup [us-east-1]',
+        'triggers': [{'enabled': True, 'job': 'trigger'}],
+    }
+    onetime_pipeline = SpinnakerPipelineOnetime.__new__(SpinnakerPipelineOnetime)
+    onetime_pipeline.__dict__.update(spinnaker_pipeline.__dict__, environments=['stage'])
+    mock_compare.return_value = 'pipeline-id'
+
+    onetime_pipeline.post_pipeline(pipeline)
+
+    assert pipeline['triggers'] == [{'enabled': True, 'job': 'trigger'}]
+    assert mock_gate.call_args[1]['data'] == json.dumps({
+        'application': 'appgroup',
+        'id': 'pipeline-id',
+        'name': 'appgroup [us-east-1] (onetime-stage)',
+        'triggers': [{'enabled': False, 'job': 'trigger'}],
+    })
+
+
+@mock.patch('foremast.pipeline.create_pipeline.PIPELINE_REGION_WORKERS', 2)
+@mock.patch('foremast.pipeline.create_pipeline.clean_pipelines')
+@mock.patch.object(SpinnakerPipeline, 'render_wrapper')
+@mock.patch('foremast.pipeline.create_pipeline.get_subnets')
+@mock.patch('foremast.pipeline.create_pipeline.construct_pipeline_block')
+@mock.patch('foremast.pipeline.create_pipeline.renumerate_stages')
+@mock.patch.object(SpinnakerPipeline, 'post_pipeline')
+def test_create_pipeline_parallel_regions(mock_post, mock_renumerate, mock_construct, mock_subnets, mock_wrapper,
+                                          mock_clean, spinnaker_pipeline):
+    """Regions render concurrently with their own naming formats."""
+    spinnaker_pipeline.generated = foremastutils.Generator('group', 'app', region='eu-west-1')
+    spinnaker_pipeline.settings = {
+        'dev': {
+            'regions': ['us-east-1', 'us-west-2'],
+            'us-east-1': {},
+            'us-west-2': {},
+        },
+        'pipeline': dict(TEST_SETTINGS['pipeline'], env=['dev']),
+    }
+    regions = ['us-east-1', 'us-west-2']
+    mock_subnets.return_value = {'dev': {region: ['{0}a'.format(region)] for region in regions}}
+    mock_wrapper.side_effect = lambda region, generated: {'name': region, 'stages': []}
+    mock_construct.side_effect = lambda **kwargs: [{'region': kwargs['generated'].data['region']}]
+
+    assert spinnaker_pipeline.create_pipeline()
+
+    posted = [call[0][0] for call in mock_post.call_args_list]
+    assert sorted(pipeline['name'] for pipeline in posted) == regions
+    for pipeline in posted:
+        assert pipeline['stages'][0]['region'] == pipeline['name']
+    assert mock_renumerate.call_count == 2
+    assert spinnaker_pipeline.generated.data['region'] == 'eu-west-1'
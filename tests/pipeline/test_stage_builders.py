@@ -0,0 +1,139 @@
+"""Verify :mod:`foremast.pipeline.stage_builders` matches the built-in templates."""
+import copy
+import json
+from unittest import mock
+
+import pytest
+
+from foremast.pipeline import stage_builders
+from foremast.pipeline.construct_pipeline_block import construct_pipeline_block
+from foremast.utils import get_template
+
+BLOCK_DATA = {
+    'app': {
+        'appname': 'groupapp',
+        'approval_skip': False,
+        'approval_timeout': 3600000,
+        'custom_tags': {
+            'cost_center': 'café',
+            'path': 'C:\\temp'
+        },
+        'elb': json.dumps(['groupapp']),
+        'encoded_user_data': 'IyEvYmluL2Jhc2gK',
+        'environment': 'stage',
+        'group_name': 'group',
+        'instance_profile': 'group_app_profile',
+        'instance_security_groups': json.dumps(['groupapp', 'offices']),
+        'instance_type': 't2.micro',
+        'az_dict': json.dumps({'us-east-1': ['us-east-1a', 'us-east-1b']}),
+        'owner_email': 'team@example.com',
+        'previous_env': 'dev',
+        'region': 'us-east-1',
+        'repo_name': 'app',
+        'scalingpolicy': True,
+    },
+    'asg': {
+        'enable_public_ips': json.dumps(False),
+        'has_provider_healthcheck': True,
+        'hc_grace_period': 180,
+        'hc_type': 'ELB',
+        'max_inst': '3',
+        'min_inst': 1,
+        'provider_healthcheck': json.dumps(['Discovery']),
+        'ssh_keypair': 'stage_us-east-1_default',
+        'subnet_purpose': 'internal',
+    },
+    'completion_webhooks': [
+        {
+            'url': 'https://hooks.example.com/deployed',
+            'name': 'notify',
+            'method': 'post',
+            'custom_headers': {
+                'X-Token': 'abc',
+                'Accept': 'application/json'
+            },
+            'payload': {
+                'status': 'done',
+                'app': {
+                    'name': 'groupapp',
+                    'env': 'stage'
+                }
+            },
+        },
+        {
+            'url': 'https://hooks.example.com/audit',
+            'name': 'audit',
+            'method': 'put',
+            'payload': [1, 'two'],
+        },
+    ],
+    'deploy_strategy':
+    'highlander',
+}
+
+
+def variants():
+    """Block data covering every branch of the built-in templates."""
+    minimal = copy.deepcopy(BLOCK_DATA)
+    minimal['app'].update(approval_timeout=None, custom_tags={}, previous_env=None, scalingpolicy=False)
+    minimal['asg']['has_provider_healthcheck'] = False
+    del minimal['completion_webhooks']
+    del minimal['deploy_strategy']
+
+    skipped = copy.deepcopy(BLOCK_DATA)
+    skipped['app']['approval_skip'] = True
+    skipped['completion_webhooks'] = []
+
+    return [BLOCK_DATA, minimal, skipped]
+
+
+@pytest.fixture(autouse=True)
+def builtin_templates():
+    """Render the built-in templates only."""
+    with mock.patch('foremast.utils.templates.TEMPLATES_PATH', None):
+        yield
+
+
+@pytest.mark.parametrize('template_file', sorted(stage_builders.STAGE_BUILDERS))
+@pytest.mark.parametrize('data', variants())
+def test_build_stages_byte_identical(template_file, data):
+    """Built Stages serialize exactly like the parsed template output."""
+    rendered = json.loads(get_template(template_file=template_file, data=data, formats=None))
+    built = stage_builders.build_stages(template_file, data)
+
+    assert json.dumps(built) == json.dumps(rendered)
+
+
+def test_builtin_digests_match_templates():
+    """Builders are kept in step with the built-in template sources."""
+    for template_file in stage_builders.BUILTIN_DIGESTS:
+        assert stage_builders.is_builtin_unchanged(template_file), template_file
+
+
+def test_build_stages_external_template(tmpdir):
+    """Shadowed templates are rendered from the external template path."""
+    tmpdir.join('pipeline', 'stage-deploy.json.j2').write('{"type": "external"}', ensure=True)
+
+    with mock.patch('foremast.utils.templates.TEMPLATES_PATH', str(tmpdir)):
+        assert stage_builders.build_stages('pipeline/pipeline_stages.json.j2', BLOCK_DATA) is None
+    assert stage_builders.build_stages('pipeline/pipeline_stages_lambda.json.j2', BLOCK_DATA) is None
+
+
+@mock.patch('foremast.pipeline.construct_pipeline_block.get_template')
+def test_construct_pipeline_block_built(mock_template):
+    """EC2 blocks are built without rendering their template."""
+    generated = mock.Mock(project='group', repo='app')
+    generated.app_name.return_value = 'groupapp'
+    pipeline_data = {'type': 'ec2', 'promote_restrict': 'none', 'owner_email': 'team@example.com'}
+
+    with mock.patch('foremast.pipeline.construct_pipeline_block.ec2_pipeline_setup',
+                    return_value=copy.deepcopy(BLOCK_DATA)):
+        stages = construct_pipeline_block(env='stage',
+                                          generated=generated,
+                                          previous_env='dev',
+                                          settings={},
+                                          pipeline_data=pipeline_data)
+
+    assert [stage['type']
+            for stage in stages] == ['manualJudgment', 'jenkins', 'deploy', 'jenkins', 'webhook', 'webhook']
+    mock_template.assert_not_called()
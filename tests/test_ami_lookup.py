@@ -15,10 +15,13 @@
 #   limitations under the License.
 """Ensure AMI names can be translated."""
 import json
+import threading
+import time
 from unittest import mock
 
 import pytest
-from foremast.utils import ami_lookup
+from foremast.utils import ami_lookup, ami_lookup_many, lookups
+from foremast.utils.file_cache import FileCache
 
 
 @mock.patch('foremast.utils.lookups.GITLAB_TOKEN', new=True)
@@ -56,3 +59,82 @@ def test_dict_lookup(ami_file_dict):
 def test_no_external_lookup():
     """AMI lookup not using json or gitlab."""
     assert ami_lookup(region='us-east-1', name='no_external') == 'no_external'
+
+
+@pytest.fixture
+def ami_cache(tmpdir):
+    """Use an empty AMI memo and file cache."""
+    with mock.patch.dict('foremast.utils.lookups._AMI_MEMO', clear=True), \
+            mock.patch('foremast.utils.lookups.FILE_CACHE', FileCache(str(tmpdir))):
+        yield
+
+
+@mock.patch('foremast.utils.lookups.AMI_JSON_URL', new='http://ami.example.com/ami.json')
+def test_ami_lookup_many(ami_cache, requests_mock):
+    """The AMI table is downloaded once for every region and name."""
+    requests_mock.get('http://ami.example.com/ami.json', json={
+        'us-east-1': {'base_fedora': 'ami-xxxx', 'tomcat8': 'ami-yyyy'},
+        'us-west-2': {'base_fedora': 'ami-zzzz', 'tomcat8': 'ami-wwww'},
+    })
+
+    amis = ami_lookup_many(['us-east-1', 'us-west-2'], ['base_fedora', 'tomcat8'])
+
+    assert amis == {
+        'us-east-1': {'base_fedora': 'ami-xxxx', 'tomcat8': 'ami-yyyy'},
+        'us-west-2': {'base_fedora': 'ami-zzzz', 'tomcat8': 'ami-wwww'},
+    }
+    assert ami_lookup(region='us-west-2', name='tomcat8') == 'ami-wwww'
+    assert requests_mock.call_count == 1
+
+
+def test_ami_dict_revalidated(ami_cache, requests_mock):
+    """An expired AMI table is revalidated with a conditional GET."""
+    url = 'http://ami.example.com/ami.json'
+    requests_mock.get(url, json={'us-east-1': {'tomcat8': 'ami-yyyy'}}, headers={'ETag': '"v1"'})
+    assert lookups._get_ami_dict(url) == {'us-east-1': {'tomcat8': 'ami-yyyy'}}
+
+    lookups._AMI_MEMO.clear()
+    lookups.FILE_CACHE.clock = lambda: time.time() + lookups.AMI_CACHE_TTL + 1
+    requests_mock.get(url, status_code=304)
+
+    assert lookups._get_ami_dict(url) == {'us-east-1': {'tomcat8': 'ami-yyyy'}}
+    assert requests_mock.last_request.headers['If-None-Match'] == '"v1"'
+
+
+def test_ami_dict_revalidated_in_memory(requests_mock):
+    """Without a file cache, the in memory copy is revalidated."""
+    url = 'http://ami.example.com/ami.json'
+    requests_mock.get(url, json={'us-east-1': {'tomcat8': 'ami-yyyy'}}, headers={'Last-Modified': 'yesterday'})
+
+    with mock.patch.dict('foremast.utils.lookups._AMI_MEMO', clear=True), \
+            mock.patch('foremast.utils.lookups.FILE_CACHE', FileCache('')):
+        assert lookups._get_ami_dict(url) == {'us-east-1': {'tomcat8': 'ami-yyyy'}}
+
+        key = ('ami_json', url)
+        lookups._AMI_MEMO[key] = (0, lookups._AMI_MEMO[key][1])
+        requests_mock.get(url, status_code=304)
+
+        assert lookups._get_ami_dict(url) == {'us-east-1': {'tomcat8': 'ami-yyyy'}}
+        assert requests_mock.last_request.headers['If-Modified-Since'] == 'yesterday'
+
+
+def test_ami_memo_fetches_keys_independently(ami_cache):
+    """A slow fetch does not hold up lookups of other AMI tables."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch(_stale):
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    slow = threading.Thread(target=lookups._memoized_ami, args=('slow', slow_fetch))
+    slow.start()
+    try:
+        assert started.wait(5)
+        assert lookups._memoized_ami('fast', lambda _stale: 'fast') == 'fast'
+    finally:
+        release.set()
+        slow.join()
+
+    assert lookups._memoized_ami('slow', lambda _stale: 'refetched') == 'slow'
@@ -19,6 +19,7 @@ from unittest import mock
 
 import pytest
 
+from foremast.__main__ import main
 from foremast.runner import ForemastRunner
 from foremast.pipeline import SpinnakerPipeline
 
@@ -58,3 +59,18 @@ def test_runner_create_pipeline_onetime(mock_pipelines):
     runner.configs = CONFIGS
     runner.configs['pipeline']['type'] = 'manual'
     runner.create_pipeline(onetime=True)
+
+
+@mock.patch('foremast.runner.prepare_infrastructure')
+def test_main_infra_force(mock_infra):
+    """The infra command passes --force explicitly."""
+    main(['infra', '--force'])
+    mock_infra.assert_called_once_with(force=True)
+
+
+@mock.patch('foremast.runner.prepare_infrastructure', side_effect=AttributeError('boom'))
+def test_main_infra_error_not_retried(mock_infra):
+    """Errors during an infra run are raised instead of rerunning without arguments."""
+    with pytest.raises(AttributeError):
+        main(['infra'])
+    mock_infra.assert_called_once_with(force=False)
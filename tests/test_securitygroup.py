@@ -19,7 +19,7 @@ from unittest import mock
 
 import pytest
 
-from foremast.exceptions import ForemastConfigurationFileError
+from foremast.exceptions import ForemastConfigurationFileError, SpinnakerSecurityGroupError
 from foremast.securitygroup import SpinnakerSecurityGroup
 
 SAMPLE_JSON = """{"security_group": {
@@ -84,6 +84,28 @@ def test_create_crossaccount_securitygroup(get_details, pipeline_config, wait_fo
     assert no_cross_account_simple == no_cross_account_result
 
 
+@mock.patch('foremast.securitygroup.create_securitygroup.boto3')
+@mock.patch('foremast.securitygroup.create_securitygroup.get_security_group_id')
+@mock.patch('foremast.securitygroup.create_securitygroup.get_vpc_id')
+@mock.patch('foremast.securitygroup.create_securitygroup.wait_for_task')
+@mock.patch("foremast.securitygroup.create_securitygroup.get_properties")
+@mock.patch("foremast.securitygroup.create_securitygroup.get_details")
+def test_create_new_securitygroup_single_upsert(get_details, pipeline_config, wait_for_task, get_vpc_id,
+                                                get_security_group_id, boto3):
+    """New Security Groups are created with all ingress in a single Task."""
+    pipeline_config.return_value = json.loads(SAMPLE_JSON)
+    get_security_group_id.side_effect = [SpinnakerSecurityGroupError, 'SGID']
+    get_vpc_id.return_value = 'VPCID'
+
+    security_group = SpinnakerSecurityGroup(app='edgeforrest', env='dev', region='us-east-1')
+    assert security_group.create_security_group() is True
+
+    wait_for_task.assert_called_once()
+    assert '"coreforrest"' in wait_for_task.call_args[0][0]
+    assert get_security_group_id.call_count == 2
+    boto3.session.Session.return_value.resource.return_value.SecurityGroup.assert_called_once_with('SGID')
+
+
 @mock.patch('foremast.securitygroup.create_securitygroup.get_security_group_id')
 @mock.patch('foremast.securitygroup.create_securitygroup.get_properties')
 @mock.patch("foremast.securitygroup.create_securitygroup.get_details")
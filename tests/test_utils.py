@@ -54,6 +54,53 @@ def test_utils_deep_chain_map():
         assert DeepChainMap(first, second)['key2'] == result
 
 
+def test_utils_deep_merge():
+    """Eager merges match DeepChainMap, including key order."""
+    first = {'key1': {'key1_1': 'first_one'}, 'key3': [1]}
+    second = {'key2': 'second', 'key1': {'key1_1': 'second_one', 'key1_2': {'deep': True}}}
+
+    merged = deep_merge(first, second)
+
+    assert merged == dict(DeepChainMap(first, second))
+    assert list(merged) == list(dict(DeepChainMap(first, second)))
+    assert merged['key1'] == {'key1_1': 'first_one', 'key1_2': {'deep': True}}
+    assert merged['key1']['key1_2'] is not second['key1']['key1_2']
+
+
+def test_utils_deep_merge_repeated_merges_are_independent():
+    """Merging the same sections again returns equal but unshared results."""
+    shared = {'asg': {'min_inst': 1}, 'security_group': {'elb_extras': ['sg1']}}
+    defaults = {'asg': {'max_inst': 3}}
+    merger = DeepMerge()
+
+    east = merger.merge(shared, defaults)
+    west = merger.merge(shared, defaults)
+
+    assert east == west == {'asg': {'max_inst': 3, 'min_inst': 1}, 'security_group': {'elb_extras': ['sg1']}}
+    assert east['asg'] is not west['asg']
+    assert east['security_group']['elb_extras'] is not shared['security_group']['elb_extras']
+
+
+def test_utils_deep_merge_region_mutation():
+    """Changing one region's merged section leaves other regions unchanged."""
+    env_config = {'asg': {'min_inst': 1}, 'regions': ['us-east-1', 'us-west-2']}
+    env_config.update({region: env_config.copy() for region in env_config['regions']})
+    defaults = {'asg': {'max_inst': 3}}
+    merger = DeepMerge()
+
+    merged = merger.merge(env_config, defaults)
+    for region in merged['regions']:
+        merged[region] = merger.merge(merged[region], defaults)
+
+    merged['us-east-1']['asg']['min_inst'] = 5
+    merged['regions'].append('eu-west-1')
+
+    assert merged['us-west-2']['asg'] == {'max_inst': 3, 'min_inst': 1}
+    assert merged['asg'] == {'max_inst': 3, 'min_inst': 1}
+    assert merger.merge(env_config, defaults)['regions'] == ['us-east-1', 'us-west-2']
+    assert env_config['regions'] == ['us-east-1', 'us-west-2']
+
+
 def test_utils_pipeline_check_managed():
 
     assert check_managed_pipeline('app [onetime]', 'app') == 'onetime'
@@ -401,3 +448,13 @@ def test_utils_default_timeout(mock_check_task, mock_requests_post, mock_timeout
     mock_timeouts.side_effect = {"dev": {"fake_task": "240"}}
     tasks.wait_for_task(task_data)
     assert mock_check_task.called_with("really_fake_task", tasks.DEFAULT_TASK_TIMEOUT)
+
+
+def test_utils_lazy_pformat():
+    """Objects are only pretty printed when formatted."""
+    with mock.patch('foremast.utils.pretty.pprint.pformat', return_value="{'app': 'myapp'}") as mock_pformat:
+        lazy = LazyPformat({'app': 'myapp'})
+        mock_pformat.assert_not_called()
+
+        assert str(lazy) == "{'app': 'myapp'}"
+        mock_pformat.assert_called_once_with({'app': 'myapp'})
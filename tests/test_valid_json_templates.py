@@ -20,6 +20,7 @@ import pytest
 
 from foremast.exceptions import ForemastTemplateNotFound
 from foremast.utils import get_template
+from foremast.utils.template_bundle import JSON_TEMPLATE_CHECKS
 
 
 def test_get_template():
@@ -34,16 +35,8 @@ def valid_json(template, data):
 
 
 def test_valid_json_configs():
-
-    data = {
-        'env': 'dev',
-        'profile': 'profile',
-        'app': 'testapp',
-    }
-
-    valid_json(template='configs/configs.json.j2', data=data)
+    valid_json(template='configs/configs.json.j2', data=JSON_TEMPLATE_CHECKS['configs/configs.json.j2'])
 
 
 def test_valid_json_pipeline():
-    data = {}
-    valid_json(template='configs/pipeline.json.j2', data=data)
+    valid_json(template='configs/pipeline.json.j2', data=JSON_TEMPLATE_CHECKS['configs/pipeline.json.j2'])
@@ -1,10 +1,13 @@
 """Verify :func:`foremsat.utils.tasks.check_task` functionality."""
+import asyncio
 from unittest import mock
 
 import pytest
 
 from foremast.exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
-from foremast.utils.tasks import _check_task, check_task
+from foremast.utils.backoff import jittered_backoff_delays
+from foremast.utils.task_history import TaskDurationHistory
+from foremast.utils.tasks import _check_task, async_check_task, check_task
 
 FAIL_MESSAGE = 'TERMINAL'
 SUCCESS_MESSAGE = 'SUCCEEDED'
@@ -51,3 +54,65 @@ def test_task_unknown(mock_gate_request):
 
     with pytest.raises(ValueError):
         _check_task(taskid='')
+
+
+@mock.patch('foremast.utils.tasks._check_task')
+def test_async_check_task(mock_check_task):
+    """Asynchronous polling retries until the Task finishes."""
+    mock_check_task.side_effect = [ValueError, SUCCESS_MESSAGE]
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(async_check_task('fake_task', timeout=2, wait=0.01))
+    finally:
+        loop.close()
+
+    assert result == SUCCESS_MESSAGE
+    assert mock_check_task.call_count == 2
+
+
+@mock.patch('foremast.utils.tasks._check_task')
+def test_async_check_task_timeout(mock_check_task):
+    """Asynchronous polling gives up after the timeout."""
+    mock_check_task.side_effect = ValueError
+
+    loop = asyncio.new_event_loop()
+    try:
+        with pytest.raises(SpinnakerTaskInconclusiveError):
+            loop.run_until_complete(async_check_task('fake_task', timeout=0.02, wait=0.01))
+    finally:
+        loop.close()
+
+    assert mock_check_task.call_count == 2
+
+
+def test_jittered_backoff_delays():
+    """Delays grow, stay within jitter and cap, and sum to the timeout."""
+    delays = list(jittered_backoff_delays(60, initial=0.5, factor=2, maximum=8, jitter=0.1))
+
+    assert 0.45 <= delays[0] <= 0.55
+    assert 0.9 <= delays[1] <= 1.1
+    assert max(delays) <= 8 * 1.1
+    assert sum(delays) == pytest.approx(60)
+
+
+def test_jittered_backoff_delays_expected():
+    """Known durations delay the first poll."""
+    delays = jittered_backoff_delays(60, expected=20)
+
+    assert next(delays) == 16
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks._check_task')
+def test_check_task_records_history(mock_check_task, mock_sleep, tmpdir):
+    """Adaptive polling records completion times per Task type."""
+    mock_check_task.side_effect = [ValueError, ValueError, SUCCESS_MESSAGE]
+    history = TaskDurationHistory(str(tmpdir.join('history.json')))
+
+    with mock.patch('foremast.utils.tasks.TASK_HISTORY', history):
+        assert check_task('fake_task', timeout=10, task_type='upsertSecurityGroup') == SUCCESS_MESSAGE
+
+    assert mock_sleep.call_count == 2
+    assert TaskDurationHistory(history.path).median('upsertSecurityGroup') is not None
+    assert history.median('deleteScalingPolicy') is None
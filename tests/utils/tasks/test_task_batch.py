@@ -0,0 +1,98 @@
+"""Verify :class:`foremast.utils.tasks.TaskBatch` functionality."""
+from unittest import mock
+
+import pytest
+
+from foremast.exceptions import SpinnakerTaskBatchError, SpinnakerTaskError
+from foremast.utils.tasks import TaskBatch, TaskHandle
+
+
+def make_batch(count, **kwargs):
+    """Batch of *count* delete jobs."""
+    batch = TaskBatch('app', 'Delete scaling policies', **kwargs)
+    for index in range(count):
+        batch.add({'type': 'deleteScalingPolicy', 'policyName': 'policy{}'.format(index)},
+                  label='policy{}'.format(index))
+    return batch
+
+
+def test_task_batch_split_by_jobs():
+    """Batches are split at the job limit."""
+    chunks = make_batch(5, max_jobs=2).split()
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_task_batch_split_by_bytes():
+    """Batches are split at the size limit."""
+    chunks = make_batch(4, max_bytes=200).split()
+
+    assert len(chunks) > 1
+    assert sum(len(chunk) for chunk in chunks) == 4
+
+
+def test_task_batch_other_application():
+    """Tasks for other applications cannot be batched."""
+    batch = TaskBatch('app', 'Upsert')
+
+    with pytest.raises(AssertionError):
+        batch.add_task({'application': 'other', 'job': [{'type': 'upsertScalingPolicy'}]})
+
+
+@mock.patch('foremast.utils.tasks.wait_for_tasks')
+@mock.patch('foremast.utils.tasks.post_task')
+def test_task_batch_run(mock_post_task, mock_wait_for_tasks):
+    """One Task is submitted for the whole batch."""
+    mock_post_task.return_value = '/tasks/1'
+    mock_wait_for_tasks.return_value = ['SUCCEEDED']
+
+    assert make_batch(3).run() == ['SUCCEEDED']
+
+    task = mock_post_task.call_args[0][0]
+    assert task['application'] == 'app'
+    assert len(task['job']) == 3
+
+
+@mock.patch('foremast.utils.tasks.wait_for_tasks')
+@mock.patch('foremast.utils.tasks.post_task')
+def test_task_batch_failed_jobs(mock_post_task, mock_wait_for_tasks):
+    """Failed stages are mapped back to their jobs."""
+    task_state = {
+        'execution': {
+            'stages': [
+                {'refId': '0', 'status': 'SUCCEEDED', 'context': {}},
+                {'refId': '1', 'status': 'TERMINAL', 'context': {'exception': {'details': {'errors': ['boom']}}}},
+            ],
+        },
+    }
+
+    def fail(handles):
+        handles[0].status = 'TERMINAL'
+        raise SpinnakerTaskError(task_state)
+
+    mock_post_task.return_value = '/tasks/1'
+    mock_wait_for_tasks.side_effect = fail
+
+    with pytest.raises(SpinnakerTaskBatchError) as error:
+        make_batch(2).run()
+
+    assert error.value.failed_jobs == ['policy1']
+
+
+def test_task_batch_failed_jobs_by_context():
+    """Stages without a job index are matched by type and context."""
+    jobs = [('a', {'type': 'deleteScalingPolicy', 'policyName': 'a'}),
+            ('b', {'type': 'deleteScalingPolicy', 'policyName': 'b'})]
+    task_state = {
+        'execution': {
+            'stages': [{'type': 'deleteScalingPolicy', 'status': 'TERMINAL', 'context': {'policyName': 'b'}}],
+        },
+    }
+
+    assert TaskBatch._failed_jobs(task_state, jobs) == ['b']
+
+
+def test_task_batch_empty():
+    """Empty batches do nothing."""
+    assert TaskBatch('app', 'Nothing').run() == []
+    assert isinstance(TaskHandle('1'), TaskHandle)
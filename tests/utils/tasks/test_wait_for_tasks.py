@@ -0,0 +1,69 @@
+"""Verify :func:`foremast.utils.tasks.wait_for_tasks` functionality."""
+import json
+from unittest import mock
+
+import pytest
+
+from foremast.exceptions import SpinnakerTaskError, SpinnakerTaskInconclusiveError
+from foremast.utils.tasks import TaskHandle, submit_task, wait_for_tasks
+
+SUCCESS_MESSAGE = 'SUCCEEDED'
+TASK = {'job': [{'type': 'deleteScalingPolicy', 'credentials': 'dev'}]}
+
+
+@mock.patch('foremast.utils.tasks.TASK_TIMEOUTS', {'dev': {'deleteScalingPolicy': 240}})
+@mock.patch('foremast.utils.tasks.post_task')
+def test_submit_task(mock_post_task):
+    """Submitting returns a handle with the configured timeout."""
+    mock_post_task.return_value = '/tasks/1'
+
+    handle = submit_task(json.dumps(TASK))
+
+    assert handle.taskid == '/tasks/1'
+    assert handle.task_type == 'deleteScalingPolicy'
+    assert handle.timeout == 240
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks._check_task')
+def test_wait_for_tasks(mock_check_task, mock_sleep):
+    """All Tasks are polled together until each finishes."""
+    statuses = {'1': [SUCCESS_MESSAGE], '2': [ValueError, ValueError, SUCCESS_MESSAGE]}
+
+    def check(taskid):
+        status = statuses[taskid].pop(0)
+        if status is ValueError:
+            raise ValueError
+        return status
+
+    mock_check_task.side_effect = check
+
+    handles = [TaskHandle('1'), TaskHandle('2')]
+    assert wait_for_tasks(handles) == [SUCCESS_MESSAGE, SUCCESS_MESSAGE]
+    assert mock_check_task.call_count == 4
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks._check_task')
+def test_wait_for_tasks_failure(mock_check_task, mock_sleep):
+    """A failed Task raises."""
+    mock_check_task.side_effect = SpinnakerTaskError({'execution': {'stages': []}})
+
+    with pytest.raises(SpinnakerTaskError):
+        wait_for_tasks([TaskHandle('1')])
+
+
+@mock.patch('foremast.utils.tasks.time.sleep')
+@mock.patch('foremast.utils.tasks._check_task')
+def test_wait_for_tasks_timeout(mock_check_task, mock_sleep):
+    """Tasks fail on their own timeout."""
+    mock_check_task.side_effect = ValueError
+
+    with pytest.raises(SpinnakerTaskInconclusiveError):
+        wait_for_tasks([TaskHandle('1', timeout=0)])
+
+
+def test_wait_for_no_tasks():
+    """Nothing to wait for."""
+    assert wait_for_tasks([]) == []
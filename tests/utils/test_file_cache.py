@@ -0,0 +1,115 @@
+"""Verify :mod:`foremast.utils.file_cache` functionality."""
+import base64
+import os
+from unittest import mock
+
+import gitlab
+import pytest
+
+from foremast.utils import lookups
+from foremast.utils.file_cache import FileCache
+
+COMMIT = 'a' * 40
+
+
+@pytest.fixture(autouse=True)
+def fresh_gitlab_client():
+    """Start every test without a shared GitLab client or cached Projects."""
+    lookups.reset_gitlab_client()
+    yield
+    lookups.reset_gitlab_client()
+
+
+def test_file_cache_get_set(tmpdir):
+    """Entries are returned until their TTL passes, misses are cached as None."""
+    now = [1000.0]
+    cache = FileCache(str(tmpdir), clock=lambda: now[0])
+
+    assert cache.get(('forrest/core', COMMIT, 'runway/pipeline.json')) is None
+
+    cache.set(('forrest/core', COMMIT, 'runway/pipeline.json'), '{}')
+    cache.set(('forrest/core', COMMIT, 'runway/missing.json'), None)
+    cache.set(('ami_json_url', 'http://ami'), {'us-east-1': {}}, ttl=60)
+
+    assert cache.get(('forrest/core', COMMIT, 'runway/pipeline.json'))['value'] == '{}'
+    assert cache.get(('forrest/core', COMMIT, 'runway/missing.json'))['value'] is None
+    assert cache.get(('ami_json_url', 'http://ami'))['value'] == {'us-east-1': {}}
+
+    now[0] += 61
+    assert cache.get(('ami_json_url', 'http://ami')) is None
+    assert cache.get(('forrest/core', COMMIT, 'runway/pipeline.json')) is not None
+
+
+def test_file_cache_lru_eviction(tmpdir):
+    """Least recently used entries are removed past the size limit."""
+    cache = FileCache(str(tmpdir))
+    cache.set(('project', COMMIT, '0'), 'x' * 40)
+    cache.max_bytes = 3 * os.path.getsize(cache.path_for(('project', COMMIT, '0')))
+
+    for index in range(3):
+        cache.set(('project', COMMIT, str(index)), 'x' * 40)
+        path = cache.path_for(('project', COMMIT, str(index)))
+        os.utime(path, (index, index))
+
+    # Reading refreshes the oldest entry so the second one is evicted instead
+    assert cache.get(('project', COMMIT, '0'))
+    cache.set(('project', COMMIT, '3'), 'x' * 40)
+
+    assert cache.get(('project', COMMIT, '0'))
+    assert cache.get(('project', COMMIT, '1')) is None
+    assert cache.stats['evictions'] >= 1
+
+
+def test_file_cache_disabled():
+    """Nothing is cached without a directory."""
+    cache = FileCache('')
+    cache.set(('key', ), 'value')
+
+    assert cache.get(('key', )) is None
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_remote_file_cached_at_commit(mock_gitlab, tmpdir):
+    """Files read at a commit SHA are only downloaded once."""
+    project = mock_gitlab.Gitlab.return_value.projects.get.return_value
+    project.files.get.return_value.content = base64.b64encode(b'{}')
+
+    with mock.patch.object(lookups, 'FILE_CACHE', FileCache(str(tmpdir))):
+        for _ in range(2):
+            my_git = lookups.FileLookup(git_short='forrest/core')
+            my_git.pin(COMMIT)
+            assert my_git.get(filename='runway/pipeline.json') == '{}'
+            assert my_git.get(filename='runway/pipeline.json', branch='master') == '{}'
+
+    assert project.files.get.call_count == 3
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_remote_file_error_not_cached(mock_gitlab, tmpdir):
+    """GitLab failures other than a missing file are raised and retried."""
+    mock_gitlab.exceptions = gitlab.exceptions
+    project = mock_gitlab.Gitlab.return_value.projects.get.return_value
+    found = mock.Mock(content=base64.b64encode(b'{}'))
+    project.files.get.side_effect = [gitlab.exceptions.GitlabGetError('Server Error', response_code=500), found]
+
+    with mock.patch.object(lookups, 'FILE_CACHE', FileCache(str(tmpdir))):
+        my_git = lookups.FileLookup(git_short='forrest/core')
+        with pytest.raises(gitlab.exceptions.GitlabGetError):
+            my_git.remote_file(branch=COMMIT, filename='application-master-prod.json')
+        assert my_git.remote_file(branch=COMMIT, filename='application-master-prod.json') == '{}'
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_remote_file_missing_cached(mock_gitlab, tmpdir):
+    """Files GitLab reports missing at a commit are not requested again."""
+    mock_gitlab.exceptions = gitlab.exceptions
+    project = mock_gitlab.Gitlab.return_value.projects.get.return_value
+    project.files.get.side_effect = gitlab.exceptions.GitlabGetError('Not Found', response_code=404)
+
+    with mock.patch.object(lookups, 'FILE_CACHE', FileCache(str(tmpdir))):
+        my_git = lookups.FileLookup(git_short='forrest/core')
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                my_git.remote_file(branch=COMMIT, filename='application-master-prod.json')
+
+    assert project.files.get.call_count == 1
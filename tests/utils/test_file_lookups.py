@@ -15,12 +15,15 @@
 #   limitations under the License.
 """Test Git file lookups."""
 import base64
+import io
+import tarfile
 from unittest import mock
 
 import pytest
 
 from foremast.exceptions import GitLabApiError
 from foremast.utils import FileLookup
+from foremast.utils.lookups import reset_gitlab_client
 
 TEST_JSON = '''{
     "ship": "pirate"
@@ -28,6 +31,14 @@ TEST_JSON = '''{
 TEST_JSON_BYTES = TEST_JSON.encode()
 
 
+@pytest.fixture(autouse=True)
+def fresh_gitlab_client():
+    """Start every test without a shared GitLab client or cached Projects."""
+    reset_gitlab_client()
+    yield
+    reset_gitlab_client()
+
+
 @mock.patch('foremast.utils.lookups.gitlab')
 def test_init(gitlab):
     """Check init."""
@@ -109,3 +120,74 @@ def test_runway_get(gitlab, tmpdir):
 
     with pytest.raises(FileNotFoundError):
         my_git.get(filename='parrot')
+
+
+def make_archive(files):
+    """Build a GitLab style repository archive holding *files*."""
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+        for path, contents in files.items():
+            data = contents.encode()
+            member = tarfile.TarInfo('forrest-core-abc123-runway/{0}'.format(path))
+            member.size = len(data)
+            tar.addfile(member, io.BytesIO(data))
+    return archive.getvalue()
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_snapshot_get(mock_gitlab):
+    """Files in the snapshot path are served from one archive at the pinned commit."""
+    project = mock_gitlab.Gitlab.return_value.projects.get.return_value
+    project.repository_archive.return_value = make_archive({'runway/pipeline.json': TEST_JSON})
+    project.files.get.return_value.content = base64.b64encode(TEST_JSON_BYTES)
+
+    my_git = FileLookup(git_short='forrest/core', snapshot_path='runway')
+    my_git.pin('abc123')
+
+    assert my_git.json(filename='runway/pipeline.json') == {'ship': 'pirate'}
+    assert my_git.get(filename='runway/pipeline.json') == TEST_JSON
+    with pytest.raises(FileNotFoundError):
+        my_git.get(filename='runway/application-master-dev.json')
+
+    project.repository_archive.assert_called_once_with(sha='abc123', path='runway', format='tar.gz')
+    project.files.get.assert_not_called()
+
+    assert my_git.get(filename='README.md') == TEST_JSON
+    project.files.get.assert_called_once_with(file_path='README.md', ref='abc123')
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_snapshot_unavailable(mock_gitlab):
+    """Files are retrieved one by one when the archive cannot be downloaded."""
+    mock_gitlab.exceptions.GitlabError = Exception
+    project = mock_gitlab.Gitlab.return_value.projects.get.return_value
+    project.repository_archive.side_effect = Exception('Not Found')
+    project.files.get.return_value.content = base64.b64encode(TEST_JSON_BYTES)
+
+    my_git = FileLookup(git_short='forrest/core', snapshot_path='runway')
+
+    assert my_git.get(filename='runway/pipeline.json') == TEST_JSON
+    project.files.get.assert_called_once_with(file_path='runway/pipeline.json', ref='master')
+
+
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_gitlab_client_shared(mock_gitlab):
+    """One GitLab client is created and Projects are retrieved once each."""
+    FileLookup(git_short='forrest/core')
+    FileLookup(git_short='forrest/core')
+    FileLookup(git_short='forrest/edge')
+
+    mock_gitlab.Gitlab.assert_called_once()
+    assert mock_gitlab.Gitlab.call_args[1]['session'] is not None
+    assert mock_gitlab.Gitlab.return_value.projects.get.call_count == 2
+
+
+@mock.patch('foremast.utils.lookups.GITLAB_MAX_PROJECTS', 1)
+@mock.patch('foremast.utils.lookups.gitlab')
+def test_gitlab_project_cache_bounded(mock_gitlab):
+    """Least recently used Projects are dropped past the limit."""
+    FileLookup(git_short='forrest/core')
+    FileLookup(git_short='forrest/edge')
+    FileLookup(git_short='forrest/core')
+
+    assert mock_gitlab.Gitlab.return_value.projects.get.call_count == 3
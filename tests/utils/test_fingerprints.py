@@ -0,0 +1,75 @@
+"""Verify :mod:`foremast.utils.fingerprints` functionality."""
+import io
+import json
+from unittest import mock
+
+from foremast.utils import tasks
+from foremast.utils.fingerprints import FingerprintStore
+
+KEY = ('myapp', 'dev', 'us-east-1', 'elb')
+PAYLOAD = '{"job": [{"type": "upsertLoadBalancer", "credentials": "dev"}], "application": "myapp"}'
+
+
+def test_fingerprint_ignores_formatting():
+    """Key order and whitespace do not change the fingerprint."""
+    reordered = json.dumps(json.loads(PAYLOAD), indent=4, sort_keys=True)
+
+    assert FingerprintStore.fingerprint(PAYLOAD) == FingerprintStore.fingerprint(reordered)
+    assert FingerprintStore.fingerprint(PAYLOAD) != FingerprintStore.fingerprint('{"job": []}')
+
+
+def test_fingerprint_local_store(tmpdir):
+    """Recorded payloads are unchanged until they differ, expire or are forced."""
+    now = [1000.0]
+    store = FingerprintStore(str(tmpdir), max_age=60, clock=lambda: now[0])
+
+    assert not store.unchanged(KEY, PAYLOAD)
+    store.record(KEY, PAYLOAD)
+    assert tmpdir.join('myapp', 'dev', 'us-east-1', 'elb.json').check()
+
+    assert store.unchanged(KEY, PAYLOAD)
+    assert not store.unchanged(KEY, '{"job": []}')
+    assert not store.unchanged(('myapp', 'dev', 'us-west-2', 'elb'), PAYLOAD)
+
+    store.force = True
+    assert not store.unchanged(KEY, PAYLOAD)
+    store.force = False
+
+    now[0] += 61
+    assert not store.unchanged(KEY, PAYLOAD)
+
+
+def test_fingerprint_disabled():
+    """Nothing is skipped without a store location."""
+    store = FingerprintStore()
+    store.record(KEY, PAYLOAD)
+
+    assert not store.unchanged(KEY, PAYLOAD)
+
+
+def test_fingerprint_s3_store():
+    """Fingerprints are kept as one object per resource under the S3 prefix."""
+    store = FingerprintStore('s3://bucket/fingerprints/', clock=lambda: 1000.0)
+    store._s3_client = mock.Mock()
+
+    store.record(KEY, PAYLOAD)
+    put_kwargs = store.s3_client.put_object.call_args[1]
+    assert put_kwargs['Bucket'] == 'bucket'
+    assert put_kwargs['Key'] == 'fingerprints/myapp/dev/us-east-1/elb.json'
+
+    store.s3_client.get_object.return_value = {'Body': io.BytesIO(put_kwargs['Body'])}
+    assert store.unchanged(KEY, PAYLOAD)
+
+
+@mock.patch('foremast.utils.tasks.check_task')
+@mock.patch('foremast.utils.tasks.post_task')
+def test_wait_for_task_skips_unchanged(mock_post_task, mock_check_task, tmpdir):
+    """Tasks matching their last successful run are not submitted again."""
+    mock_check_task.return_value = 'SUCCEEDED'
+
+    with mock.patch.object(tasks, 'TASK_FINGERPRINTS', FingerprintStore(str(tmpdir))):
+        assert tasks.wait_for_task(PAYLOAD, fingerprint=KEY) == 'SUCCEEDED'
+        assert tasks.wait_for_task(PAYLOAD, fingerprint=KEY) == 'SKIPPED'
+        assert tasks.wait_for_task(PAYLOAD) == 'SUCCEEDED'
+
+    assert mock_post_task.call_count == 2
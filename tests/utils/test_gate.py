@@ -0,0 +1,137 @@
+"""Verify :mod:`foremast.utils.gate` functionality."""
+import asyncio
+import gzip
+import json
+from unittest import mock
+
+import pytest
+
+from foremast.utils import gate
+from foremast.utils.gate_cache import GateDiskCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """Start every test without a shared Gate session or cached responses."""
+    gate.reset_gate_session()
+    gate.GATE_CACHE.clear()
+    yield
+    gate.reset_gate_session()
+    gate.GATE_CACHE.clear()
+
+
+def test_gate_session_is_shared():
+    """The same pooled session is returned for every call."""
+    session = gate.get_gate_session()
+
+    assert session is gate.get_gate_session()
+
+    adapter = session.get_adapter('https://gate.example.com')
+    assert adapter is session.get_adapter('http://gate.example.com')
+    assert adapter.max_retries.total == gate.GATE_MAX_RETRIES
+    assert 'POST' not in adapter.max_retries.allowed_methods
+
+
+def test_gate_request_uses_session():
+    """Requests go through the shared session."""
+    with mock.patch.object(gate, 'get_gate_session') as mock_session:
+        gate.gate_request(uri='/applications')
+        gate.gate_request(method='POST', uri='/tasks', data='{}')
+
+    mock_session.return_value.get.assert_called_once()
+    mock_session.return_value.post.assert_called_once()
+
+
+def test_gate_connection_stats_without_session():
+    """No connections are reported before the session is used."""
+    assert gate.get_gate_connection_stats() == {'new': 0, 'reused': 0}
+
+
+def test_gate_request_does_not_mutate_headers():
+    """Caller headers are copied before authentication is added."""
+    headers = {'accept': '*/*'}
+
+    with mock.patch.object(gate, 'GATE_AUTHENTICATION', {'github': {'token': 'secret'}}), \
+            mock.patch.object(gate, 'get_gate_session') as mock_session:
+        gate.gate_request(uri='/applications', headers=headers)
+
+    assert headers == {'accept': '*/*'}
+    assert mock_session.return_value.get.call_args[1]['headers']['Authorization'] == 'Bearer secret'
+
+
+def test_async_gate_request():
+    """Asynchronous requests run the blocking request in an executor."""
+
+    async def fan_out():
+        return await asyncio.gather(*[gate.async_gate_request(uri='/applications/{}'.format(app)) for app in 'abc'])
+
+    loop = asyncio.new_event_loop()
+    try:
+        with mock.patch.object(gate, 'get_gate_session') as mock_session:
+            responses = loop.run_until_complete(fan_out())
+    finally:
+        loop.close()
+
+    assert len(responses) == 3
+    assert mock_session.return_value.get.call_count == 3
+
+
+def test_gate_request_cached():
+    """Read-only lookups are served from the cache until a write."""
+    with mock.patch.object(gate, 'get_gate_session') as mock_session:
+        mock_session.return_value.get.return_value.ok = True
+
+        first = gate.gate_request(uri='/applications/app')
+        assert gate.gate_request(uri='/applications/app') is first
+        gate.gate_request(uri='/applications')
+        gate.gate_request(uri='/applications')
+        assert mock_session.return_value.get.call_count == 3
+
+        gate.gate_request(method='POST', uri='/tasks', data='{}')
+        gate.gate_request(uri='/applications/app')
+        assert mock_session.return_value.get.call_count == 4
+
+
+def test_gate_request_disk_cached(tmpdir):
+    """Topology lookups are shared between processes through the disk cache."""
+    disk_cache = GateDiskCache(str(tmpdir), (r'^/subnets/aws$', ))
+
+    with mock.patch.object(gate, 'GATE_DISK_CACHE', disk_cache), \
+            mock.patch.object(gate, 'get_gate_session') as mock_session:
+        mock_session.return_value.get.return_value.ok = True
+        mock_session.return_value.get.return_value.content = b'[{"id": "subnet-1"}]'
+
+        gate.gate_request(uri='/subnets/aws')
+        gate.GATE_CACHE.clear()
+        response = gate.gate_request(uri='/subnets/aws')
+
+    assert mock_session.return_value.get.call_count == 1
+    assert response.ok
+    assert response.json() == [{'id': 'subnet-1'}]
+
+
+def test_gate_request_compressed_post():
+    """Large POST bodies are gzipped when enabled."""
+    small_body = '{}'
+    large_body = json.dumps({'stages': ['stage'] * 10000})
+
+    with mock.patch.object(gate, 'GATE_COMPRESS_REQUESTS', True), \
+            mock.patch.object(gate, 'get_gate_session') as mock_session:
+        gate.gate_request(method='POST', uri='/pipelines', data=small_body)
+        gate.gate_request(method='POST', uri='/pipelines', data=large_body)
+
+    small_call, large_call = mock_session.return_value.post.call_args_list
+    assert small_call[1]['data'] == small_body
+    assert 'Content-Encoding' not in small_call[1]['headers']
+    assert gzip.decompress(large_call[1]['data']).decode() == large_body
+    assert large_call[1]['headers']['Content-Encoding'] == 'gzip'
+
+
+def test_gate_request_uncompressed_by_default():
+    """POST bodies are sent as is unless compression is enabled."""
+    large_body = json.dumps({'stages': ['stage'] * 10000})
+
+    with mock.patch.object(gate, 'get_gate_session') as mock_session:
+        gate.gate_request(method='POST', uri='/pipelines', data=large_body)
+
+    assert mock_session.return_value.post.call_args[1]['data'] == large_body
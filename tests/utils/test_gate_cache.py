@@ -0,0 +1,102 @@
+"""Verify :class:`foremast.utils.gate_cache.GateCache` functionality."""
+from foremast.utils.gate_cache import GateCache, GateDiskCache
+
+TTLS = {
+    r'^/networks/aws$': 10,
+    r'^/applications/[^/]+$': 5,
+    r'^/subnets/aws$': 0,
+}
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_gate_cache_ttl():
+    """Entries expire after their endpoint TTL."""
+    clock = FakeClock()
+    cache = GateCache(TTLS, clock=clock)
+
+    cache.set('/networks/aws', None, 'networks')
+    cache.set('/applications/app', None, 'app')
+
+    clock.now = 6
+    assert cache.get('/networks/aws') == 'networks'
+    assert cache.get('/applications/app') is None
+
+    clock.now = 11
+    assert cache.get('/networks/aws') is None
+    assert cache.stats == {'hits': 1, 'misses': 2, 'evictions': 0}
+
+
+def test_gate_cache_uncacheable():
+    """Unmatched and disabled endpoints are never stored."""
+    cache = GateCache(TTLS)
+
+    cache.set('/applications', None, 'all apps')
+    cache.set('/subnets/aws', None, 'subnets')
+
+    assert len(cache) == 0
+    assert cache.get('/applications') is None
+    assert cache.stats['misses'] == 0
+
+
+def test_gate_cache_params_in_key():
+    """Query parameters are part of the key."""
+    cache = GateCache(TTLS)
+
+    cache.set('/networks/aws', {'a': 1}, 'one')
+
+    assert cache.get('/networks/aws', {'a': 1}) == 'one'
+    assert cache.get('/networks/aws') is None
+
+
+def test_gate_cache_lru_eviction():
+    """Least recently used entries are evicted first."""
+    cache = GateCache(TTLS, max_entries=2)
+
+    cache.set('/applications/a', None, 'a')
+    cache.set('/applications/b', None, 'b')
+    cache.get('/applications/a')
+    cache.set('/applications/c', None, 'c')
+
+    assert cache.get('/applications/a') == 'a'
+    assert cache.get('/applications/b') is None
+    assert cache.stats['evictions'] == 1
+
+
+def test_gate_cache_invalidate():
+    """Invalidation drops entries by URI prefix."""
+    cache = GateCache(TTLS)
+
+    cache.set('/networks/aws', None, 'networks')
+    cache.set('/applications/app', None, 'app')
+    cache.invalidate('/applications/')
+
+    assert cache.get('/applications/app') is None
+    assert cache.get('/networks/aws') == 'networks'
+
+
+def test_gate_disk_cache(tmpdir):
+    """Bodies are shared through files until the TTL passes."""
+    clock = FakeClock()
+    cache = GateDiskCache(str(tmpdir), (r'^/subnets/aws$', ), ttl=60, clock=clock)
+    other_process = GateDiskCache(str(tmpdir), (r'^/subnets/aws$', ), ttl=60, clock=clock)
+
+    cache.set('/subnets/aws', None, b'[{"id": "subnet-1"}]')
+    cache.set('/applications/app', None, b'{}')
+
+    assert other_process.get('/subnets/aws') == b'[{"id": "subnet-1"}]'
+    assert [entry['uri'] for entry in cache.entries()] == ['/subnets/aws']
+
+    clock.now = 61
+    assert other_process.get('/subnets/aws') is None
+
+    assert cache.clear() == 1
+    assert cache.entries() == []
@@ -0,0 +1,64 @@
+"""Verify Google IAP token caching."""
+import base64
+import json
+import time
+from unittest import mock
+
+import pytest
+
+from foremast.utils import google_iap
+
+
+def make_token(exp):
+    """Build an unsigned JWT with the given expiry."""
+
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+    return '{}.{}.{}'.format(encode({'alg': 'RS256', 'typ': 'JWT'}), encode({'exp': exp}), encode('signature'))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Clear the in-memory token cache around every test."""
+    google_iap._TOKEN_CACHE.clear()
+    yield
+    google_iap._TOKEN_CACHE.clear()
+
+
+@mock.patch('foremast.utils.google_iap.get_google_iap_bearer_token')
+def test_iap_token_cached_in_memory(mock_get_token):
+    """Valid tokens are only requested once."""
+    token = make_token(time.time() + 3600)
+    mock_get_token.return_value = {'id_token': token}
+
+    for _ in range(3):
+        assert google_iap.get_cached_google_iap_bearer_token('client', 'key.json')['id_token'] == token
+
+    assert mock_get_token.call_count == 1
+
+
+@mock.patch('foremast.utils.google_iap.get_google_iap_bearer_token')
+def test_iap_token_refreshed_before_expiry(mock_get_token):
+    """Tokens inside the expiry margin are refreshed."""
+    mock_get_token.return_value = {'id_token': make_token(time.time() + 10)}
+
+    google_iap.get_cached_google_iap_bearer_token('client', 'key.json')
+    google_iap.get_cached_google_iap_bearer_token('client', 'key.json')
+
+    assert mock_get_token.call_count == 2
+
+
+@mock.patch('foremast.utils.google_iap.get_google_iap_bearer_token')
+def test_iap_token_cached_on_disk(mock_get_token, tmpdir):
+    """Tokens written to disk are reused by a new process."""
+    cache_path = str(tmpdir.join('iap.json'))
+    token = make_token(time.time() + 3600)
+    mock_get_token.return_value = {'id_token': token}
+
+    google_iap.get_cached_google_iap_bearer_token('client', 'key.json', cache_path=cache_path)
+    google_iap._TOKEN_CACHE.clear()
+    result = google_iap.get_cached_google_iap_bearer_token('client', 'key.json', cache_path=cache_path)
+
+    assert result['id_token'] == token
+    assert mock_get_token.call_count == 1
@@ -0,0 +1,102 @@
+"""Verify hedged calls in :mod:`foremast.utils.hedging`."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from foremast.utils.hedging import LatencyTracker, hedged_call
+
+
+def test_latency_tracker_delay():
+    """Delay follows the percentile once enough samples exist."""
+    tracker = LatencyTracker(percentile=90, default_delay=0.1, min_samples=5)
+
+    for sample in (0.1, 0.2, 0.3, 0.4):
+        tracker.record('/subnets/aws', sample)
+    assert tracker.delay('/subnets/aws') == 0.1
+
+    for sample in range(5, 11):
+        tracker.record('/subnets/aws', sample / 10)
+    assert tracker.delay('/subnets/aws') == 0.9
+    assert tracker.delay('/networks/aws') == 0.1
+
+
+def test_hedged_call_fast():
+    """Fast calls are not duplicated."""
+    tracker = LatencyTracker(default_delay=1)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call(executor, tracker, '/fast', lambda: 'fast') == 'fast'
+
+    assert tracker.stats['hedged'] == 0
+
+
+def test_hedged_call_slow():
+    """A slow first call is raced by a duplicate."""
+    tracker = LatencyTracker(default_delay=0.01)
+    release = threading.Event()
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return 'slow'
+        return 'hedged'
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = hedged_call(executor, tracker, '/slow', lookup)
+        release.set()
+
+    assert result == 'hedged'
+    assert tracker.stats['hedged'] == 1
+
+
+def test_hedged_call_error():
+    """Errors are raised when no call succeeds."""
+    tracker = LatencyTracker(default_delay=0.01)
+
+    def fail():
+        raise ValueError('boom')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            hedged_call(executor, tracker, '/fail', fail)
+
+
+class FakeResponse:
+    """Minimal stand-in for :class:`requests.Response`."""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+def test_hedged_call_server_error_loses():
+    """A fast 5xx does not beat a slower successful response."""
+    tracker = LatencyTracker(default_delay=0.01)
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            return FakeResponse(200)
+        return FakeResponse(503)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = hedged_call(executor, tracker, '/flaky', lookup)
+
+    assert result.status_code == 200
+    assert tracker.stats['hedged'] == 1
+
+
+def test_hedged_call_server_error_fallback():
+    """The last failed response is returned when no call succeeds."""
+    tracker = LatencyTracker(default_delay=0.01)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = hedged_call(executor, tracker, '/down', lambda: FakeResponse(503))
+
+    assert result.status_code == 503
@@ -0,0 +1,53 @@
+"""Verify :mod:`foremast.utils.parallel` functionality."""
+import logging
+import threading
+import time
+
+import pytest
+
+from foremast.utils.parallel import run_in_order
+
+LOG = logging.getLogger(__name__)
+
+
+def test_run_in_order_results_and_logs(caplog):
+    """Results and log records follow the order of the items."""
+
+    def work(item):
+        LOG.info('start %s', item)
+        time.sleep(0.01 * (3 - item))
+        LOG.info('end %s', item)
+        return item * 2
+
+    with caplog.at_level(logging.INFO, logger=__name__):
+        assert run_in_order(work, [0, 1, 2], max_workers=3) == [0, 2, 4]
+
+    messages = [record.getMessage() for record in caplog.records if record.name == __name__]
+    assert messages == ['start 0', 'end 0', 'start 1', 'end 1', 'start 2', 'end 2']
+
+
+def test_run_in_order_fails_fast(caplog):
+    """The first failure stops items that have not started and is raised."""
+    started = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            started.append(item)
+        if item == 0:
+            raise ValueError('region 0 failed')
+        time.sleep(0.05)
+        return item
+
+    with pytest.raises(ValueError, match='region 0 failed'):
+        run_in_order(work, range(10), max_workers=2)
+
+    assert len(started) < 10
+    assert 'Failed 0: region 0 failed' in caplog.text
+
+
+def test_run_in_order_serial():
+    """A single worker runs the items in the calling thread."""
+    threads = run_in_order(lambda item: threading.current_thread(), ['a', 'b'])
+
+    assert threads == [threading.current_thread()] * 2
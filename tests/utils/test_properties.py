@@ -0,0 +1,45 @@
+"""Verify :mod:`foremast.utils.properties` functionality."""
+import json
+
+import pytest
+
+from foremast.utils import properties
+
+PROPERTIES = {
+    'dev': {
+        'app': {'instance_type': 't2.micro'},
+        'us-east-1': {'app': {'instance_type': 'm4.large'}},
+    },
+    'pipeline': {'type': 'ec2'},
+}
+
+
+def test_get_properties_from_file(tmpdir):
+    """Unregistered paths are read from disk."""
+    properties_file = tmpdir.join('raw.properties.json')
+    properties_file.write(json.dumps(PROPERTIES))
+
+    assert properties.get_properties(str(properties_file), env='dev')['app'] == {'instance_type': 't2.micro'}
+    assert properties.get_properties(str(properties_file), env='dev', region='us-east-1') == \
+        PROPERTIES['dev']['us-east-1']
+    assert properties.get_properties(str(properties_file), env='missing') == PROPERTIES
+
+
+def test_get_properties_registered(tmpdir):
+    """Registered properties are served from memory as independent copies."""
+    properties_file = str(tmpdir.join('raw.properties.json'))
+    configs = json.loads(json.dumps(PROPERTIES))
+
+    properties.register_properties(properties_file, configs)
+    try:
+        configs['pipeline']['type'] = 'lambda'
+        view = properties.get_properties(properties_file, env='pipeline')
+        assert view == {'type': 'ec2'}
+
+        view['type'] = 'changed'
+        assert properties.get_properties(properties_file, env='pipeline') == {'type': 'ec2'}
+    finally:
+        properties.unregister_properties(properties_file)
+
+    with pytest.raises(FileNotFoundError):
+        properties.get_properties(properties_file, env='pipeline')
@@ -0,0 +1,52 @@
+"""Verify :class:`foremast.utils.single_flight.SingleFlight` functionality."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from foremast.utils.single_flight import SingleFlight
+
+
+def test_single_flight_coalesces():
+    """Concurrent callers with the same key share one call."""
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_lookup():
+        calls.append(1)
+        release.wait(5)
+        return 'subnets'
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(single_flight.do, 'subnets', slow_lookup) for _ in range(4)]
+        while single_flight.stats['calls'] + single_flight.stats['coalesced'] < 4:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ['subnets'] * 4
+    assert len(calls) == 1
+    assert single_flight.stats == {'calls': 1, 'coalesced': 3}
+
+
+def test_single_flight_sequential_calls():
+    """Calls that do not overlap are not coalesced."""
+    single_flight = SingleFlight()
+
+    assert single_flight.do('key', lambda: 1) == 1
+    assert single_flight.do('key', lambda: 2) == 2
+    assert single_flight.stats == {'calls': 2, 'coalesced': 0}
+
+
+def test_single_flight_error():
+    """Errors propagate and the key can be retried."""
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        single_flight.do('key', fail)
+
+    assert single_flight.do('key', lambda: 'ok') == 'ok'
@@ -0,0 +1,97 @@
+"""Verify :mod:`foremast.utils.template_bundle` functionality."""
+from unittest import mock
+
+import jinja2
+import pytest
+
+from foremast.utils import template_bundle, templates
+
+
+@pytest.fixture
+def source_dir(tmpdir):
+    """Small template directory standing in for the built-in templates."""
+    source = tmpdir.mkdir('templates')
+    source.join('configs', 'configs.json.j2').write('{"app": "{{ data.app }}"}', ensure=True)
+    source.join('configs', 'pipeline.json.j2').write('{"type": "ec2"}')
+    source.join('pipeline', 'stage.json.j2').write('{"name": "{{ data.name }}"}', ensure=True)
+    return source
+
+
+@pytest.fixture
+def bundle(tmpdir, source_dir):
+    """Bundle compiled from :func:`source_dir`."""
+    bundle_path = tmpdir.join('compiled_templates.zip')
+    assert template_bundle.compile_bundle(str(source_dir), str(bundle_path)) == 3
+    return bundle_path
+
+
+@pytest.fixture(autouse=True)
+def fresh_environments():
+    """Start every test without cached Jinja environments."""
+    templates.reset_jinja_environments()
+    yield
+    templates.reset_jinja_environments()
+
+
+def test_compile_bundle_validates_json(source_dir, tmpdir):
+    """Bundles are not written when a JSON template does not render an object."""
+    source_dir.join('configs', 'pipeline.json.j2').write('[]')
+
+    with pytest.raises(ValueError):
+        template_bundle.compile_bundle(str(source_dir), str(tmpdir.join('compiled_templates.zip')))
+
+    assert not tmpdir.join('compiled_templates.zip').check()
+
+
+def test_bundle_loader(bundle, source_dir):
+    """Unchanged templates come from the bundle, changed ones from source."""
+    manifest = template_bundle.read_manifest(str(bundle))
+    loader = template_bundle.BundleLoader(str(bundle), str(source_dir), manifest)
+    environment = jinja2.Environment(loader=jinja2.ChoiceLoader([loader, jinja2.FileSystemLoader(str(source_dir))]))
+
+    template = environment.get_template('pipeline/stage.json.j2')
+    assert template.filename.startswith(str(bundle))
+    assert template.render(data={'name': 'deploy'}) == '{"name": "deploy"}'
+
+    source_dir.join('pipeline', 'stage.json.j2').write('{"stage": "{{ data.name }}"}')
+    environment = jinja2.Environment(loader=jinja2.ChoiceLoader([loader, jinja2.FileSystemLoader(str(source_dir))]))
+    template = environment.get_template('pipeline/stage.json.j2')
+    assert template.filename.startswith(str(source_dir))
+    assert template.render(data={'name': 'deploy'}) == '{"stage": "deploy"}'
+
+
+def test_bundle_ignored_for_other_jinja_version(bundle, caplog):
+    """Compiled modules are only used with the Jinja2 version that built them."""
+    with mock.patch.object(jinja2, '__version__', '0.0'):
+        assert template_bundle.read_manifest(str(bundle)) is None
+
+    assert 'foremast templates compile' in caplog.text
+
+
+def test_external_templates_shadow_bundle(bundle, source_dir, tmpdir):
+    """External templates are rendered from source ahead of the bundle."""
+    external = tmpdir.mkdir('external')
+    external.join('pipeline', 'stage.json.j2').write('{"external": "{{ data.name }}"}', ensure=True)
+
+    with mock.patch.object(templates, 'COMPILED_TEMPLATES', str(bundle)), \
+            mock.patch.object(templates, 'LOCAL_TEMPLATES', str(source_dir)), \
+            mock.patch.object(templates, 'TEMPLATES_PATH', str(external)):
+        shadowed = templates.get_template('pipeline/stage.json.j2', data={'name': 'deploy'})
+        bundled = templates.get_template_object('configs/configs.json.j2')
+
+    assert shadowed == '{"external": "deploy"}'
+    assert bundled.filename.startswith(str(bundle))
+    assert bundled.render(data={'app': 'myapp'}) == '{"app": "myapp"}'
+
+
+def test_bundle_loader_hashes_once(bundle, source_dir):
+    """Unchanged sources are hashed once per template name."""
+    manifest = template_bundle.read_manifest(str(bundle))
+    loader = template_bundle.BundleLoader(str(bundle), str(source_dir), manifest)
+
+    with mock.patch.object(template_bundle, '_source_digest', wraps=template_bundle._source_digest) as digest:
+        for _ in range(3):
+            environment = jinja2.Environment(loader=loader)
+            environment.get_template('pipeline/stage.json.j2')
+
+    assert digest.call_count == 1
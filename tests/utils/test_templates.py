@@ -0,0 +1,61 @@
+"""Verify :mod:`foremast.utils.templates` functionality."""
+import os
+from unittest import mock
+
+import pytest
+
+from foremast.utils import templates
+
+
+@pytest.fixture(autouse=True)
+def fresh_environments(tmpdir):
+    """Start every test without cached Jinja environments, counters or bundle."""
+    templates.reset_jinja_environments()
+    with mock.patch.object(templates, 'COMPILED_TEMPLATES', tmpdir.join('missing.zip')):
+        yield
+    templates.reset_jinja_environments()
+
+
+@mock.patch('foremast.utils.templates.TEMPLATES_PATH', None)
+def test_jinja_environment_reused():
+    """Templates are compiled once per search path and reused between renders."""
+    assert templates.get_jinja_environment() is templates.get_jinja_environment()
+
+    first = templates.get_template('configs/pipeline.json.j2', data={})
+    second = templates.get_template('configs/pipeline.json.j2', data={})
+
+    assert first == second
+    assert templates.TEMPLATE_STATS == {'renders': 2, 'compiles': 1}
+
+
+def test_jinja_environment_per_templates_path(tmpdir):
+    """External templates shadow built-in ones and are reloaded when changed."""
+    external = tmpdir.mkdir('templates')
+    template_file = external.join('configs', 'pipeline.json.j2')
+    template_file.write('{"external": 1}', ensure=True)
+
+    with mock.patch('foremast.utils.templates.TEMPLATES_PATH', str(external)):
+        assert templates.get_template('configs/pipeline.json.j2') == '{"external": 1}'
+
+        template_file.write('{"external": 2}')
+        os.utime(str(template_file), (1, 1))
+        assert templates.get_template('configs/pipeline.json.j2') == '{"external": 2}'
+        external_environment = templates.get_jinja_environment()
+
+    with mock.patch('foremast.utils.templates.TEMPLATES_PATH', None):
+        assert templates.get_jinja_environment() is not external_environment
+
+    assert templates.TEMPLATE_STATS['compiles'] == 2
+
+
+@mock.patch('foremast.utils.templates.TEMPLATES_PATH', None)
+def test_jinja_bytecode_cache(tmpdir):
+    """Compiled templates are shared through the bytecode cache directory."""
+    with mock.patch('foremast.utils.templates.TEMPLATE_CACHE_DIR', str(tmpdir)):
+        templates.get_template('configs/pipeline.json.j2', data={})
+        assert tmpdir.listdir()
+
+        templates.reset_jinja_environments()
+        templates.get_template('configs/pipeline.json.j2', data={})
+
+    assert templates.TEMPLATE_STATS['compiles'] == 0